@@ -1,10 +1,15 @@
+import asyncio
 import click
 import json as JSON
 import logging
 import pprint
 
 import jira
+from jcli import completion
 from jcli import connector
+from jcli.issues import OFFLINE_ERRORS
+from jcli.issues import login
+from jcli.utils import complete_from
 from jcli.utils import display_via_pager
 from jcli.utils import issue_eval
 from jcli.utils import trim_text
@@ -27,6 +32,9 @@ BOARD_DETAILS_MAP = {
     "assignee": "raw['fields']['assignee']['displayName']",
 }
 
+# Everything 'show' looks at when placing issues in columns.
+BOARD_SHOW_FIELDS = ["status", "assignee", "summary"]
+
 
 def is_issue_assigned_to(issue, assignee):
     if not issue.fields.assignee:
@@ -76,10 +84,11 @@ def list_cmd(limit, name):
 @click.command(
     name='show'
 )
-@click.argument('boardname')
+@click.argument('boardname', shell_complete=complete_from(completion.boards))
 @click.option('--assignee', type=str, default=None,
               help="The name of the assignee (defaults to all)")
 @click.option('--project', type=str, default=None,
+              shell_complete=complete_from(completion.projects),
               help="The name of the project (defaults to '')")
 @click.option("--filter", type=str, default=None,
               help="Applies a quick filter to the results (defaults to None)")
@@ -89,38 +98,58 @@ def list_cmd(limit, name):
               help="Sets the offset for pulling issues")
 @click.option('--max-issues', type=int, default=100,
               help="Sets the max number of issues to pull")
-def show_cmd(boardname, assignee, project, filter, summary_len, issue_offset, max_issues):
+@click.option('--all', 'all_', is_flag=True, default=False,
+              help="Pull every issue on the board, ignoring --max-issues")
+@click.option('--offline', is_flag=True, default=False,
+              help="Show the board from the local mirror (see 'jcli mirror "
+                   "sync --board') instead of the server.")
+def show_cmd(boardname, assignee, project, filter, summary_len, issue_offset,
+             max_issues, all_, offline):
     """
     Displays the board specified by 'name'
     """
+    if offline and filter:
+        raise click.UsageError("Quick filters need the server; "
+                               "--filter can't be used with --offline.")
+
     jobj = connector.JiraConnector()
-    jobj.login()
+    login(jobj, offline)
 
-    columns = jobj.fetch_column_config_by_board(boardname)
-    ISSUE_HEADER = [column for column in columns]
-    issue_col_store = {column: [] for column in columns}
+    if all_:
+        max_issues = None
 
-    if filter:
-        issues = jobj.fetch_issues_by_board_qf(boardname, issue_offset, max_issues, filter)
-    else:
-        issues = jobj.fetch_issues_by_board(boardname, issue_offset, max_issues)
-
-    for issue in issues:
-        if assignee and not is_issue_assigned_to(issue, assignee):
-            continue
-        for column in columns:
-            if is_issue_in_column(issue, columns[column], jobj):
-                issuestr = f"{issue.key}"
-                if summary_len:
-                    issuestr += f"\n{'-' * summary_len}\n{trim_text(issue.summary, summary_len)}\n{'_' * summary_len}"
-                issue_col_store[column].append(issuestr)
+    try:
+        columns = jobj.fetch_column_config_by_board(boardname)
+        ISSUE_HEADER = [column for column in columns]
+        issue_col_store = {column: [] for column in columns}
+
+        if filter:
+            issues = jobj.fetch_issues_by_board_qf(boardname, issue_offset,
+                                                   max_issues, filter)
+        else:
+            issues = jobj.fetch_issues_by_board(boardname, issue_offset,
+                                                max_issues, BOARD_SHOW_FIELDS)
+
+        for issue in issues:
+            if assignee and not is_issue_assigned_to(issue, assignee):
+                continue
+            for column in columns:
+                if is_issue_in_column(issue, columns[column], jobj):
+                    issuestr = f"{issue.key}"
+                    if summary_len:
+                        issuestr += f"\n{'-' * summary_len}\n" \
+                            f"{trim_text(issue.summary, summary_len)}\n" \
+                            f"{'_' * summary_len}"
+                    issue_col_store[column].append(issuestr)
+    except OFFLINE_ERRORS as e:
+        raise click.ClickException(str(e))
 
     final_output = tabulate(issue_col_store, ISSUE_HEADER, 'psql')
     display_via_pager(final_output, f"Board: {boardname}")
 
 
 @click.command(name='get-config')
-@click.argument('boardname')
+@click.argument('boardname', shell_complete=complete_from(completion.boards))
 def get_config_cmd(boardname):
     """
     Displays the board configuration specified by 'boardname'
@@ -148,7 +177,7 @@ def get_config_cmd(boardname):
 
 
 @click.command('sprints')
-@click.argument('boardname')
+@click.argument('boardname', shell_complete=complete_from(completion.boards))
 @click.option('--name', type=str, default=None,
               help='Display details for a specific sprint.')
 @click.option('--show-all', type=bool, is_flag=True, default=False,
@@ -172,17 +201,25 @@ def sprints_cmd(boardname, name, show_all, my_issues, no_issues, filter, json):
     columns = jobj.fetch_column_config_by_board(boardname)
     ISSUE_HEADER = [column for column in columns]
 
+    sprints = [sprint for sprint in sprints
+               if (show_all or sprint.state != "closed") and
+               (not name or name.lower() == sprint.name.lower())]
+
+    if not no_issues:
+        sprint_issues = asyncio.run(
+            _fetch_sprint_issues(jobj, boardname, sprints, filter))
+    else:
+        sprint_issues = [[] for _ in sprints]
+
+    match_assignee = None
+    if my_issues:
+        match_assignee = jobj.myself()
+
     final_output = ""
     json_sprints = []
-    for sprint in sprints:
+    for sprint, issues in zip(sprints, sprint_issues):
         current_sprint = {}
 
-        if not show_all and sprint.state == "closed":
-            continue
-
-        if name and name.lower() != sprint.name.lower():
-            continue
-
         issue_col_store = {column: [] for column in columns}
         try:
             start_date = sprint.startDate
@@ -202,19 +239,6 @@ def sprints_cmd(boardname, name, show_all, my_issues, no_issues, filter, json):
             current_sprint["start_date_str"] = start_date
             current_sprint["end_date_str"] = end_date
 
-        if not no_issues:
-            if filter:
-                issues = jobj.fetch_sprint_issues_with_qf(boardname, sprint.id, filter, 0, 250)
-            else:
-                issues_query = f'sprint = {sprint.id}'
-                issues = jobj._query_issues(issues_query, 0, 250)
-        else:
-            issues = []
-
-        match_assignee = None
-        if my_issues:
-            match_assignee = jobj.myself()
-
         for issue in issues:
             for column in columns:
                 if is_issue_in_column(issue, columns[column], jobj):
@@ -251,8 +275,21 @@ def sprints_cmd(boardname, name, show_all, my_issues, no_issues, filter, json):
         click.echo(JSON.dumps(json_sprints))
 
 
+async def _fetch_sprint_issues(jobj, boardname, sprints, filter):
+    """Fetch the issues of every sprint at once."""
+    async with connector.AsyncJiraConnector(jobj) as ajobj:
+        if filter:
+            calls = [ajobj.call(jobj.fetch_sprint_issues_with_qf, boardname,
+                                sprint.id, filter, 0, 250)
+                     for sprint in sprints]
+        else:
+            calls = [ajobj.query_issues(f'sprint = {sprint.id}', 0, 250)
+                     for sprint in sprints]
+        return await ajobj.gather(calls)
+
+
 @click.command("create-sprint")
-@click.argument("board")
+@click.argument("board", shell_complete=complete_from(completion.boards))
 @click.argument("name")
 @click.option("--start-date", type=click.DateTime(),
               help="Starting date for the sprint", default=None)
@@ -276,7 +313,7 @@ def create_sprint_cmd(board, name, start_date, end_date, goal):
 
 
 @click.command("autoexec")
-@click.argument("boardname")
+@click.argument("boardname", shell_complete=complete_from(completion.boards))
 @click.argument("source_sprint")
 @click.argument("destination_sprint")
 @click.option("--run", type=bool, is_flag=True, default=False, help="Actually make the changes.")
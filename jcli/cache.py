@@ -0,0 +1,254 @@
+"""
+On-disk caches for data that rarely changes on the server.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+CACHE_VERSION = 1
+DEFAULT_TTL = 24 * 60 * 60
+
+
+def cache_dir() -> str:
+    """Returns the directory used for jcli cache files."""
+    base = os.environ.get("XDG_CACHE_HOME") or \
+        os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "jcli")
+
+
+def cache_key(*parts) -> str:
+    """Returns a short, filesystem safe digest for the given parts."""
+    digest = hashlib.sha256("\0".join(str(p) for p in parts).encode())
+    return digest.hexdigest()[:16]
+
+
+def write_private_json(path, data):
+    """Atomically writes *data* as json to *path*, private to the user."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class JSONListWriter(object):
+    """Writes a json object whose *key* list is added to one item at a time.
+
+    The object starts out as *head*.  It is written to a temporary file,
+    which replaces *path* (readable only by the user) on commit(), so the
+    list never has to be held in memory.
+    """
+
+    def __init__(self, path, head, key):
+        self.path = path
+        directory = os.path.dirname(path)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd, self.tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        self.f = os.fdopen(fd, "w")
+        self.count = 0
+        try:
+            prefix = json.dumps(head)[:-1]
+            if head:
+                prefix += ", "
+            self.f.write(f"{prefix}{json.dumps(key)}: [")
+        except Exception:
+            self.discard()
+            raise
+
+    def append(self, item):
+        self.f.write(("," if self.count else "") + json.dumps(item))
+        self.count += 1
+
+    def commit(self):
+        try:
+            self.f.write("]}")
+            self.f.close()
+            os.chmod(self.tmp, 0o600)
+            os.replace(self.tmp, self.path)
+        except Exception:
+            self.discard()
+            raise
+
+    def discard(self):
+        try:
+            self.f.close()
+        except OSError:
+            pass
+        try:
+            os.unlink(self.tmp)
+        except OSError:
+            pass
+
+
+def read_json(path):
+    """Reads a json file, returning None if it is missing or corrupt."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class MetadataCache(object):
+    """A versioned, TTL based store of server metadata.
+
+    Entries are kept in a single json file per (server, user) pair, so
+    switching between instances or accounts never mixes results.  Any file
+    written by a different CACHE_VERSION is ignored.
+    """
+
+    def __init__(self, server, user, ttl=DEFAULT_TTL, directory=None):
+        self.server = server
+        self.user = user
+        self.ttl = ttl
+        self.path = os.path.join(directory or cache_dir(),
+                                 f"metadata-{cache_key(server, user)}.json")
+        self._entries = None
+
+    def _load(self) -> dict:
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        data = read_json(self.path)
+        if not isinstance(data, dict) or \
+           data.get("version") != CACHE_VERSION or \
+           data.get("server") != self.server or \
+           data.get("user") != self.user:
+            return self._entries
+
+        self._entries = data.get("entries", {})
+        return self._entries
+
+    def get(self, name):
+        """Returns the cached data for *name*, or None if missing / expired."""
+        entry = self._load().get(name)
+        if entry is None:
+            return None
+        if self.ttl and time.time() - entry.get("stored", 0) > self.ttl:
+            return None
+        return entry.get("data")
+
+    def put(self, name, data):
+        self._load()[name] = {"stored": time.time(), "data": data}
+        write_private_json(self.path, {"version": CACHE_VERSION,
+                                       "server": self.server,
+                                       "user": self.user,
+                                       "entries": self._entries})
+
+    def clear(self):
+        self._entries = {}
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class IssueCache(object):
+    """Issue json kept for revalidation against the issue's 'updated' time.
+
+    Each issue is stored in its own file (per set of requested fields),
+    under a directory kept per (server, user) pair.  Nothing here expires;
+    callers check that an entry is still current before using it.
+    """
+
+    def __init__(self, server, user, directory=None):
+        self.directory = os.path.join(directory or cache_dir(),
+                                      f"issues-{cache_key(server, user)}")
+
+    def _path(self, key, fields) -> str:
+        return os.path.join(self.directory,
+                            f"{cache_key(key.upper(), fields)}.json")
+
+    def get(self, key, fields):
+        """Returns the stored raw issue, or None."""
+        data = read_json(self._path(key, fields))
+        if not isinstance(data, dict) or \
+           data.get("version") != CACHE_VERSION or \
+           data.get("key") != key.upper() or \
+           data.get("fields") != fields:
+            return None
+        return data.get("raw")
+
+    def put(self, key, fields, raw):
+        write_private_json(self._path(key, fields),
+                           {"version": CACHE_VERSION,
+                            "key": key.upper(),
+                            "fields": fields,
+                            "stored": time.time(),
+                            "raw": raw})
+
+    def clear(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        for name in names:
+            try:
+                os.unlink(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+class CompletionCache(MetadataCache):
+    """Choice lists offered when completing command lines.
+
+    Unlike metadata, an expired list is still handed out (so completing
+    never waits on the server) while a fresh copy is fetched; *lookup*
+    says whether that is needed.
+    """
+
+    REFRESH_LOCK_TIMEOUT = 60
+
+    def __init__(self, server, user, ttl=DEFAULT_TTL, directory=None):
+        super().__init__(server, user, ttl, directory)
+        self.path = os.path.join(os.path.dirname(self.path),
+                                 f"completion-{cache_key(server, user)}.json")
+
+    def lookup(self, name):
+        """Returns (choices, fresh); choices is None when never stored."""
+        entry = self._load().get(name)
+        if entry is None:
+            return None, False
+        fresh = not self.ttl or \
+            time.time() - entry.get("stored", 0) <= self.ttl
+        return entry.get("data"), fresh
+
+    def claim_refresh(self, name) -> bool:
+        """True for the one caller that should refresh *name*.
+
+        Completion runs on every keystroke; a lock file keeps those from
+        all starting a refresh.  A lock older than REFRESH_LOCK_TIMEOUT is
+        taken to be left over from a refresh that died.
+        """
+        lock = f"{self.path}.{cache_key(name)}.lock"
+        os.makedirs(os.path.dirname(lock), mode=0o700, exist_ok=True)
+        try:
+            if time.time() - os.stat(lock).st_mtime > \
+               self.REFRESH_LOCK_TIMEOUT:
+                os.unlink(lock)
+        except OSError:
+            pass
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY,
+                             0o600))
+        except FileExistsError:
+            return False
+        return True
+
+    def release_refresh(self, name):
+        try:
+            os.unlink(f"{self.path}.{cache_key(name)}.lock")
+        except OSError:
+            pass
@@ -0,0 +1,120 @@
+"""
+The jcli entry point.
+
+When a 'jcli daemon' is running, the command line is handed to it and its
+output copied back, so the command doesn't pay for importing click, jira
+and friends, reading the config and logging in.  Otherwise (or when the
+daemon can't take the command) it is run here as usual.  Only the
+standard library is imported until that decision is made.
+"""
+import json
+import os
+import socket
+import struct
+import sys
+
+from jcli import cache
+
+# Replies are framed as a channel byte and a length (or exit status).
+FRAME = struct.Struct("!cI")
+STDOUT = b"o"
+STDERR = b"e"
+EXIT = b"x"
+RUN_LOCALLY = b"l"
+
+# Commands that are always run in this process.
+LOCAL_COMMANDS = {"daemon", "shell-cmd", "login", "config"}
+
+# Options of the top-level group that take a value.
+VALUE_OPTIONS = {"--config"}
+
+# Environment variables the command sees: jcli's own, plus those click's
+# shell completion is driven by.
+FORWARD_ENV = ("JCLI_", "_JCLI_COMPLETE", "COMP_")
+
+
+def socket_path() -> str:
+    """Where the daemon listens; only the user can reach it."""
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "jcli", "daemon.sock")
+    return os.path.join(cache.cache_dir(), "daemon.sock")
+
+
+def _command(argv):
+    """The subcommand in *argv*, skipping the top-level options."""
+    args = iter(argv)
+    for arg in args:
+        if arg in VALUE_OPTIONS:
+            next(args, None)
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+
+def _read_exactly(f, size) -> bytes:
+    data = f.read(size)
+    if len(data) != size:
+        raise ConnectionError("jcli daemon went away")
+    return data
+
+
+def forward(argv, path=None):
+    """Run *argv* in the daemon, copying its output to ours.
+
+    Returns the exit status, or None when the command should be run
+    locally instead (no daemon, or one that can't run this command).
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        # No unix sockets (Windows), so there can't be a daemon.
+        return None
+
+    path = path or socket_path()
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    except (AttributeError, OSError):
+        return None
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+
+    request = {"argv": argv, "cwd": os.getcwd(),
+               "env": {k: v for k, v in os.environ.items()
+                       if k.startswith(FORWARD_ENV)}}
+    streams = {STDOUT: sys.stdout, STDERR: sys.stderr}
+    with sock, sock.makefile("rb") as f:
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        output = False
+        while True:
+            header = f.read(FRAME.size)
+            if len(header) != FRAME.size:
+                if not output:
+                    return None
+                sys.stderr.write("Error: jcli daemon went away.\n")
+                return 1
+
+            channel, value = FRAME.unpack(header)
+            if channel == EXIT:
+                return value
+            if channel == RUN_LOCALLY:
+                return None
+
+            stream = streams[channel]
+            stream.flush()
+            stream.buffer.write(_read_exactly(f, value))
+            stream.buffer.flush()
+            output = True
+
+
+def main():
+    argv = sys.argv[1:]
+    if not os.environ.get("JCLI_NO_DAEMON") and \
+       _command(argv) not in LOCAL_COMMANDS:
+        status = forward(argv)
+        if status is not None:
+            sys.exit(status)
+
+    from jcli import shell
+    shell.cli()
@@ -0,0 +1,42 @@
+"""
+Choices for completing (and checking) command line values.
+
+Each getter returns a list of names, from the on-disk completion cache when
+there is one, so pressing tab doesn't wait for a log in.  They are used
+through utils.RuntimeEvalChoice, or utils.complete_from for values that
+are only suggested.
+"""
+from jcli import connector
+
+
+def _choices(name, fetch):
+    def getter(refresh=False) -> list:
+        try:
+            jobj = connector.JiraConnector()
+            return jobj.completion_choices(name, fetch, refresh)
+        except Exception:
+            return []
+    return getter
+
+
+link_types = _choices(
+    "link_types", lambda jobj: [x.name for x in jobj._get_link_types()])
+
+statuses = _choices(
+    "statuses",
+    lambda jobj: sorted({s.name for s in jobj._get_statuses()}))
+
+projects = _choices(
+    "projects", lambda jobj: sorted(p.key for p in jobj._get_projects()))
+
+boards = _choices(
+    "boards", lambda jobj: sorted({b.name for b in jobj.fetch_boards()}))
+
+
+def saved_queries(refresh=False) -> list:
+    """Saved query names are read straight from the configuration."""
+    try:
+        jobj = connector.JiraConnector(load_safe=True)
+        return sorted(jobj._config_get_nested("jira.saved_queries") or {})
+    except Exception:
+        return []
@@ -1,24 +1,35 @@
 import base64
+import collections
+import concurrent.futures
+import contextlib
 import datetime
+import functools
 import getpass
 import hashlib
+import itertools
 import random
 import string
+from jcli import cache
 from jcli import utils
-from jira import JIRA
-from jira.exceptions import JIRAError
-from jira.resources import User
-from jira.utils import json_loads
-import jira
 import json
 import os
 import pathlib
 import pprint
 import re
+import stat
 import time
 import types
 import urllib
 import yaml
+import zoneinfo
+
+# Only loaded once a command talks to the server (or the mirror).
+asyncio = utils.lazy_import("asyncio")
+issuedb = utils.lazy_import("jcli.issuedb")
+jira = utils.lazy_import("jira")
+jql = utils.lazy_import("jcli.jql")
+ratelimit = utils.lazy_import("jcli.ratelimit")
+transport = utils.lazy_import("jcli.transport")
 
 # Easy Agile Planning Poker - Forge extension identifiers (fixed for this app)
 EAUSM_FORGE_EXTENSION_ID = (
@@ -29,6 +40,24 @@ EAUSM_FORGE_MODULE_KEY = "planning-poker-forge-panel"
 EAUSM_FORGE_APP_VERSION = "3.120.0"
 EAUSM_FORGE_ENVIRONMENT_TYPE = "PRODUCTION"
 
+# How much of an issue get_issue() fetches for each profile.
+ISSUE_PROFILES = {
+    "minimal": "summary,issuetype,status",
+    "standard": "*navigable",
+    "full": "*all",
+}
+
+# The most issues the server accepts in one issue/bulk request.
+BULK_CREATE_LIMIT = 50
+
+# The most users looked up with one user/bulk request.
+USER_BULK_LIMIT = 50
+
+SESSION_VERSION = 1
+DEFAULT_SESSION_TTL = 8 * 60 * 60
+
+SNAPSHOT_VERSION = 2
+
 EAUSM_FORGE_INVOKE_MUTATION = """mutation forge_ui_invokeExtension($input: InvokeExtensionInput!) {
   invokeExtension(input: $input) {
     success
@@ -98,28 +127,151 @@ except:
         return None
 
 
+class LazyIssueFields(dict):
+    """An issue's raw 'fields', which fetches the 'eausm' entry on demand.
+
+    Reading (or checking for) the key runs *loader* once; a result of None
+    leaves the key absent.
+    """
+
+    def __init__(self, fields, loader):
+        super().__init__(fields)
+        self._loader = loader
+
+    def load(self):
+        if self._loader is not None:
+            loader, self._loader = self._loader, None
+            value = loader()
+            if value is not None:
+                self['eausm'] = value
+
+    def __getitem__(self, key):
+        if key == 'eausm':
+            self.load()
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        if key == 'eausm':
+            self.load()
+        return super().__contains__(key)
+
+    def get(self, key, default=None):
+        if key == 'eausm':
+            self.load()
+        return super().get(key, default)
+
+
+class FieldIndex(object):
+    """Lookups over the server's field list, built once per connector.
+
+    Resolving a field name (which may be a display name, in any case) is
+    then a dict lookup, rather than a scan of what are often well over a
+    thousand custom fields.  Where names repeat, the first field wins.
+    """
+
+    def __init__(self, fields):
+        self.ids = set()
+        self.folded_ids = {}     # folded id -> id
+        self.names = {}          # folded display name -> id, any field
+        self.custom = {}         # custom field id -> display name
+        self.custom_names = {}   # display name -> custom field id
+        self.custom_folded = {}  # folded display name -> custom field id
+        self.types = {}          # custom field id -> schema type
+
+        for field in fields:
+            fid, name = field['id'], field['name']
+            self.ids.add(fid)
+            self.folded_ids.setdefault(fid.lower(), fid)
+            self.names.setdefault(name.lower(), fid)
+            if field['custom']:
+                self.custom[fid] = name
+                self.custom_names.setdefault(name, fid)
+                self.custom_folded.setdefault(name.lower(), fid)
+                self.types[fid] = field['schema']['type']
+
+    def custom_id(self, name, casecmp=True):
+        """The id of the custom field displayed as *name*, or None."""
+        if casecmp:
+            return self.custom_names.get(name)
+        return self.custom_folded.get(name.lower())
+
+    def resolve(self, raw_fields, name, casecmp=True):
+        """What *name* refers to, given an issue's *raw_fields*.
+
+        Returns (key, True) for one of the raw fields' keys, (id, False)
+        for a custom field displayed as *name*, or (None, False).
+        """
+        if name in raw_fields:
+            return name, True
+
+        folded = name.lower()
+        if not casecmp:
+            fid = self.folded_ids.get(folded)
+            if fid is not None and fid in raw_fields:
+                return fid, True
+
+        fid = self.custom_id(name, casecmp)
+        if fid is not None:
+            return fid, False
+
+        if not casecmp:
+            # Not a field the server listed; compare with each key.
+            for rawfield in raw_fields:
+                if rawfield.lower() == folded:
+                    return rawfield, True
+        return None, False
+
+
 class JiraConnector(object):
     def __init__(self, config_file=None, load_safe=False):
         self.config_file = config_file or self._default_config_file()
         self.config = self._load_cfg(load_safe)
         self.report_weights = None
         self.jira = None
-        self.last_call_time = 0  # Store last call timestamp
+        self.use_cache = self._cache_enabled()
+        self.offline = False
 
-    def _ratelimit(self):
-        current_time = time.time()
-        elapsed_time = current_time - self.last_call_time
+    def _limiter(self):
+        """The token bucket shared by every connection to this server.
 
-        call_interval = int(self.get_default_str("call_interval", "500"))
-        wait_time = int(self.get_default_str("wait_time", "500"))
+        'rate_limit' is in calls per second.  Older configs only have
+        'call_interval' (ms between calls), which is converted.
+        """
+        if getattr(self, '_bucket', None) is None:
+            rate = self.get_default_str("rate_limit", None)
+            if rate is None:
+                interval = int(self.get_default_str("call_interval", "500"))
+                rate = 1000.0 / interval if interval else 0
+            burst = int(self.get_default_str("rate_burst", "5"))
+            self._bucket = ratelimit.bucket_for(
+                self.config['jira'].get('server'), float(rate), burst)
+        return self._bucket
 
-        if not call_interval:
-            return
+    def _ratelimit(self):
+        self._limiter().acquire()
 
-        if (elapsed_time * 1000) < call_interval:
-            time.sleep(wait_time / 1000)
+    def _track_ratelimits(self):
+        """Let server responses (429s, X-RateLimit-*) adjust our limits."""
+        self.jira._session.hooks['response'].append(
+            self._limiter().response_hook)
 
-        self.last_call_time = elapsed_time
+    def _configure_transport(self):
+        """Give the session a connection pool, retries and timeouts.
+
+        The pool holds 'pool_size' connections (by default, one per
+        worker), so concurrent calls don't open and drop connections.
+        'connect_timeout' and 'timeout' (read) are in seconds, and
+        idempotent requests are retried up to 'retries' times.
+        """
+        adapter = transport.make_adapter(
+            int(self.get_default_str("pool_size", self._workers())),
+            retries=int(self.get_default_str("retries",
+                                             transport.DEFAULT_RETRIES)),
+            connect_timeout=float(self.get_default_str(
+                "connect_timeout", transport.DEFAULT_CONNECT_TIMEOUT)),
+            read_timeout=float(self.get_default_str(
+                "timeout", transport.DEFAULT_READ_TIMEOUT)))
+        transport.configure(self.jira._session, adapter)
 
     def _load_cfg(self, load_safe):
         """Load a config yaml"""
@@ -192,15 +344,17 @@ class JiraConnector(object):
                 raise ValueError("Missing 'key' for 'api' auth type")
             token = self.config['auth']['key']
             if 'pat' in self.config['auth'] and bool(self.config['auth']['pat']):
-                self.jira = JIRA(self.config['jira'], token_auth=token)
+                self.jira = jira.JIRA(self.config['jira'], token_auth=token)
         elif auth_type == 'kerberos':
             kerberos_options = None
             if 'kerberos_options' in self.config['auth']:
                 kerberos_options = self.config['auth']['kerberos_options']
-            self.jira = JIRA(self.config['jira'], kerberos=True,
-                             kerberos_options=kerberos_options)
+            self.jira = jira.JIRA(self.config['jira'], kerberos=True,
+                                  kerberos_options=kerberos_options)
         elif auth_type == 'password':
             if 'password' not in self.config['auth']:
+                if not utils.HAS_TERMINAL:
+                    raise utils.NeedsTerminal()
                 token = getpass.getpass(prompt="Enter your Jira password: ")
             else:
                 token = self.config['auth']['password']
@@ -224,8 +378,8 @@ class JiraConnector(object):
 
             if 'token' in self.config['auth'] and \
                bool(self.config['auth']['token']):
-                self.jira = JIRA(self.config['jira'],
-                                 token_auth=entry.get("password"))
+                self.jira = jira.JIRA(self.config['jira'],
+                                      token_auth=entry.get("password"))
             else:
                 username = entry.get("login")
                 token = entry.get("password")
@@ -233,39 +387,417 @@ class JiraConnector(object):
             cookies = get_browser_cookies(self.config['jira']['server'])
             if not cookies:
                 raise ValueError("ERROR: No browser cookies detected (or browser_cookies3 not installed).")
-            self.jira = JIRA(server=self.config['jira']['server'],
-                             options={"cookies": cookies})
+            self.jira = jira.JIRA(server=self.config['jira']['server'],
+                                  options={"cookies": cookies})
         else:
             raise ValueError(f"Unknown auth type: {auth_type}")
 
         if self.jira is None:
             if username is None:
                 username = self.config['auth']['username']
-            self.jira = JIRA(self.config['jira'], basic_auth=(username,
-                                                              token))
+            self.jira = jira.JIRA(self.config['jira'],
+                                  basic_auth=(username, token))
             self._ratelimit()
 
-    def login(self):
-        cached_creds = pathlib.Path(f"/tmp/.{getpass.getuser()}.jirasess")
-        if cached_creds.is_file():
-            # found a cached credentials file
+        self._configure_transport()
+        self._track_ratelimits()
+
+    def login(self, refresh=False, offline=False):
+        """Log in, reusing a saved session when one is available.
+
+        Setting *refresh* skips any saved session and always performs the
+        full authentication.  With *offline*, nothing is sent to the server
+        at all, and searches are answered from the local issue mirror.
+        """
+        if offline:
+            self._go_offline()
+            return
+
+        if not refresh and self.jira is not None and not self.offline:
+            # Already logged in; 'jcli daemon' keeps connectors around.
+            return
+
+        self.offline = False
+        if not refresh and self._restore_session():
+            return
+
+        throw_code = 0
+        try:
+            self._login()
+        except jira.exceptions.JIRAError as je:
+            throw_code = je.status_code
+
+        if throw_code:
+            if throw_code == 401:
+                raise RuntimeError(
+                    "Error logging in: double check your key, and login.")
+            else:
+                raise RuntimeError(f"Error logging in: {throw_code}")
+
+        self._save_session()
+
+    def _session_file(self):
+        return pathlib.Path(f"/tmp/.{getpass.getuser()}.jirasess")
+
+    def _session_enabled(self) -> bool:
+        if not isinstance(self.config.get('jira'), dict) or \
+           'server' not in self.config['jira']:
+            return False
+        return self._default_bool("session_cache", True)
+
+    def _session_identity(self) -> dict:
+        """Details that must match for a saved session to be reused."""
+        auth = self.config.get('auth') or {}
+        return {"server": self.config['jira']['server'],
+                "type": auth.get('type', 'cookie_harvest'),
+                "username": auth.get('username')}
+
+    def _save_session(self):
+        """Write the session cookies and token header to the session file.
+
+        Basic auth passwords are never written; those sessions are only
+        reusable while the server issued cookies stay valid.
+        """
+        if self.jira is None or not self._session_enabled():
+            return
+
+        session = self.jira._session
+        headers = {}
+        if isinstance(session.auth, jira.client.TokenAuth):
+            headers['Authorization'] = f"Bearer {session.auth._token}"
+
+        cookies = [{"name": c.name, "value": c.value, "domain": c.domain,
+                    "path": c.path, "expires": c.expires,
+                    "secure": c.secure} for c in session.cookies]
+        if not headers and not cookies:
+            return
+
+        ttl = int(self.get_default_str("session_ttl", DEFAULT_SESSION_TTL))
+        data = {"version": SESSION_VERSION,
+                "identity": self._session_identity(),
+                "expires": time.time() + ttl,
+                "deploymentType": getattr(self.jira, 'deploymentType', None),
+                "serverVersion": list(getattr(self.jira, '_version', ())),
+                "headers": headers,
+                "cookies": cookies}
+        try:
+            cache.write_private_json(str(self._session_file()), data)
+        except OSError:
+            # Likely someone else owns the file; just don't persist.
+            pass
+
+    def _load_session(self):
+        """Returns the saved session data, if it is safe and usable."""
+        path = self._session_file()
+        try:
+            st = os.lstat(path)
+        except OSError:
+            return None
+
+        # The file lives in a shared directory, so refuse anything that
+        # isn't a private regular file owned by us.
+        if not stat.S_ISREG(st.st_mode) or not self._private_to_us(st):
+            return None
+
+        data = cache.read_json(path)
+        if not isinstance(data, dict) or \
+           data.get("version") != SESSION_VERSION or \
+           data.get("identity") != self._session_identity():
+            return None
+
+        if data.get("expires", 0) < time.time():
+            self.clear_session()
+            return None
+
+        return data
+
+    def _restore_session(self) -> bool:
+        if not self._session_enabled():
+            return False
+
+        data = self._load_session()
+        if data is None:
+            return False
+
+        self.jira = jira.JIRA(self.config['jira'], get_server_info=False)
+        self.jira.deploymentType = data.get("deploymentType")
+        self.jira._version = tuple(data.get("serverVersion") or (0, 0, 0))
+
+        session = self.jira._session
+        session.headers.update(data.get("headers", {}))
+        for c in data.get("cookies", []):
+            session.cookies.set(c["name"], c["value"], domain=c["domain"],
+                                path=c["path"], expires=c["expires"],
+                                secure=c["secure"])
+        session.hooks['response'].append(self._session_expired_hook)
+        self._configure_transport()
+        self._track_ratelimits()
+        return True
+
+    def _session_expired_hook(self, response, *args, **kwargs):
+        """Re-authenticate and replay a request rejected with a 401.
+
+        Once their cookie expires, many servers answer as the anonymous
+        user instead of rejecting the request, so that is treated the same.
+        Only installed on sessions rebuilt from the session file.
+        """
+        if response.status_code != 401 and \
+           response.headers.get("X-AUSERNAME") != "anonymous":
+            return response
+
+        self.clear_session()
+        self._login()
+        self._save_session()
+
+        request = response.request
+        headers = {k: v for k, v in request.headers.items()
+                   if k.lower() not in ('authorization', 'cookie',
+                                        'content-length')}
+        return self.jira._session.request(request.method, request.url,
+                                          data=request.body, headers=headers)
+
+    def _mirror(self):
+        if getattr(self, '_issue_mirror', None) is None:
+            self._issue_mirror = issuedb.IssueMirror(
+                self.config['jira']['server'], self._cache_user())
+        return self._issue_mirror
+
+    def _go_offline(self):
+        """Set up a client that only uses what is stored locally.
+
+        Without a mirror, only saved query snapshots can be used.
+        """
+        self.jira = jira.JIRA(self.config['jira'], get_server_info=False)
+        self.offline = True
+        self._fields = []
+        self._cached_statuses = []
+
+        mirror = self._mirror()
+        if not mirror.exists():
+            return
+
+        # Seed the metadata that searches and output rely on.
+        self.jira.deploymentType = mirror.get_meta("deploymentType")
+        self._fields = mirror.fields()
+        self._cached_statuses = [
+            jira.resources.Status(self.jira._options, self.jira._session,
+                                  raw=r)
+            for r in mirror.get_meta("statuses") or []]
+
+    def _mirror_since(self, since) -> str:
+        """Formats *since* for JQL, in the user's own timezone."""
+        tz = None
+        try:
+            tz = zoneinfo.ZoneInfo(
+                self._mirror().get_meta("myself")['timeZone'])
+        except (KeyError, TypeError, ValueError,
+                zoneinfo.ZoneInfoNotFoundError):
             pass
-        else:
-            throw_code = 0
+        # JQL dates only go down to the minute, so back up by one.
+        when = datetime.datetime.fromtimestamp(since - 60, tz)
+        return when.strftime("%Y/%m/%d %H:%M")
+
+    def _mirror_metadata(self):
+        """Store what offline searches need besides the issues."""
+        mirror = self._mirror()
+        self._ratelimit()
+        mirror.put_meta("myself", self.jira.myself())
+        mirror.put_meta("deploymentType", self.jira.deploymentType)
+        mirror.put_fields(self._jira_fields())
+        mirror.put_meta("statuses", [st.raw for st in self._get_statuses()])
+        self._ratelimit()
+        priorities = self.jira.priorities()
+        mirror.put_meta("priority_ranks",
+                        {p.name: len(priorities) - i
+                         for i, p in enumerate(priorities)})
+
+    def sync_mirror(self, jql, full=False) -> int:
+        """Copy the issues matching *jql* into the local mirror.
+
+        After the first sync of a query, only issues updated since the last
+        one are fetched, unless *full* is set.  A full sync also removes the
+        issues the query no longer finds.  Returns the number of issues
+        stored.
+        """
+        if self.jira is None or self.offline:
+            raise RuntimeError("Need to log-in first.")
+
+        mirror = self._mirror()
+        self._mirror_metadata()
+
+        scope = jql.strip()
+        query = re.split(r'\s+order\s+by\s+', f" {scope}",
+                         flags=re.IGNORECASE)[0].strip()
+        since = None if full else mirror.last_sync(scope)
+        if since is not None:
+            updated = f'updated >= "{self._mirror_since(since)}"'
+            query = f"({query}) AND {updated}" if query else updated
+
+        started = time.time()
+        found = []
+
+        def raws():
+            for issue in self._query_issues_iter(query, 0, None, ["*all"]):
+                found.append(issue.raw['key'])
+                yield issue.raw
+
+        count = mirror.put_issues(raws(), scope)
+        if since is None:
+            mirror.drop_missing(scope, found)
+        mirror.set_last_sync(scope, started)
+        return count
+
+    def mirror_board(self, board) -> str:
+        """Store a board's configuration, and return the query to sync.
+
+        That is the board's filter, without board_issues_query()'s status
+        clause, so that syncs see issues being closed; offline, the
+        status clause is applied to the mirrored issues.
+        """
+        if self.jira is None or self.offline:
+            raise RuntimeError("Need to log-in first.")
+
+        name = board if isinstance(board, str) else board.name
+        cfg = self._fetch_board_config_object(board)
+        self._ratelimit()
+        jql = self.jira.filter(cfg.filter).jql
+        self._mirror().put_meta(f"board:{name}", {"config": cfg.raw,
+                                                  "jql": jql})
+        return jql
+
+    def _mirrored_board(self, board) -> dict:
+        name = board if isinstance(board, str) else board.name
+        data = self._mirror().get_meta(f"board:{name}")
+        if data is None:
+            raise issuedb.MirrorError(
+                f"Board '{name}' isn't mirrored; run "
+                f"'jcli mirror sync --board \"{name}\"' first.")
+        return data
+
+    def _snapshot_path(self, name) -> str:
+        key = cache.cache_key(self.config['jira']['server'],
+                              self._cache_user(), name)
+        return os.path.join(cache.cache_dir(), f"query-{key}.json")
+
+    @contextlib.contextmanager
+    def query_snapshot_writer(self, name, query, startAt=0, maxResults=None):
+        """Store the results of a saved query as they arrive.
+
+        Yields a function to call with each raw issue; the issues are
+        written straight out, rather than kept.  The stored results only
+        replace the old ones once the block completes without error.
+        *startAt* and *maxResults* are the window the issues were fetched
+        with, so that later offline runs know what the snapshot covers.
+        """
+        head = {"version": SNAPSHOT_VERSION,
+                "jql": query,
+                "startAt": startAt,
+                "maxResults": maxResults,
+                "stored": time.time(),
+                "fields": self._jira_fields()}
+        if "currentuser" in query.lower():
+            self._ratelimit()
+            head["myself"] = self.jira.myself()
+
+        try:
+            out = cache.JSONListWriter(self._snapshot_path(name), head,
+                                       "issues")
+        except OSError:
+            out = None
+
+        def store(raw):
+            nonlocal out
+            if out is None:
+                return
             try:
-                self._login()
-            except jira.exceptions.JIRAError as je:
-                throw_code = je.status_code
+                out.append(raw)
+            except OSError:
+                out.discard()
+                out = None
 
-            if throw_code:
-                if throw_code == 401:
-                    raise RuntimeError(
-                        "Error logging in: double check your key, and login.")
-                else:
-                    raise RuntimeError(f"Error logging in: {throw_code}")
+        try:
+            yield store
+        except BaseException:
+            if out is not None:
+                out.discard()
+            raise
 
-            # pprint.pprint(vars(self.jira))
-            # pprint.pprint(vars(self.jira._session))
+        if out is not None:
+            try:
+                out.commit()
+            except OSError:
+                pass
+
+    def save_query_snapshot(self, name, query, raws, startAt=0,
+                            maxResults=None):
+        """Store the results of a saved query, for running it offline."""
+        with self.query_snapshot_writer(name, query, startAt,
+                                        maxResults) as store:
+            for raw in raws:
+                store(raw)
+
+    def query_snapshot_iter(self, name, query, startAt=0, maxResults=None):
+        """Evaluates *query* against a saved query's stored results.
+
+        Returns None if there's no snapshot for this query, or it doesn't
+        hold the requested window, otherwise an iterator over the issues
+        that (still) match.
+        """
+        data = cache.read_json(self._snapshot_path(name))
+        if not isinstance(data, dict) or \
+           data.get("version") != SNAPSHOT_VERSION or \
+           data.get("jql") != query:
+            return None
+        issues = data.get("issues", [])
+        skip = self._snapshot_skip(data.get("startAt", 0),
+                                   data.get("maxResults"), len(issues),
+                                   startAt, maxResults)
+        if skip is None:
+            return None
+
+        tz = None
+        try:
+            tz = zoneinfo.ZoneInfo(data["myself"]["timeZone"])
+        except (KeyError, TypeError, ValueError,
+                zoneinfo.ZoneInfoNotFoundError):
+            pass
+        ctx = jql.Context(data.get("myself"), data.get("fields", []), tz)
+        raws = jql.run(query, issues, ctx, skip, maxResults)
+        return (jira.resources.Issue(self.jira._options, self.jira._session,
+                                     raw=raw) for raw in raws)
+
+    @staticmethod
+    def _snapshot_skip(stored_at, stored_max, count, startAt, maxResults):
+        """How many stored issues to skip to answer the window *startAt*,
+        *maxResults* from a snapshot of *count* issues fetched with
+        *stored_at*, *stored_max*; None if the snapshot doesn't cover it.
+        """
+        if startAt < stored_at:
+            return None
+        # Fewer issues than asked for means the server had no more.
+        if stored_max is not None and count >= stored_max:
+            if maxResults is None or \
+               startAt + maxResults > stored_at + count:
+                return None
+        return startAt - stored_at
+
+    @staticmethod
+    def _private_to_us(st) -> bool:
+        """Whether the file *st* describes is ours, and only ours."""
+        if not hasattr(os, "getuid"):
+            # No uids or unix permissions to check (Windows).
+            return True
+        return st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+    def clear_session(self):
+        """Remove the saved session file, if it is ours."""
+        path = self._session_file()
+        try:
+            st = os.lstat(path)
+            if not hasattr(os, "getuid") or st.st_uid == os.getuid():
+                os.unlink(path)
+        except OSError:
+            pass
 
     def user_sprint_field(self):
         if self.jira is None:
@@ -291,6 +823,159 @@ class JiraConnector(object):
 
         return self.config['jira']['default'][key]
 
+    def _default_bool(self, key, default=False) -> bool:
+        value = self.get_default_str(key, default)
+        if isinstance(value, str):
+            return value.lower() not in ("false", "no", "off", "0", "")
+        return bool(value)
+
+    def _cache_enabled(self) -> bool:
+        """The metadata cache is on unless disabled by env or config."""
+        if os.environ.get("JCLI_NO_CACHE"):
+            return False
+
+        if not isinstance(self.config.get('jira'), dict):
+            return False
+
+        return self._default_bool("cache", True)
+
+    def _cache_user(self) -> str:
+        """The user that on-disk data is kept apart by."""
+        return self.config.get('auth', {}).get('username') or \
+            getpass.getuser()
+
+    def _metadata_cache(self):
+        if getattr(self, '_mcache', None) is None:
+            ttl = int(self.get_default_str("cache_ttl", cache.DEFAULT_TTL))
+            self._mcache = cache.MetadataCache(self.config['jira']['server'],
+                                               self._cache_user(), ttl)
+        return self._mcache
+
+    def _cached_metadata(self, name, fetch, refresh=False):
+        """Return the json-able metadata called *name*.
+
+        When caching is enabled the on-disk copy is used while it is fresh,
+        otherwise *fetch* is called and the result stored.
+        """
+        if not self.use_cache:
+            self._ratelimit()
+            return fetch()
+
+        mcache = self._metadata_cache()
+        data = None if refresh else mcache.get(name)
+        if data is None:
+            self._ratelimit()
+            data = fetch()
+            mcache.put(name, data)
+        return data
+
+    def _cached_resources(self, name, resource_type, fetch, keep=None,
+                          refresh=False):
+        """Like _cached_metadata, but for lists of jira Resources.
+
+        Only the raw json is stored (optionally trimmed to the *keep* keys),
+        and the resources are rebuilt from it on the way out.
+        """
+        if not self.use_cache:
+            self._ratelimit()
+            return fetch()
+
+        def fetch_raw():
+            raws = [r.raw for r in fetch()]
+            if keep:
+                raws = [{k: r[k] for k in keep if k in r} for r in raws]
+            return raws
+
+        raws = self._cached_metadata(name, fetch_raw, refresh)
+        return [resource_type(self.jira._options, self.jira._session, raw=r)
+                for r in raws]
+
+    def _completion_cache(self):
+        if getattr(self, '_ccache', None) is None:
+            ttl = int(self.get_default_str("completion_ttl",
+                                           cache.DEFAULT_TTL))
+            self._ccache = cache.CompletionCache(
+                self.config['jira']['server'], self._cache_user(), ttl)
+        return self._ccache
+
+    def _fetch_choices(self, fetch) -> list:
+        self.login()
+        return list(fetch(self))
+
+    def completion_choices(self, name, fetch, refresh=False) -> list:
+        """The choices called *name*, offered when completing command lines.
+
+        The on-disk copy is returned without logging in, even once expired;
+        then a background process fetches a new one for next time.  Only
+        when there is no copy (or with *refresh*) does this log in and call
+        *fetch* with the connector, waiting for the result.
+        """
+        if not self.use_cache or 'server' not in self.config['jira']:
+            return self._fetch_choices(fetch)
+
+        ccache = self._completion_cache()
+        choices, fresh = (None, False) if refresh else ccache.lookup(name)
+        if choices is None:
+            choices = self._fetch_choices(fetch)
+            ccache.put(name, choices)
+        elif not fresh and ccache.claim_refresh(name):
+            self._refresh_choices_in_background(name, fetch)
+        return choices
+
+    def _refresh_choices_in_background(self, name, fetch):
+        ccache = self._completion_cache()
+        if not hasattr(os, "fork"):
+            try:
+                ccache.put(name, self._fetch_choices(fetch))
+            finally:
+                ccache.release_refresh(name)
+            return
+
+        # Fork twice, so that the refresh outlives a shell completion and
+        # never lingers as a zombie of a long running 'jcli daemon'.
+        pid = os.fork()
+        if pid:
+            os.waitpid(pid, 0)
+            return
+
+        try:
+            os.setsid()
+            if os.fork():
+                os._exit(0)
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for fd in (0, 1, 2):
+                os.dup2(devnull, fd)
+            ccache.put(name, self._fetch_choices(fetch))
+        except BaseException:
+            pass
+        finally:
+            ccache.release_refresh(name)
+            os._exit(0)
+
+    def refresh_metadata_cache(self):
+        """Drop all cached metadata and download it again."""
+        if self.jira is None:
+            raise RuntimeError("Need to log-in first.")
+
+        for attr in ('_fields', '_findex', '_field_type_mapping',
+                     '_cached_statuses', '_cached_resolutions',
+                     '_cached_link_types', '_cached_projects'):
+            if hasattr(self, attr):
+                delattr(self, attr)
+
+        if self.use_cache:
+            self._metadata_cache().clear()
+        if self._issue_cache() is not None:
+            self._issue_cache().clear()
+        if self.use_cache:
+            self._completion_cache().clear()
+
+        self._jira_fields()
+        self._get_statuses()
+        self._get_resolutions()
+        self._get_link_types()
+        self._get_projects()
+
     def load_renderer(self, render_text):
         if not render_text or not len(render_text):
             raise RuntimeError("Render text is 'none'")
@@ -333,11 +1018,23 @@ class JiraConnector(object):
         if self.jira is None:
             raise RuntimeError("Need to log-in first")
 
-        try:
-            self._ratelimit()
-            result = self.jira.myself()
-        except JIRAError as e:
-            result = {'key': f"ERROR retrieving information {e}", "name": f"Error: {e}"}
+        if self.offline:
+            me = self._mirror().get_meta("myself") \
+                if self._mirror().exists() else None
+            if me is None:
+                raise issuedb.MirrorError(
+                    "The current user isn't known offline; run "
+                    "'jcli mirror sync' first.")
+            return me.get('accountId') if self._is_cloud() else me.get('name')
+
+        result = getattr(self, '_myself', None)
+        if result is None:
+            try:
+                self._ratelimit()
+                result = self._myself = self.jira.myself()
+            except jira.exceptions.JIRAError as e:
+                result = {'key': f"ERROR retrieving information {e}",
+                          "name": f"Error: {e}"}
 
         if self._is_cloud() and 'accountId' in result:
             return result['accountId']
@@ -349,63 +1046,328 @@ class JiraConnector(object):
             return result['displayName']
 
     def _query_issues(self, query='', startAt=0, maxResults=100) -> list:
+        return list(self._query_issues_iter(query, startAt, maxResults))
+
+    def _query_issues_iter(self, query='', startAt=0, maxResults=None,
+                           fields=None):
+        """Yields the issues matching *query*, one page at a time.
+
+        Pages are followed (by 'total' on server, or 'nextPageToken' on
+        cloud) until the results run out, or *maxResults* issues have been
+        returned.  A *maxResults* of None or 0 returns everything.
+        """
         if self.jira is None:
             raise RuntimeError("Need to log-in first.")
 
+        if self.offline:
+            for raw in self._mirror().search(query, startAt, maxResults):
+                yield jira.resources.Issue(self.jira._options,
+                                           self.jira._session, raw=raw)
+            return
+
+        self._prime_search_fields()
+
+        limit = maxResults or None
+        if self.jira._is_cloud:
+            # Cloud searches can't start at an offset, so skip up to it.
+            skip = startAt
+            pages = self._cloud_search_pages(
+                query, None if limit is None else limit + skip, fields)
+        else:
+            skip = 0
+            pages = self._server_search_pages(query, startAt, limit, fields)
+
+        count = 0
+        for raw_issues in pages:
+            for raw in raw_issues:
+                if skip:
+                    skip -= 1
+                    continue
+                if limit is not None and count >= limit:
+                    return
+                count += 1
+                yield jira.resources.Issue(self.jira._options,
+                                           self.jira._session, raw=raw)
+
+    def search_text(self, text, project=None, maxResults=None):
+        """Yields the mirrored issues containing *text*, best first."""
+        if self.jira is None:
+            raise RuntimeError("Need to log-in first.")
+
+        for raw in self._mirror().text_search(text, project, maxResults):
+            yield jira.resources.Issue(self.jira._options,
+                                       self.jira._session, raw=raw)
+
+    def _page_size(self) -> int:
+        return int(self.get_default_str("page_size", "100"))
+
+    def _workers(self) -> int:
+        """Number of requests that may be in flight at once."""
+        return max(int(self.get_default_str("workers", "4")), 1)
+
+    def _search_page(self, query, startAt, maxResults, fields):
         self._ratelimit()
-        issues_list = self.jira.search_issues(query, startAt, maxResults)
-        return issues_list
+        return self.jira.search_issues(query, startAt, maxResults,
+                                       fields=fields, json_result=True)
+
+    def _server_search_pages(self, query, startAt, limit, fields):
+        """Yields the raw issue lists for a server search.
+
+        Once the first page reports 'total', the remaining windows are
+        independent, so they are fetched on a small pool of workers and
+        handed back in order.
+        """
+        want = self._page_size()
+        if limit is not None:
+            want = min(want, limit)
+
+        page = self._search_page(query, startAt, want, fields)
+        raw_issues = page.get('issues', [])
+        yield raw_issues
+        if not raw_issues:
+            return
+
+        # The server may cap pages below what we asked for.
+        step = len(raw_issues)
+        end = page.get('total', 0)
+        if limit is not None:
+            end = min(end, startAt + limit)
+        windows = [(pos, min(step, end - pos))
+                   for pos in range(startAt + step, end, step)]
+
+        workers = self._workers()
+        if workers == 1 or len(windows) <= 1:
+            for pos, size in windows:
+                yield self._search_page(query, pos, size,
+                                        fields).get('issues', [])
+            return
+
+        windows = iter(windows)
+        pending = collections.deque()
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        try:
+            # Keep a bounded number of pages in flight, so memory stays
+            # proportional to the page size rather than the result set.
+            for pos, size in itertools.islice(windows, workers * 2):
+                pending.append(pool.submit(self._search_page, query, pos,
+                                           size, fields))
+            while pending:
+                page = pending.popleft().result()
+                for pos, size in itertools.islice(windows, 1):
+                    pending.append(pool.submit(self._search_page, query,
+                                               pos, size, fields))
+                yield page.get('issues', [])
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _cloud_search_pages(self, query, limit, fields):
+        """Yields the raw issue lists for a cloud search.
+
+        Each page's token comes from the previous one, so these can only
+        be fetched in sequence.
+        """
+        token = None
+        count = 0
+        while limit is None or count < limit:
+            want = self._page_size()
+            if limit is not None:
+                want = min(want, limit - count)
 
-    def get_issue(self, issue_identifier):
-        """Retrieve a Jira issue based on either key or ID."""
+            self._ratelimit()
+            page = self.jira.enhanced_search_issues(
+                query, nextPageToken=token, maxResults=want, fields=fields,
+                json_result=True)
+            raw_issues = page.get('issues', [])
+            yield raw_issues
+
+            count += len(raw_issues)
+            token = page.get('nextPageToken')
+            if not raw_issues or not token or page.get('isLast'):
+                return
+
+    def get_issue(self, issue_identifier, profile="full", fields=None):
+        """Retrieve a Jira issue based on either key or ID.
+
+        The *profile* ('minimal', 'standard' or 'full') sets how much of the
+        issue is fetched, unless an explicit *fields* list is given.  The
+        planning poker details are only fetched once something reads
+        issue.raw['fields']['eausm'].
+        """
         if self.jira is None:
             raise RuntimeError("Need to log-in first.")
 
+        if fields is None:
+            fields = ISSUE_PROFILES[profile]
+
+        issue = self._revalidated_issue(issue_identifier, fields)
+        if issue is not None:
+            return issue
+
         self._ratelimit()
-        # Check if the issue_identifier is a numeric string (ID) or an
-        # alphanumeric string (key)
-        if issue_identifier.isdigit():
-            # If numeric string, assume it's the issue ID
-            issue = self.jira.issue(issue_identifier)
-        else:
-            # Otherwise, assume it's the issue key
-            issue = self.jira.issue(issue_identifier, fields='*all')
+        issue = self.jira.issue(issue_identifier, fields=fields)
+        if issue is not None:
+            self._store_issue(issue_identifier, fields, issue.raw)
 
         # Add support for the EZ Agile Planning Poker extension
-        if issue is not None and 'eausm' not in self.config['jira'] or \
-           bool(self.config['jira']['eausm']):
+        if issue is not None and self._eausm_enabled():
+            issue.raw['fields'] = LazyIssueFields(
+                issue.raw['fields'], lambda: self._fetch_eausm(issue))
+        return issue
+
+    def _issue_cache(self):
+        """The on-disk issue cache, or None when it is disabled."""
+        if not self.use_cache or not self._default_bool("issue_cache", True):
+            return None
+        if getattr(self, '_icache', None) is None:
+            self._icache = cache.IssueCache(self.config['jira']['server'],
+                                            self._cache_user())
+        return self._icache
+
+    def _revalidated_issue(self, issue_identifier, fields):
+        """Return the cached copy of an issue, if it is still current.
+
+        Checking costs a search for just the issue's 'updated' time, which
+        is far smaller than the issue itself.  Returns None when there is
+        no cached copy, or the issue changed since it was stored.
+        """
+        icache = self._issue_cache()
+        if icache is None:
+            return None
+
+        if not isinstance(fields, str):
+            fields = ",".join(fields)
+        raw = icache.get(issue_identifier, fields)
+        if raw is None:
+            return None
+
+        self._prime_search_fields()
+        self._ratelimit()
+        try:
+            page = self.jira.search_issues(f'key = "{issue_identifier}"',
+                                           0, 1, fields=["updated"],
+                                           validate_query=False,
+                                           json_result=True)
+        except jira.exceptions.JIRAError:
+            return None
+
+        found = page.get('issues', [])
+        if len(found) != 1 or found[0].get('key') != raw.get('key') or \
+           found[0]['fields'].get('updated') != raw['fields']['updated']:
+            return None
+        return self._issue_from_raw(raw)
+
+    def _store_issue(self, issue_identifier, fields, raw):
+        icache = self._issue_cache()
+        # Without an 'updated' time, there'd be no way to revalidate.
+        if icache is None or not raw.get('fields', {}).get('updated'):
+            return
+
+        if not isinstance(fields, str):
+            fields = ",".join(fields)
+        try:
+            icache.put(issue_identifier, fields, raw)
+        except OSError:
+            pass
+
+    def get_issues(self, keys, profile="full", fields=None) -> dict:
+        """Retrieve many issues by key, using as few searches as possible.
+
+        Returns a dict mapping every requested key to its issue, or to None
+        if the server has no such issue (or it isn't visible to us).
+        """
+        if self.jira is None:
+            raise RuntimeError("Need to log-in first.")
+
+        if fields is None:
+            fields = ISSUE_PROFILES[profile]
+
+        keys = list(dict.fromkeys(k for k in keys if k))
+        result = {key: None for key in keys}
+        wanted = {key.upper(): key for key in keys}
+
+        self._prime_search_fields()
+        chunk_size = self._page_size()
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start:start + chunk_size]
+            jql = "key in (" + ",".join(f'"{k}"' for k in chunk) + ")"
             self._ratelimit()
             try:
-                if self._is_cloud():
-                    # Cloud: planning poker is a Forge app, use GraphQL relay
-                    ctx_token, ctx_ids, cloud_id = \
-                        self._eausm_forge_context(issue)
-                    if ctx_token and ctx_ids:
-                        path = (f"/forge/rest/eausm/latest"
-                                f"/planningPoker/{issue.id}")
-                        eausm_data = self._eausm_forge_invoke(
-                            issue, ctx_token, ctx_ids, cloud_id,
-                            path, 'GET')
-                        if eausm_data is not None:
-                            issue.raw['fields']['eausm'] = eausm_data
-                else:
-                    # Server/DC: planning poker is a Connect add-on, direct REST
-                    EAUSM_url = (self.jira.server_url +
-                                 f"/rest/eausm/latest/planningPoker/{issue.id}")
-                    r = self.jira._session.get(EAUSM_url)
-                    EAUSM_json = json_loads(r)
-                    issue.raw['fields']['eausm'] = EAUSM_json
-            except Exception:
-                # Disable EAUSM for this session on any failure
-                self.config['jira']['eausm'] = {}
+                # Unknown keys would fail a validated query, rather than
+                # simply not matching.
+                page = self.jira.search_issues(jql, 0, len(chunk),
+                                               fields=fields,
+                                               validate_query=False,
+                                               json_result=True,
+                                               use_post=len(jql) > 2000)
+            except jira.exceptions.JIRAError:
+                continue
+
+            for raw in page.get('issues', []):
+                key = wanted.get(raw['key'].upper())
+                if key is not None:
+                    result[key] = self._issue_from_raw(raw)
+
+        # Anything left over may have been moved (and so has a new key), or
+        # the search may have failed; look those up one at a time.
+        for key in [k for k, v in result.items() if v is None]:
+            try:
+                result[key] = self.get_issue(key, fields=fields)
+            except jira.exceptions.JIRAError:
+                pass
+
+        return result
+
+    def _issue_from_raw(self, raw):
+        issue = jira.resources.Issue(self.jira._options, self.jira._session,
+                                     raw=raw)
+        if self._eausm_enabled():
+            issue.raw['fields'] = LazyIssueFields(
+                issue.raw['fields'], lambda: self._fetch_eausm(issue))
         return issue
 
+    def load_issue_details(self, issue):
+        """Fetch any lazily loaded details of *issue* now."""
+        if isinstance(issue.raw['fields'], LazyIssueFields):
+            issue.raw['fields'].load()
+
+    def _eausm_enabled(self) -> bool:
+        return 'eausm' not in self.config['jira'] or \
+            bool(self.config['jira']['eausm'])
+
+    def _fetch_eausm(self, issue):
+        """Returns the planning poker details for an issue, or None."""
+        if not self._eausm_enabled():
+            return None
+
+        self._ratelimit()
+        try:
+            if self._is_cloud():
+                # Cloud: planning poker is a Forge app, use GraphQL relay
+                ctx_token, ctx_ids, cloud_id = \
+                    self._eausm_forge_context(issue)
+                if ctx_token and ctx_ids:
+                    path = (f"/forge/rest/eausm/latest"
+                            f"/planningPoker/{issue.id}")
+                    return self._eausm_forge_invoke(
+                        issue, ctx_token, ctx_ids, cloud_id,
+                        path, 'GET')
+            else:
+                # Server/DC: planning poker is a Connect add-on, direct REST
+                EAUSM_url = (self.jira.server_url +
+                             f"/rest/eausm/latest/planningPoker/{issue.id}")
+                r = self.jira._session.get(EAUSM_url)
+                return jira.utils.json_loads(r)
+        except Exception:
+            # Disable EAUSM for this session on any failure
+            self.config['jira']['eausm'] = {}
+        return None
+
     def get_states_for_issue(self, issue_identifier) -> list:
         if self.jira is None:
             raise RuntimeError("Need to log-in first.")
 
         state_names = []
-        issue = self.get_issue(issue_identifier)
+        issue = self.get_issue(issue_identifier, "minimal")
 
         self._ratelimit()
         transitions = self.jira.transitions(issue)
@@ -418,7 +1380,7 @@ class JiraConnector(object):
             raise RuntimeError("Need to log-in first.")
 
         if isinstance(issue, str):
-            issue = self.get_issue(issue)
+            issue = self.get_issue(issue, "minimal")
 
         self._ratelimit()
         if resolution is not None:
@@ -434,7 +1396,7 @@ class JiraConnector(object):
             raise RuntimeError("Need to log-in first.")
 
         if isinstance(issue, str):
-            issue = self.get_issue(issue)
+            issue = self.get_issue(issue, "minimal")
 
         self._ratelimit()
         issue.update(fields={"issuetype": {"name": new_type}})
@@ -445,7 +1407,7 @@ class JiraConnector(object):
             raise RuntimeError("Need to log-in first.")
 
         if isinstance(issue, str):
-            issue = self.get_issue(issue)
+            issue = self.get_issue(issue, "minimal")
 
         self._ratelimit()
         if parent_key is None:
@@ -466,7 +1428,7 @@ class JiraConnector(object):
         if self.jira is None:
             raise RuntimeError("Need to log-in first.")
 
-        issue = self.get_issue(issue_identifier)
+        issue = self.get_issue(issue_identifier, "minimal")
 
         if isinstance(visibility, str) and visibility != 'all':
             visibility = {'type': 'group', 'value': visibility}
@@ -515,7 +1477,7 @@ class JiraConnector(object):
         if self.jira is None:
             raise RuntimeError("Need to log-in first.")
 
-        issue = self.get_issue(issue_identifier)
+        issue = self.get_issue(issue_identifier, "minimal")
         if issue is not None:
             self._ratelimit()
             self.jira.add_watcher(issue, watcher)
@@ -524,7 +1486,7 @@ class JiraConnector(object):
         if self.jira is None:
             raise RuntimeError("Need to log-in first.")
 
-        issue = self.get_issue(issue_identifier)
+        issue = self.get_issue(issue_identifier, "minimal")
         if issue is not None:
             self._ratelimit()
             self.jira.remove_watcher(issue, watcher)
@@ -627,21 +1589,35 @@ class JiraConnector(object):
 
     def _jira_fields(self):
         if not hasattr(self, "_fields"):
-            self._ratelimit()
-            self._fields = self.jira.fields()
+            self._fields = self._cached_metadata("fields", self.jira.fields)
 
         return self._fields
 
-    def _fetch_custom_fields(self) -> dict:
+    def _prime_search_fields(self):
+        """Seed the jira client's own field-name cache from ours.
+
+        search_issues() translates field names through a cache that it would
+        otherwise fill by downloading the full field list on first use.
+        """
+        if getattr(self.jira, '_fields_cache_value', None) == {}:
+            self.jira._fields_cache_value = {
+                name: f['id'] for f in self._jira_fields()
+                for name in f.get('clauseNames', [])}
+
+    def _field_index(self) -> FieldIndex:
         if self.jira is None:
             raise RuntimeError("Need to log-in first.")
 
-        if not hasattr(self, "_custom_field_mapping"):
-            custom_fields = self._jira_fields()
-            self._custom_field_mapping = {field['id']: field['name']
-                                          for field in custom_fields if field['custom']}
+        if getattr(self, "_findex", None) is None:
+            self._findex = FieldIndex(self._jira_fields())
+
+        return self._findex
 
-        return self._custom_field_mapping
+    def _case_sensitive(self) -> bool:
+        return bool(self.get_default_str('case_sensitive', "true"))
+
+    def _fetch_custom_fields(self) -> dict:
+        return self._field_index().custom
 
     def requested_fields(self) -> list:
         if self.jira is None:
@@ -660,6 +1636,21 @@ class JiraConnector(object):
 
         return requested
 
+    def search_field_ids(self, names) -> list:
+        """Map field names (as used in the yaml and get_field) to field ids.
+
+        The result is suitable for the 'fields' of a search.  Names that
+        aren't known are passed along as-is.
+        """
+        index = self._field_index()
+        result = []
+        for name in names:
+            fid = name if name in index.ids else \
+                index.names.get(name.lower(), name)
+            if fid not in result:
+                result.append(fid)
+        return result
+
     def excluded_fields(self) -> list:
         if self.jira is None:
             raise RuntimeError("Need to log-in first.")
@@ -682,16 +1673,12 @@ class JiraConnector(object):
         if self.jira is None:
             raise RuntimeError("Need to log-in first.")
 
-        fields = self._fetch_custom_fields()
+        index = self._field_index()
 
         if fieldname[0] == "^":
             return fieldname[1:]
 
-        for k in fields:
-            if fieldname == fields[k]:
-                return k
-
-        return fieldname
+        return index.custom_id(fieldname) or fieldname
 
     def _get_field(self, issue, fieldname, substruct=None):
         """Get a raw field value for an issue."""
@@ -701,18 +1688,15 @@ class JiraConnector(object):
         if isinstance(issue, str):
             issue = self.get_issue(issue)
 
-        casecmp = bool(self.get_default_str('case_sensitive', "true"))
-        for rawfield in issue.raw['fields']:
-            if not casecmp:
-                if rawfield.lower() != fieldname.lower():
-                    continue
-                else:
-                    # Since we are not caring about case, we found a
-                    # match, so 'force' the case correctly.
-                    fieldname = rawfield
-            elif rawfield != fieldname:
-                continue
+        field, raw = self._field_index().resolve(issue.raw['fields'],
+                                                 fieldname,
+                                                 self._case_sensitive())
+        if field is None:
+            return None
 
+        if raw:
+            # Without case sensitivity, this 'forces' the case correctly.
+            fieldname = field
             if issue.raw['fields'][fieldname] is None:
                 return "None"
             if isinstance(issue.raw['fields'][fieldname], str):
@@ -734,22 +1718,10 @@ class JiraConnector(object):
                     return str(issue.raw['fields'][fieldname])
                 return "(undecoded)"
 
-        fields = self._fetch_custom_fields()
-        val = None
-        for field in fields:
-            if not casecmp:
-                if fields[field].lower() != fieldname.lower():
-                    continue
-                else:
-                    fieldname = field
-            elif fields[field] != fieldname:
-                continue
-
-            try:
-                val = eval(f"issue.fields.{field}")
-            except:
-                val = None
-        return val
+        try:
+            return utils.compile_accessor(f"fields.{field}")(issue)
+        except Exception:
+            return None
 
     def get_field(self, issue, fieldname, substruct=None) -> str:
         """Get a field value as a string."""
@@ -823,35 +1795,12 @@ class JiraConnector(object):
         if isinstance(issue, str):
             issue = self.get_issue(issue)
 
-        found = False
-        casecmp = bool(self.get_default_str('case_sensitive', "true"))
-        for rawfield in issue.raw['fields']:
-            if not casecmp:
-                if rawfield.lower() != fieldname.lower():
-                    continue
-                else:
-                    fieldname = rawfield
-                    found = True
-            elif rawfield != fieldname:
-                continue
-
-        if found:
-            return self._get_field_allowed(issue, fieldname)
-
-        fields = self._fetch_custom_fields()
-        for field in fields:
-            if not casecmp:
-                if fields[field].lower() != fieldname.lower():
-                    continue
-                else:
-                    fieldname = field
-                    found = True
-            elif fields[field] != fieldname:
-                continue
-
-        if found:
-            return self._get_field_allowed(issue, fieldname)
-        return None
+        field, _ = self._field_index().resolve(issue.raw['fields'],
+                                               fieldname,
+                                               self._case_sensitive())
+        if field is None:
+            return None
+        return self._get_field_allowed(issue, field)
 
     def find_users_for_name(self, name) -> list:
         """
@@ -903,9 +1852,12 @@ class JiraConnector(object):
         if self.jira is None:
             raise RuntimeError("Need to log-in first.")
 
-        self._ratelimit()
-        projects = [p for p in self.jira.projects()
+        projects = [p for p in self._get_projects()
                     if p.name == project or p.key == project]
+        if not projects and self.use_cache:
+            # Possibly a project created since the list was cached.
+            projects = [p for p in self._get_projects(refresh=True)
+                        if p.name == project or p.key == project]
         if len(projects) != 1:
             raise ValueError(f"Unable to determine a project by {project}.")
         return projects[0].key
@@ -933,25 +1885,17 @@ class JiraConnector(object):
         full_fields = self.jira.project_issue_fields(project, issue_type.id)
         return [f.name for f in full_fields]
 
-    def set_field(self, issue, fieldname, val, forced=False):
-        """Set the field for an issue to a particular value."""
-        if self.jira is None:
-            raise RuntimeError("Need to log-in first.")
-
-        if isinstance(issue, str):
-            issue = self.get_issue(issue)
-
-        issue_dict = {}
-        casecmp = bool(self.get_default_str('case_sensitive', "true"))
-        for rawfield in issue.raw['fields']:
-            if not casecmp:
-                if rawfield.lower() != fieldname.lower():
-                    continue
-                else:
-                    fieldname = rawfield
-            elif rawfield != fieldname:
-                continue
-            f = eval(f"issue.fields.{fieldname}")
+    def _field_update(self, issue, fieldname, val, forced=False) -> dict:
+        """Build the update dict that sets an issue field to a value."""
+        field, raw = self._field_index().resolve(issue.raw['fields'],
+                                                 fieldname,
+                                                 self._case_sensitive())
+        if field is None:
+            return {}
+
+        if raw:
+            fieldname = field
+            f = utils.compile_accessor(f"fields.{fieldname}")(issue)
             if not isinstance(f, types.NoneType) and not forced:
                 val = self.convert_to_jira_type(f, val)
             elif not forced:
@@ -966,27 +1910,77 @@ class JiraConnector(object):
 
             else:
                 val = eval(val)
-            issue_dict = {fieldname: val}
-            break
+            return {fieldname: val}
 
-        fields = self._fetch_custom_fields()
-        for field in fields:
-            if not casecmp:
-                if fields[field].lower() != fieldname.lower():
-                    continue
-                else:
-                    fieldname = field
-            elif fields[field] != fieldname:
+        if not forced:
+            val = self.convert_to_field_type(field, val)
+        else:
+            val = eval(val)
+        return {field: val}
+
+    def set_field(self, issue, fieldname, val, forced=False):
+        """Set the field for an issue to a particular value."""
+        if self.jira is None:
+            raise RuntimeError("Need to log-in first.")
+
+        if isinstance(issue, str):
+            issue = self.get_issue(issue)
+
+        issue_dict = self._field_update(issue, fieldname, val, forced)
+        self._ratelimit()
+        issue.update(issue_dict)
+
+    def set_fields(self, issue, pairs, forced=False) -> list:
+        """Set several fields for an issue with a single update.
+
+        *pairs* is a list of (fieldname, value); when a field is named more
+        than once, the last value wins.  Fields that already hold the value
+        are left alone.  Returns a (fieldname, old, new) tuple for each field
+        that was changed.
+        """
+        if self.jira is None:
+            raise RuntimeError("Need to log-in first.")
+
+        if isinstance(issue, str):
+            issue = self.get_issue(issue)
+
+        issue_dict = {}
+        old = {}
+        for fieldname, val in dict(pairs).items():
+            current = self.get_field(issue, fieldname)
+            if not forced and current == val:
                 continue
+            old[fieldname] = current
+            issue_dict.update(self._field_update(issue, fieldname, val,
+                                                 forced))
 
-            if not forced:
-                val = self.convert_to_field_type(field, val)
-            else:
-                val = eval(val)
-            issue_dict = {field: val}
+        if not issue_dict:
+            return []
 
         self._ratelimit()
         issue.update(issue_dict)
+        return [(fieldname, old[fieldname], self.get_field(issue, fieldname))
+                for fieldname in old]
+
+    def update_issues(self, updates, forced=False) -> list:
+        """Run set_fields() for many issues on a pool of workers.
+
+        *updates* is a list of (issue, pairs) tuples.  Returns the changed
+        fields, or the exception raised while updating, for each entry.
+        """
+        if self.jira is None:
+            raise RuntimeError("Need to log-in first.")
+
+        def update_one(update):
+            issue, pairs = update
+            try:
+                return self.set_fields(issue, pairs, forced)
+            except Exception as e:
+                return e
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._workers()) as pool:
+            return list(pool.map(update_one, updates))
 
     def object_convert(self, field_value):
         listed = False
@@ -1056,9 +2050,7 @@ class JiraConnector(object):
         if self.jira is None:
             raise RuntimeError("Need to log-in first.")
 
-        custom_fields = self._jira_fields()
-        field_type_mapping = {field['id']: field['schema']['type']
-                              for field in custom_fields if field['custom']}
+        field_type_mapping = dict(self._field_index().types)
         field_type_mapping["assignee"] = "user"
         field_type_mapping["priority"] = "dict"
 
@@ -1093,7 +2085,8 @@ class JiraConnector(object):
         if hasattr(self, '_cached_statuses'):
             return self._cached_statuses
 
-        self._cached_statuses = self.jira.statuses()
+        self._cached_statuses = self._cached_resources(
+            "statuses", jira.resources.Status, self.jira.statuses)
         return self._cached_statuses
 
     def _get_resolutions(self):
@@ -1104,9 +2097,38 @@ class JiraConnector(object):
         if hasattr(self, '_cached_resolutions'):
             return self._cached_resolutions
 
-        self._cached_resolutions = self.jira.resolutions()
+        self._cached_resolutions = self._cached_resources(
+            "resolutions", jira.resources.Resolution, self.jira.resolutions)
         return self._cached_resolutions
 
+    def _get_link_types(self):
+
+        if self.jira is None:
+            raise RuntimeError("Need to log-in first.")
+
+        if hasattr(self, '_cached_link_types'):
+            return self._cached_link_types
+
+        self._cached_link_types = self._cached_resources(
+            "link_types", jira.resources.IssueLinkType,
+            self.jira.issue_link_types)
+        return self._cached_link_types
+
+    def _get_projects(self, refresh=False):
+
+        if self.jira is None:
+            raise RuntimeError("Need to log-in first.")
+
+        if hasattr(self, '_cached_projects') and not refresh:
+            return self._cached_projects
+
+        # The full project json carries avatars, leads, etc.  We only ever
+        # look projects up by key or name, so don't store the rest.
+        self._cached_projects = self._cached_resources(
+            "projects", jira.resources.Project, self.jira.projects,
+            keep=('self', 'id', 'key', 'name'), refresh=refresh)
+        return self._cached_projects
+
     def get_status_detail(self, statusId):
         if self.jira is None:
             raise RuntimeError("Need to log-in first.")
@@ -1120,33 +2142,93 @@ class JiraConnector(object):
                 return status
         return None
 
-    def issue_matches_conditions(self, issue, matching):
+    def _compile_match(self, matching):
+        """Compile a 'match' clause into a test of pre-extracted values.
+
+        The returned function takes a dict of field name -> get_field()
+        value; lists of expected values become sets where they can.
+        """
+        checks = []
         for field, expected in matching.items():
-            actual = self.get_field(issue, field)
             if isinstance(expected, list):
-                if isinstance(actual, list):
-                    if not any(val in actual for val in expected):
+                try:
+                    checks.append((field, True, frozenset(expected)))
+                except TypeError:
+                    checks.append((field, True, expected))
+            else:
+                checks.append((field, False, expected))
+
+        def match(values) -> bool:
+            for field, listed, expected in checks:
+                actual = values[field]
+                if not listed:
+                    if actual != expected:
                         return False
-                else:
-                    if actual not in expected:
+                elif isinstance(actual, list):
+                    if not any(val in actual for val in expected):
                         return False
-            else:
-                if actual != expected:
+                elif actual not in expected:
                     return False
-        return True
+            return True
+        return match
 
-    def filter_issue(self, issue, filtering):
+    def _compile_filter(self, filtering):
+        """Like _compile_match, for a whole 'filters' entry."""
+        match = None
+        alternatives = None
         if 'match' in filtering:
-            if not self.issue_matches_conditions(issue, filtering['match']):
-                return False
-
+            match = self._compile_match(filtering['match'])
         if 'or' in filtering:
-            if not any(self.issue_matches_conditions(issue,
-                                                     clause.get('match', {}))
-                       for clause in filtering['or']):
+            alternatives = [self._compile_match(clause.get('match', {}))
+                            for clause in filtering['or']]
+
+        def predicate(values) -> bool:
+            if match is not None and not match(values):
                 return False
+            if alternatives is not None and \
+               not any(alt(values) for alt in alternatives):
+                return False
+            return True
+        return predicate
 
-        return True
+    def _report_weights(self) -> dict:
+        if self.report_weights is None:
+            self.report_weights = {}
+
+            if 'reporting' in self.config['jira'] and \
+               'ordering' in self.config['jira']['reporting']:
+                ordering = self.config['jira']['reporting']['ordering']
+                for field, data in ordering.items():
+                    self.report_weights[field] = {
+                        'field_weight': data.get('weight', 1),
+                        'value_weights': data.get('values', {})
+                    }
+        return self.report_weights
+
+    def _compile_score(self):
+        """The 'ordering' config as a score of pre-extracted values."""
+        weights = [(field, spec['field_weight'], spec['value_weights'])
+                   for field, spec in self._report_weights().items()]
+
+        def score(values):
+            total = 0
+            for field, field_weight, value_weights in weights:
+                value = values[field]
+                if value in value_weights:
+                    total += field_weight + value_weights[value]
+            return total
+        return score
+
+    def _field_values(self, issue, names) -> dict:
+        return {name: self.get_field(issue, name) for name in names}
+
+    def issue_matches_conditions(self, issue, matching):
+        return self._compile_match(matching)(
+            self._field_values(issue, matching))
+
+    def filter_issue(self, issue, filtering):
+        return self._compile_filter(filtering)(
+            self._field_values(issue, self._filter_fields(filtering)))
 
     def report_filter_issues(self, list_name, issues):
         if self.jira is None:
@@ -1158,36 +2240,75 @@ class JiraConnector(object):
             raise RuntimeError(f"No reporting section for {list_name}")
 
         filter_config = self.config['jira']['reporting']['filters'][list_name]
-        return [i for i in issues if self.filter_issue(i, filter_config)]
+        predicate = self._compile_filter(filter_config)
+        names = self._filter_fields(filter_config)
+        return [i for i in issues
+                if predicate(self._field_values(i, names))]
 
     def report_compute_score(self, issue):
-        score = 0
-
-        for field, spec in self.report_weights.items():
-            field_weight = spec['field_weight']
-            value_weights = spec['value_weights']
-            value = self.get_field(issue, field)
-            if value in value_weights:
-                score += field_weight + value_weights[value]
-
-        return score
+        weights = self._report_weights()
+        return self._compile_score()(self._field_values(issue, weights))
 
     def report_sort_issue_list(self, issues):
         if self.jira is None:
             raise RuntimeError("Need to log-in first.")
 
-        if self.report_weights is None:
-            self.report_weights = {}
+        score = self._compile_score()
+        names = list(self._report_weights())
+        return sorted(issues,
+                      key=lambda x: -score(self._field_values(x, names)))
 
-            if 'reporting' in self.config['jira'] and \
-               'ordering' in self.config['jira']['reporting']:
-                for field, data in self.config['jira']['reporting']['ordering'].items():
-                    self.report_weights[field] = {
-                        'field_weight': data.get('weight', 1),
-                        'value_weights': data.get('values', {})
-                    }
+    def report_classify(self, issues, extra_fields=()):
+        """Sort *issues* into the report's lists in a single pass.
 
-        return sorted(issues, key=lambda x: -self.report_compute_score(x))
+        Each issue's fields are read once, then checked against every
+        filter.  Returns the (list name, [(issue, values)]) for each
+        filter, in configuration order, and the (issue, values) that no
+        filter matched, highest score first.  The values include
+        *extra_fields*, for display.
+        """
+        if self.jira is None:
+            raise RuntimeError("Need to log-in first.")
+
+        filters = (self.config['jira'].get('reporting') or {}) \
+            .get('filters') or {}
+        predicates = [(name, self._compile_filter(filtering))
+                      for name, filtering in filters.items()]
+        score = self._compile_score()
+        names = list(dict.fromkeys(list(extra_fields) +
+                                   self.report_fields()))
+
+        listed = [(name, []) for name, _ in predicates]
+        rest = []
+        for issue in issues:
+            values = self._field_values(issue, names)
+            matched = False
+            for (_, predicate), (_, found) in zip(predicates, listed):
+                if predicate(values):
+                    found.append((issue, values))
+                    matched = True
+            if not matched:
+                rest.append((-score(values), len(rest), issue, values))
+
+        rest.sort(key=lambda entry: entry[:2])
+        return listed, [(issue, values) for _, _, issue, values in rest]
+
+    def _filter_fields(self, filtering) -> list:
+        names = []
+        for clause in [filtering] + list(filtering.get('or', [])):
+            names.extend(clause.get('match', {}).keys())
+        return names
+
+    def report_fields(self) -> list:
+        """Names of the fields the report filters and ordering look at."""
+        reporting = self.config['jira'].get('reporting') or {}
+        names = []
+
+        for filtering in (reporting.get('filters') or {}).values():
+            names.extend(self._filter_fields(filtering))
+
+        names.extend((reporting.get('ordering') or {}).keys())
+        return list(dict.fromkeys(names))
 
     def report_filters(self):
         if self.jira is None:
@@ -1257,7 +2378,7 @@ class JiraConnector(object):
 
                 start_at += max_results
 
-        except JIRAError:
+        except jira.exceptions.JIRAError:
             # not all boards support sprints, so ignore it
             sprints = []
 
@@ -1304,7 +2425,17 @@ class JiraConnector(object):
         cfg = self.jira.find(f"../../agile/1.0/board/{board.raw['id']}/configuration")
         return cfg
 
-    def fetch_issues_by_board(self, board, issue_offset, max_issues) -> list:
+    def _board_filter_jql(self, board) -> str:
+        if self.offline:
+            return self._mirrored_board(board)['jql']
+
+        r = self._fetch_board_config_object(board)
+        self._ratelimit()
+        f = self.jira.filter(r.filter)
+        return f.jql
+
+    def board_issues_query(self, board) -> str:
+        """Returns the query for the open issues on a board."""
         if self.jira is None:
             raise RuntimeError("Need to log-in first.")
 
@@ -1313,11 +2444,8 @@ class JiraConnector(object):
         # board ID, so we need to actually pull the board configuration,
         # without a proper pythonic API and decode it manually to get the
         # correct JQL.
-        r = self._fetch_board_config_object(board)
-        self._ratelimit()
-        f = self.jira.filter(r.filter)
         # let's check if the query includes closed issues:
-        query = f.jql
+        query = self._board_filter_jql(board)
 
         if 'status' not in query:
             oldquery = query
@@ -1328,14 +2456,24 @@ class JiraConnector(object):
                 ns = utils.ireplace("order", ") order", oldquery)
                 query += "(" + ns
 
-        issues_in_epics = self._query_issues(query, issue_offset, max_issues)
+        return query
+
+    def fetch_issues_by_board(self, board, issue_offset, max_issues,
+                              fields=None):
+        if self.jira is None:
+            raise RuntimeError("Need to log-in first.")
 
-        return issues_in_epics
+        return self._query_issues_iter(self.board_issues_query(board),
+                                       issue_offset, max_issues, fields)
 
     def fetch_column_config_by_board(self, board) -> dict:
         if self.jira is None:
             raise RuntimeError("Need to log-in first.")
-        r = self._fetch_board_config_object(board)
+        if self.offline:
+            r = jira.resources.dict2resource(
+                self._mirrored_board(board)['config'])
+        else:
+            r = self._fetch_board_config_object(board)
 
         cols = r.columnConfig.columns
 
@@ -1349,11 +2487,8 @@ class JiraConnector(object):
     def fetch_jql_config_by_board(self, board):
         if self.jira is None:
             raise RuntimeError("Need to log-in first.")
-        r = self._fetch_board_config_object(board)
-        self._ratelimit()
-        f = self.jira.filter(r.filter)
 
-        return f.jql
+        return self._board_filter_jql(board)
 
     def fetch_quickfilters_by_board(self, board):
         if self.jira is None:
@@ -1440,7 +2575,7 @@ class JiraConnector(object):
 
         try:
             result = self.jira.create_issue(issue_dict)
-        except JIRAError as e:
+        except jira.exceptions.JIRAError as e:
             error_str = str(e)
             if "cannot be set" not in error_str:
                 raise
@@ -1458,16 +2593,13 @@ class JiraConnector(object):
             if not deferred:
                 raise
             result = self.jira.create_issue(reduced)
-            casecmp = bool(self.get_default_str('case_sensitive', "true"))
-            custom_fields = self._fetch_custom_fields()
+            casecmp = self._case_sensitive()
+            index = self._field_index()
             for fname, fval in deferred.items():
                 try:
                     resolved = self._try_fieldname(fname)
                     if resolved == fname and not casecmp:
-                        for k, display in custom_fields.items():
-                            if display.lower() == fname.lower():
-                                resolved = k
-                                break
+                        resolved = index.custom_id(fname, False) or fname
                     result.update(fields={resolved: fval})
                 except Exception:
                     pass  # best-effort; field may truly be unavailable
@@ -1475,6 +2607,105 @@ class JiraConnector(object):
         self.last_issue = result
         return result
 
+    def _bulk_issue_fields(self, issue_dict) -> dict:
+        """Put project / issue type in the form the bulk endpoint expects.
+
+        create_issue() lets the jira client look these up (one request
+        each, per issue); the REST api accepts them by key and name.
+        """
+        fields = dict(issue_dict)
+        project = fields.get('project')
+        if isinstance(project, (str, int)):
+            project = str(project)
+            fields['project'] = {"id": project} if project.isdigit() \
+                else {"key": project}
+        issuetype = fields.get('issuetype')
+        if isinstance(issuetype, int):
+            fields['issuetype'] = {"id": str(issuetype)}
+        elif isinstance(issuetype, str):
+            fields['issuetype'] = {"name": issuetype}
+        return fields
+
+    def _create_issue_chunk(self, issue_dicts) -> list:
+        """POST one chunk to issue/bulk.
+
+        Returns a list with the created issue for each entry, None for
+        entries the server rejected, or an exception for entries that may
+        or may not have been created.
+        """
+        body = {"issueUpdates": [{"fields": self._bulk_issue_fields(d)}
+                                 for d in issue_dicts]}
+        self._ratelimit()
+        try:
+            r = self.jira._session.post(self.jira._get_url("issue/bulk"),
+                                        data=json.dumps(body))
+            data = jira.utils.json_loads(r)
+        except jira.exceptions.JIRAError as e:
+            # Every entry failed (or the endpoint isn't there at all).
+            try:
+                data = e.response.json()
+            except Exception:
+                data = {}
+            data['issues'] = []
+
+        if not data.get('issues'):
+            # Nothing was created, so every entry can be retried.
+            return [None] * len(issue_dicts)
+
+        failed = {err.get('failedElementNumber')
+                  for err in data.get('errors', [])}
+        created = iter(data['issues'])
+        results = []
+        for i in range(len(issue_dicts)):
+            if i in failed:
+                results.append(None)
+                continue
+            raw = next(created, None)
+            if raw is None:
+                # The results don't line up with the request; this one
+                # may still have been created, so it mustn't be retried.
+                results.append(RuntimeError(
+                    "Couldn't tell whether the issue was created."))
+                continue
+            results.append(jira.resources.Issue(self.jira._options,
+                                                self.jira._session, raw=raw))
+        return results
+
+    def create_issues(self, issue_dicts) -> list:
+        """Create many issues, using the bulk create endpoint.
+
+        Issues are submitted in chunks of up to 50.  Any the server rejects
+        (for example, fields that aren't on the create screen) are retried
+        one by one with create_issue() on a pool of workers, which knows how
+        to defer such fields.  Entries that can't be matched up with the
+        server's reply aren't retried, as they may already exist.  Returns
+        a list with the created issue, or the exception raised while
+        creating it, for each entry.
+        """
+        if self.jira is None:
+            raise RuntimeError("Need to log-in first.")
+
+        chunks = [issue_dicts[i:i + BULK_CREATE_LIMIT]
+                  for i in range(0, len(issue_dicts), BULK_CREATE_LIMIT)]
+
+        def create_one(issue_dict):
+            try:
+                return self.create_issue(issue_dict)
+            except Exception as e:
+                return e
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._workers()) as pool:
+            results = [r for chunk in pool.map(self._create_issue_chunk,
+                                               chunks)
+                       for r in chunk]
+            retry = [i for i, r in enumerate(results) if r is None]
+            for i, r in zip(retry, pool.map(create_one,
+                                            [issue_dicts[i] for i in retry])):
+                results[i] = r
+
+        return results
+
     def create_sprint(self, board, name, start_date=None, end_date=None, goal=None):
         if self.jira is None:
             raise RuntimeError("Need to log-in first.")
@@ -1486,14 +2717,15 @@ class JiraConnector(object):
         return sprint
 
     def _find_users_by_key(self, key):
-        user = User(self.jira._options, self.jira._session, _query_param='key')
+        user = jira.resources.User(self.jira._options, self.jira._session,
+                                   _query_param='key')
         self._ratelimit()
         user.find(key)
         return [user]
 
     def _find_users_by_account_id(self, account_id):
-        user = User(self.jira._options, self.jira._session,
-                    _query_param='accountId')
+        user = jira.resources.User(self.jira._options, self.jira._session,
+                                   _query_param='accountId')
         self._ratelimit()
         user.find(account_id)
         return [user]
@@ -1525,6 +2757,46 @@ class JiraConnector(object):
     def find_users_by_name(self, named):
         return self._find_users(named)
 
+    def user_display_names(self, user_ids) -> dict:
+        """Maps each of *user_ids* to its display name (or None).
+
+        On cloud, the ids are looked up in bulk, USER_BULK_LIMIT at a time;
+        ids the bulk lookup misses (and every id on server) go through
+        find_users_by_name().  Names are kept on the connector, so each id
+        is only looked up once.
+        """
+        if self.jira is None:
+            raise RuntimeError("Need to log-in first.")
+
+        if getattr(self, '_user_names', None) is None:
+            self._user_names = {}
+        names = self._user_names
+        wanted = [u for u in dict.fromkeys(user_ids) if u not in names]
+
+        if wanted and self._is_cloud():
+            for start in range(0, len(wanted), USER_BULK_LIMIT):
+                chunk = wanted[start:start + USER_BULK_LIMIT]
+                self._ratelimit()
+                try:
+                    page = self.jira._get_json(
+                        "user/bulk", params={"accountId": chunk,
+                                             "maxResults": len(chunk)})
+                except jira.exceptions.JIRAError:
+                    continue
+                for user in page.get("values", []):
+                    names[user.get("accountId")] = user.get("displayName")
+
+        for user_id in wanted:
+            if user_id in names:
+                continue
+            try:
+                users = self.find_users_by_name(user_id)
+            except Exception:
+                users = []
+            names[user_id] = users[0].displayName if len(users) else None
+
+        return {user_id: names[user_id] for user_id in user_ids}
+
     def find_users_by_username(self, named):
         return self._find_users(named)
 
@@ -1563,17 +2835,24 @@ class JiraConnector(object):
         self._ratelimit()
         self.jira.add_attachment(issue.id, attachment_file, name)
 
-    def add_issue_link(self, issue, target, title=None, link_type=None, isinward=False):
+    def add_issue_link(self, issue, target, title=None, link_type=None,
+                       isinward=False, verify_target=True, link_types=None):
+        """Link *issue* to another issue, or to a url.
+
+        Callers that already know the target exists (say, because they just
+        created it) can skip the lookup with *verify_target*, and may pass
+        in the *link_types* to check against.
+        """
         if self.jira is None:
             raise RuntimeError("Need to log-in first.")
 
         if not target.startswith("http://") and not target.startswith("https://"):
-            tgtcheck = self.get_issue(target)
-            self._ratelimit()
-            link_types = self.jira.issue_link_types()
-            if tgtcheck is None:
+            if verify_target and \
+               self.get_issues([target], "minimal")[target] is None:
                 raise ValueError(
                     f"Target {target} looks like an issue, but no issue matches.")
+            if link_types is None:
+                link_types = self._get_link_types()
             if not link_type or not any(t.name == link_type for t in link_types):
                 raise ValueError(
                     f"Invalid link type.  Please specify one of {','.join([t.name for t in link_types])}.")
@@ -1584,8 +2863,8 @@ class JiraConnector(object):
             if title:
                 comment = {"body": title}
 
-            self._ratelimit()
-            self.jira.create_issue_link(link_type, inwardissue, outwardissue, comment)
+            self._create_issue_link(link_type, inwardissue, outwardissue,
+                                    comment)
         else:
             if not title:
                 title = target
@@ -1593,6 +2872,47 @@ class JiraConnector(object):
             self._ratelimit()
             self.jira.add_simple_link(issue, link)
 
+    def _create_issue_link(self, link_type, inwardissue, outwardissue,
+                           comment=None):
+        # The jira client's create_issue_link() downloads every link type on
+        # each call to fix up the name; ours is already checked.
+        data = {"type": {"name": link_type},
+                "inwardIssue": {"key": str(inwardissue)},
+                "outwardIssue": {"key": str(outwardissue)}}
+        if comment:
+            data["comment"] = comment
+        self._ratelimit()
+        return self.jira._session.post(self.jira._get_url("issueLink"),
+                                       data=json.dumps(data))
+
+    def add_issue_links(self, links, known=()) -> list:
+        """Create many issue links on a pool of workers.
+
+        *links* is a list of (issue, target, link_type, isinward) tuples.
+        Link types are looked up once for the whole batch, and targets in
+        *known* are taken to exist without fetching them.  Returns None, or
+        the exception raised while linking, for each entry.
+        """
+        if self.jira is None:
+            raise RuntimeError("Need to log-in first.")
+
+        link_types = self._get_link_types()
+        known = set(known)
+
+        def link_one(link):
+            issue, target, link_type, isinward = link
+            try:
+                self.add_issue_link(issue, target, None, link_type, isinward,
+                                    verify_target=target not in known,
+                                    link_types=link_types)
+            except Exception as e:
+                return e
+            return None
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._workers()) as pool:
+            return list(pool.map(link_one, links))
+
     def _get_cloud_id(self):
         """Return the Atlassian tenant cloudId via the well-known tenant_info endpoint."""
         try:
@@ -1900,7 +3220,7 @@ class JiraConnector(object):
             raise RuntimeError("Need to log-in first.")
 
         if isinstance(issue, str):
-            issue = self.get_issue(issue)
+            issue = self.get_issue(issue, "minimal")
 
         if not issue:
             raise RuntimeError("Invalid issue")
@@ -1979,3 +3299,79 @@ class JiraConnector(object):
         )
         text = utils.md_to_jira(text)
         return text
+
+
+class AsyncJiraConnector(object):
+    """Awaitable versions of the JiraConnector calls that fan out well.
+
+    Each call runs the blocking JiraConnector method on a pool of
+    'workers' threads, so at most that many requests are in flight, and
+    everything else (the login, field and metadata caches, the connection
+    pool and the rate limiter) is shared with the wrapped connector.
+    Commands can then asyncio.gather() hundreds of independent requests
+    and keep the server busy up to its allowed rate.
+    """
+
+    def __init__(self, jobj=None, workers=None):
+        self.sync = jobj if jobj is not None else JiraConnector()
+        self.workers = workers or self.sync._workers()
+        self._pool = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    async def call(self, func, *args, **kwargs):
+        """Run any blocking *func* on the worker pool."""
+        if self._pool is None:
+            self._pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.workers)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool, functools.partial(func, *args, **kwargs))
+
+    async def gather(self, calls, return_exceptions=False) -> list:
+        """Await all of *calls*, returning their results in order."""
+        return await asyncio.gather(*calls,
+                                    return_exceptions=return_exceptions)
+
+    async def query_issues(self, query='', startAt=0, maxResults=100) -> list:
+        return await self.call(self.sync._query_issues, query, startAt,
+                               maxResults)
+
+    async def get_issue(self, issue_identifier, profile="full", fields=None):
+        return await self.call(self.sync.get_issue, issue_identifier,
+                               profile, fields)
+
+    async def create_issue(self, issue_dict):
+        return await self.call(self.sync.create_issue, issue_dict)
+
+    async def set_field(self, issue, fieldname, val, forced=False):
+        return await self.call(self.sync.set_field, issue, fieldname, val,
+                               forced)
+
+    async def get_states_for_issue(self, issue_identifier) -> list:
+        return await self.call(self.sync.get_states_for_issue,
+                               issue_identifier)
+
+    async def set_state_for_issue(self, issue, status, resolution=None):
+        return await self.call(self.sync.set_state_for_issue, issue, status,
+                               resolution)
+
+    async def add_comment(self, issue_identifier, comment_body, visibility):
+        return await self.call(self.sync.add_comment, issue_identifier,
+                               comment_body, visibility)
+
+    async def add_issue_link(self, issue, target, title=None, link_type=None,
+                             isinward=False, verify_target=True,
+                             link_types=None):
+        return await self.call(self.sync.add_issue_link, issue, target,
+                               title, link_type, isinward, verify_target,
+                               link_types)
@@ -0,0 +1,264 @@
+import click
+import io
+import json
+import os
+import socket
+import sys
+import traceback
+
+from jcli import client
+from jcli import connector
+from jcli import utils
+
+
+class _FrameWriter(io.RawIOBase):
+    """Sends everything written to it to the client, on one channel."""
+
+    def __init__(self, sock, channel):
+        self.sock = sock
+        self.channel = channel
+        self.used = False
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        if data:
+            self.used = True
+            self.sock.sendall(client.FRAME.pack(self.channel, len(data)) +
+                              data)
+        return len(data)
+
+
+def _text_stream(sock, channel):
+    return io.TextIOWrapper(_FrameWriter(sock, channel), encoding="utf-8",
+                            errors="replace", write_through=True)
+
+
+class _WarmConnectors(object):
+    """Stands in for connector.JiraConnector inside the daemon.
+
+    Commands get the same logged-in connector (and so its field, status
+    and user caches) every time, until the config file changes.
+    Connectors only ever used to edit the config are never kept.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._warm = {}
+
+    def __call__(self, config_file=None, load_safe=False):
+        if load_safe:
+            return self.factory(config_file, load_safe)
+
+        path = config_file or \
+            os.path.join(os.path.expanduser("~"), ".jira.yml")
+        try:
+            stamp = os.stat(path).st_mtime_ns
+        except OSError:
+            stamp = None
+        stamp = (stamp, bool(os.environ.get("JCLI_NO_CACHE")))
+
+        kept = self._warm.get(path)
+        # An offline connector has swapped its caches for the mirror's.
+        if kept is None or kept[0] != stamp or kept[1].offline:
+            kept = (stamp, self.factory(config_file))
+            self._warm[path] = kept
+        return kept[1]
+
+    def warm_up(self):
+        """Log in and fetch what most commands need."""
+        jobj = self()
+        jobj.login()
+        jobj._jira_fields()
+        jobj._get_statuses()
+        jobj.myself()
+
+
+def _run(conn, cli, request):
+    """Run one command, streaming its output back over *conn*."""
+    if "-" in request.get("argv", []):
+        # Reads the client's stdin, which the daemon doesn't have.
+        conn.sendall(client.FRAME.pack(client.RUN_LOCALLY, 0))
+        return
+
+    out = _text_stream(conn, client.STDOUT)
+    err = _text_stream(conn, client.STDERR)
+    saved = (sys.stdin, sys.stdout, sys.stderr, dict(os.environ),
+             os.getcwd())
+    status = 0
+    try:
+        os.environ.update(request.get("env", {}))
+        os.chdir(request.get("cwd", "/"))
+        sys.stdin, sys.stdout, sys.stderr = io.StringIO(), out, err
+        try:
+            cli.main(args=request.get("argv", []), prog_name="jcli")
+        except SystemExit as e:
+            status = e.code
+        except utils.NeedsTerminal:
+            if not (out.buffer.used or err.buffer.used):
+                conn.sendall(client.FRAME.pack(client.RUN_LOCALLY, 0))
+                return
+            err.write("Error: this command needs a terminal; run it again "
+                      "with JCLI_NO_DAEMON=1.\n")
+            status = 1
+        except Exception:
+            traceback.print_exc(file=err)
+            status = 1
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = saved[:3]
+        os.environ.clear()
+        os.environ.update(saved[3])
+        os.chdir(saved[4])
+
+    if status is None:
+        status = 0
+    elif not isinstance(status, int):
+        err.write(f"{status}\n")
+        status = 1
+    conn.sendall(client.FRAME.pack(client.EXIT, status & 0xff))
+
+
+def _handle(conn, cli) -> bool:
+    """Answer one client; returns False when asked to stop."""
+    with conn, conn.makefile("rb") as f:
+        try:
+            request = json.loads(f.readline() or b"{}")
+        except ValueError:
+            return True
+
+        if request.get("stop"):
+            conn.sendall(client.FRAME.pack(client.EXIT, 0))
+            return False
+        if "argv" not in request:
+            conn.sendall(client.FRAME.pack(client.EXIT, 0))
+            return True
+
+        try:
+            _run(conn, cli, request)
+        except OSError:
+            # The client went away; keep serving the others.
+            pass
+    return True
+
+
+def _send(request, path):
+    """Send a control *request* to the daemon; True if it answered."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        return len(sock.recv(client.FRAME.size)) == client.FRAME.size
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def _listen(path):
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    if os.path.exists(path):
+        if _send({}, path):
+            raise click.ClickException(f"Already running on {path}.")
+        os.unlink(path)
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        sock.bind(path)
+    finally:
+        os.umask(old_umask)
+    sock.listen(8)
+    return sock
+
+
+def serve(path, cli, idle_timeout=None):
+    """Answer commands for *cli* on *path* until stopped, or idle for too
+    long."""
+    sock = _listen(path)
+    warm = _WarmConnectors(connector.JiraConnector)
+    connector.JiraConnector = warm
+    utils.HAS_TERMINAL = False
+    try:
+        try:
+            warm.warm_up()
+        except Exception as e:
+            click.echo(f"Warning: couldn't log in yet: {e}", err=True)
+
+        sock.settimeout(idle_timeout or None)
+        while True:
+            try:
+                conn, _ = sock.accept()
+            except socket.timeout:
+                break
+            conn.settimeout(None)
+            if not _handle(conn, cli):
+                break
+    finally:
+        connector.JiraConnector = warm.factory
+        utils.HAS_TERMINAL = True
+        sock.close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+@click.command(
+    name='start'
+)
+@click.option('--detach', is_flag=True, default=False,
+              help="Run in the background.")
+@click.option('--idle-timeout', type=int, default=0,
+              help="Exit after this many seconds without a command "
+                   "(0 never exits).")
+def start_cmd(detach, idle_timeout):
+    """Keep a logged-in connection around to answer jcli commands.
+
+    While it runs, jcli hands each command to the daemon, which skips the
+    start up, log in and metadata downloads.  Commands that need to open
+    an editor, prompt for a password or read stdin are still run directly.
+    """
+    path = client.socket_path()
+    if _send({}, path):
+        raise click.ClickException(f"Already running on {path}.")
+
+    cli = click.get_current_context().find_root().command
+    if detach:
+        if os.fork():
+            click.echo(f"Listening on {path}.")
+            return
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+    else:
+        click.echo(f"Listening on {path}.")
+
+    serve(path, cli, idle_timeout)
+    if detach:
+        os._exit(0)
+
+
+@click.command(
+    name='stop'
+)
+def stop_cmd():
+    """Stop the running daemon."""
+    if _send({"stop": True}, client.socket_path()):
+        click.echo("Stopped.")
+    else:
+        click.echo("Not running.")
+
+
+@click.command(
+    name='status'
+)
+def status_cmd():
+    """Show whether the daemon is running."""
+    path = client.socket_path()
+    if _send({}, path):
+        click.echo(f"Running on {path}.")
+    else:
+        click.echo("Not running.")
@@ -1,5 +1,7 @@
 import click
+from jcli import completion
 from jcli import connector
+from jcli.utils import complete_from
 import json as JSON
 import pprint
 
@@ -60,7 +62,8 @@ def groups_info_cmd():
 @click.command(
     name="components"
 )
-@click.argument("project")
+@click.argument("project",
+                shell_complete=complete_from(completion.projects))
 def components_info_cmd(project):
     """Displays a list of components for the given PROJECT."""
     jobj = connector.JiraConnector()
@@ -79,11 +82,24 @@ def link_types_cmd():
     jobj = connector.JiraConnector()
     jobj.login()
 
-    click.echo(pprint.pformat(jobj.jira.issue_link_types()))
+    click.echo(pprint.pformat(jobj._get_link_types()))
+
+
+@click.command(
+    name="refresh-cache"
+)
+def refresh_cache_cmd():
+    """Re-downloads the cached fields, statuses, and projects."""
+    jobj = connector.JiraConnector()
+    jobj.login()
+
+    jobj.refresh_metadata_cache()
+    click.echo("Metadata cache refreshed.")
 
 
 @click.command(name="project-versions")
-@click.argument("project")
+@click.argument("project",
+                shell_complete=complete_from(completion.projects))
 def dump_project_versions_cmd(project):
     """Dumps the available versions for a project."""
     jobj = connector.JiraConnector()
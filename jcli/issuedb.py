@@ -0,0 +1,437 @@
+"""
+A local SQLite mirror of issues, so searches can be answered offline.
+"""
+import json
+import os
+import re
+import sqlite3
+import time
+import zoneinfo
+
+from jcli import cache
+from jcli import jql
+
+MIRROR_VERSION = 3
+
+# Scalar columns pulled out of each issue, so that simple searches can be
+# answered with SQL rather than by unpacking every issue.
+SCALAR_COLUMNS = ("id", "project", "project_name", "summary", "status",
+                  "status_category", "issuetype", "priority", "priority_rank",
+                  "assignee", "assignee_display", "reporter",
+                  "reporter_display", "resolution", "created", "updated",
+                  "duedate")
+
+# JQL field name -> the columns an '=' may match (case-insensitively).
+MATCH_COLUMNS = {
+    "key": ("key",),
+    "issuekey": ("key",),
+    "id": ("id",),
+    "project": ("project", "project_name"),
+    "summary": ("summary",),
+    "status": ("status",),
+    "statuscategory": ("status_category",),
+    "issuetype": ("issuetype",),
+    "type": ("issuetype",),
+    "priority": ("priority",),
+    "assignee": ("assignee", "assignee_display"),
+    "reporter": ("reporter", "reporter_display"),
+    "resolution": ("resolution",),
+}
+
+# JQL field name -> the column used for ORDER BY.
+ORDER_COLUMNS = {
+    "project": "project",
+    "status": "status",
+    "issuetype": "issuetype",
+    "type": "issuetype",
+    "priority": "priority_rank",
+    "assignee": "assignee_display",
+    "reporter": "reporter_display",
+    "resolution": "resolution",
+    "created": "created",
+    "createddate": "created",
+    "updated": "updated",
+    "updateddate": "updated",
+    "duedate": "duedate",
+    "due": "duedate",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, data TEXT);
+CREATE TABLE IF NOT EXISTS syncs (scope TEXT PRIMARY KEY, last_sync REAL);
+CREATE TABLE IF NOT EXISTS fields (id TEXT PRIMARY KEY, name TEXT,
+                                   custom INTEGER, raw TEXT);
+CREATE TABLE IF NOT EXISTS issues (key TEXT PRIMARY KEY, %s, raw TEXT);
+CREATE TABLE IF NOT EXISTS scope_issues (scope TEXT, key TEXT,
+                                         PRIMARY KEY (scope, key));
+CREATE INDEX IF NOT EXISTS issues_project ON issues (project);
+CREATE INDEX IF NOT EXISTS issues_updated ON issues (updated);
+""" % ", ".join(SCALAR_COLUMNS)
+
+# The text index, preferably FTS5.  Where SQLite is built without it, a
+# plain table is scanned instead.
+TEXT_COLUMNS = ("summary", "description", "comments")
+FTS_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS issue_text USING " \
+    "fts5(key UNINDEXED, %s, tokenize='porter unicode61')" % \
+    ", ".join(TEXT_COLUMNS)
+PLAIN_TEXT_SCHEMA = "CREATE TABLE IF NOT EXISTS issue_text " \
+    "(key TEXT PRIMARY KEY, %s)" % ", ".join(TEXT_COLUMNS)
+
+
+class MirrorError(Exception):
+    """The mirror can't answer the request."""
+
+
+def mirror_path(server, user, directory=None) -> str:
+    return os.path.join(directory or cache.cache_dir(),
+                        f"mirror-{cache.cache_key(server, user)}.db")
+
+
+def _name(value, *keys):
+    """Returns the first of *keys* set in a dict field value."""
+    if not isinstance(value, dict):
+        return value
+    for k in keys:
+        if value.get(k):
+            return value[k]
+    return None
+
+
+def issue_scalars(raw, priority_ranks=None) -> dict:
+    """Extracts the SCALAR_COLUMNS from a raw issue."""
+    fields = raw.get('fields') or {}
+    status = fields.get('status') or {}
+    priority = _name(fields.get('priority'), 'name')
+    return {
+        "id": raw.get('id'),
+        "project": _name(fields.get('project'), 'key'),
+        "project_name": _name(fields.get('project'), 'name'),
+        "summary": fields.get('summary'),
+        "status": _name(status, 'name'),
+        "status_category": _name(status.get('statusCategory'), 'key'),
+        "issuetype": _name(fields.get('issuetype'), 'name'),
+        "priority": priority,
+        "priority_rank": (priority_ranks or {}).get(priority),
+        "assignee": _name(fields.get('assignee'), 'name', 'accountId'),
+        "assignee_display": _name(fields.get('assignee'), 'displayName'),
+        "reporter": _name(fields.get('reporter'), 'name', 'accountId'),
+        "reporter_display": _name(fields.get('reporter'), 'displayName'),
+        "resolution": _name(fields.get('resolution'), 'name'),
+        "created": fields.get('created'),
+        "updated": fields.get('updated'),
+        "duedate": fields.get('duedate'),
+    }
+
+
+def _plain_text(value) -> str:
+    """Flattens a text field, including Atlassian document format."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return " ".join(_plain_text(v) for v in value)
+    if isinstance(value, dict):
+        return " ".join(filter(None, [_plain_text(value.get('text')),
+                                      _plain_text(value.get('content'))]))
+    return str(value)
+
+
+def issue_text(raw) -> dict:
+    """Extracts the TEXT_COLUMNS from a raw issue."""
+    fields = raw.get('fields') or {}
+    comments = (fields.get('comment') or {}).get('comments') or []
+    return {
+        "summary": _plain_text(fields.get('summary')),
+        "description": _plain_text(fields.get('description')),
+        "comments": "\n".join(_plain_text(c.get('body')) for c in comments),
+    }
+
+
+class IssueMirror(object):
+    """A SQLite database holding the issues synced from one server.
+
+    Like the MetadataCache, there is one database per (server, user) pair.
+    Each issue is stored as its raw json, along with the SCALAR_COLUMNS
+    used to answer searches.
+    """
+
+    def __init__(self, server, user, directory=None):
+        self.server = server
+        self.user = user
+        self.path = mirror_path(server, user, directory)
+        self._db = None
+        self._fts = False
+
+    def _conn(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+            self._db = sqlite3.connect(self.path)
+            os.chmod(self.path, 0o600)
+            self._db.executescript(SCHEMA)
+            if self.get_meta("version") not in (None, MIRROR_VERSION):
+                self._db.close()
+                self._db = None
+                os.unlink(self.path)
+                return self._conn()
+            self.put_meta("version", MIRROR_VERSION)
+            try:
+                self._db.execute(FTS_SCHEMA)
+                self._fts = True
+            except sqlite3.OperationalError:
+                self._db.execute(PLAIN_TEXT_SCHEMA)
+                self._fts = False
+        return self._db
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def get_meta(self, name):
+        row = self._conn().execute("SELECT data FROM meta WHERE name = ?",
+                                   (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_meta(self, name, data):
+        with self._conn() as db:
+            db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                       (name, json.dumps(data)))
+
+    def last_sync(self, scope):
+        row = self._conn().execute(
+            "SELECT last_sync FROM syncs WHERE scope = ?", (scope,)).fetchone()
+        return row[0] if row else None
+
+    def scopes(self) -> list:
+        """Returns the queries synced so far."""
+        return [r[0] for r in self._conn().execute(
+            "SELECT scope FROM syncs ORDER BY scope")]
+
+    def set_last_sync(self, scope, when=None):
+        with self._conn() as db:
+            db.execute("INSERT OR REPLACE INTO syncs VALUES (?, ?)",
+                       (scope, time.time() if when is None else when))
+
+    def put_fields(self, fields):
+        """Stores the server's field list (which maps custom field ids)."""
+        with self._conn() as db:
+            db.execute("DELETE FROM fields")
+            db.executemany("INSERT INTO fields VALUES (?, ?, ?, ?)",
+                           [(f['id'], f.get('name'),
+                             int(bool(f.get('custom'))), json.dumps(f))
+                            for f in fields])
+
+    def fields(self) -> list:
+        return [json.loads(r[0]) for r in
+                self._conn().execute("SELECT raw FROM fields")]
+
+    def custom_fields(self) -> dict:
+        return dict(self._conn().execute(
+            "SELECT id, name FROM fields WHERE custom = 1"))
+
+    def put_issues(self, raws, scope=None) -> int:
+        """Adds or replaces issues, returning how many were written.
+
+        Issues are recorded as found by the *scope* query, if given.
+        """
+        ranks = self.get_meta("priority_ranks") or {}
+        cols = ("key",) + SCALAR_COLUMNS + ("raw",)
+        sql = (f"INSERT OR REPLACE INTO issues ({', '.join(cols)}) "
+               f"VALUES ({', '.join('?' * len(cols))})")
+        text_sql = (f"INSERT INTO issue_text (key, {', '.join(TEXT_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * (len(TEXT_COLUMNS) + 1))})")
+        count = 0
+        with self._conn() as db:
+            for raw in raws:
+                scalars = issue_scalars(raw, ranks)
+                db.execute(sql, [raw['key']] +
+                           [scalars[c] for c in SCALAR_COLUMNS] +
+                           [json.dumps(raw)])
+                text = issue_text(raw)
+                db.execute("DELETE FROM issue_text WHERE key = ?",
+                           (raw['key'],))
+                db.execute(text_sql, [raw['key']] +
+                           [text[c] for c in TEXT_COLUMNS])
+                if scope is not None:
+                    db.execute("INSERT OR IGNORE INTO scope_issues "
+                               "VALUES (?, ?)", (scope, raw['key']))
+                count += 1
+        return count
+
+    def drop_missing(self, scope, keys) -> int:
+        """Forgets the issues *scope* found before, but not now (*keys*).
+
+        Those no other scope found are removed; returns how many.
+        """
+        keys = set(keys)
+        removed = 0
+        with self._conn() as db:
+            gone = [r[0] for r in db.execute(
+                "SELECT key FROM scope_issues WHERE scope = ?", (scope,))
+                if r[0] not in keys]
+            for key in gone:
+                db.execute("DELETE FROM scope_issues "
+                           "WHERE scope = ? AND key = ?", (scope, key))
+                if db.execute("SELECT 1 FROM scope_issues WHERE key = ?",
+                              (key,)).fetchone() is None:
+                    db.execute("DELETE FROM issues WHERE key = ?", (key,))
+                    db.execute("DELETE FROM issue_text WHERE key = ?",
+                               (key,))
+                    removed += 1
+        return removed
+
+    def issue_count(self) -> int:
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM issues").fetchone()[0]
+
+    def jql_context(self) -> jql.Context:
+        """The context for evaluating queries against mirrored issues."""
+        me = self.get_meta("myself") or {}
+        tz = None
+        try:
+            tz = zoneinfo.ZoneInfo(me['timeZone'])
+        except (KeyError, ValueError, zoneinfo.ZoneInfoNotFoundError):
+            pass
+        return jql.Context(me, self.fields(), tz,
+                           priority_ranks=self.get_meta("priority_ranks"))
+
+    def _where(self, node):
+        """Translates a parsed query into SQL, where that is possible.
+
+        Only clauses joined by AND, using =, !=, in, not in and is [not]
+        EMPTY on the fields in MATCH_COLUMNS, are translated.  Anything else
+        raises a MirrorError.
+        """
+        if node is None:
+            return "1", []
+        clauses = node.items if isinstance(node, jql.And) else [node]
+        sql = []
+        params = []
+        for clause in clauses:
+            if not isinstance(clause, jql.Clause) or \
+               clause.op not in ("=", "!=", "in", "not in", "is", "is not"):
+                raise MirrorError("Not a simple query.")
+            columns = MATCH_COLUMNS.get(clause.field.lower())
+            if columns is None:
+                raise MirrorError(f"No column for '{clause.field}'.")
+
+            if clause.value == jql.EMPTY:
+                test = " AND ".join(f"{c} IS NULL" for c in columns)
+                negate = clause.op in ("!=", "not in", "is not")
+                sql.append(f"NOT ({test})" if negate else f"({test})")
+                continue
+
+            values = []
+            for v in clause.value if isinstance(clause.value, list) \
+                    else [clause.value]:
+                if isinstance(v, jql.Function):
+                    if v.name != "currentuser":
+                        raise MirrorError(f"No SQL for {v.name}().")
+                    me = self.get_meta("myself") or {}
+                    v = me.get('name') or me.get('accountId')
+                    if v is None:
+                        raise MirrorError("The current user isn't known.")
+                elif v == jql.EMPTY:
+                    raise MirrorError("EMPTY in a list.")
+                values.append(v)
+
+            marks = ", ".join("?" * len(values))
+            test = " OR ".join(f"{c} COLLATE NOCASE IN ({marks})"
+                               for c in columns)
+            params.extend(values * len(columns))
+            if clause.op in ("=", "in"):
+                sql.append(f"({test})")
+            else:
+                # JQL's negative operators never match an empty field.
+                sql.append(f"({columns[0]} IS NOT NULL AND NOT ({test}))")
+        return " AND ".join(sql), params
+
+    def _order(self, order):
+        terms = []
+        params = []
+        for field, desc in order:
+            column = ORDER_COLUMNS.get(field.lower())
+            if column is None:
+                # Other fields (like Rank) are sorted by their raw value.
+                row = self._conn().execute(
+                    "SELECT id FROM fields WHERE id = ? OR name = ? "
+                    "COLLATE NOCASE", (field, field)).fetchone()
+                if row is None:
+                    raise MirrorError(f"Can't order by '{field}' offline.")
+                column = "json_extract(raw, ?)"
+                # Once for the IS NULL test, once for the sort itself.
+                params += [f'$.fields."{row[0]}"'] * 2
+            # Empty values last, as for the server.
+            terms.append(f"{column} IS NULL, "
+                         f"{column} {'DESC' if desc else 'ASC'}")
+        return ", ".join(terms + ["updated DESC"]), params
+
+    def _require(self):
+        if not self.exists():
+            raise MirrorError(
+                "No local mirror yet; run 'jcli mirror sync' first.")
+
+    def search(self, query, startAt=0, maxResults=None) -> list:
+        """Returns the raw issues matching the JQL *query*.
+
+        Simple queries (see _where) are answered with SQL.  Others are
+        evaluated issue by issue, which raises a jql.JQLError for anything
+        that can't be answered locally.
+        """
+        self._require()
+        parsed = jql.parse(query)
+        try:
+            where, params = self._where(parsed.where)
+            order_by, order_params = self._order(parsed.order)
+        except MirrorError:
+            rows = self._conn().execute(
+                "SELECT raw FROM issues ORDER BY updated DESC")
+            return jql.run(parsed, (json.loads(r[0]) for r in rows),
+                           self.jql_context(), startAt, maxResults)
+
+        sql = (f"SELECT raw FROM issues WHERE {where} "
+               f"ORDER BY {order_by} LIMIT ? OFFSET ?")
+        params += order_params + [maxResults or -1, startAt or 0]
+        return [json.loads(r[0]) for r in self._conn().execute(sql, params)]
+
+    def text_search(self, text, project=None, maxResults=None) -> list:
+        """Returns the raw issues whose text contains every word of *text*.
+
+        With FTS5, the best matches (weighting the summary above the
+        description, and that above comments) come first.  Otherwise, the
+        most recently updated do.
+        """
+        self._require()
+        words = re.findall(r"\w+", text)
+        if not words:
+            raise MirrorError("Nothing to search for.")
+
+        conn = self._conn()
+        params = []
+        if self._fts:
+            where = "issue_text MATCH ?"
+            params.append(" ".join(f'"{w}"' for w in words))
+            order = "bm25(issue_text, 0, 10.0, 3.0, 1.0)"
+        else:
+            tests = []
+            for w in words:
+                tests.append("(" + " OR ".join(f"issue_text.{c} LIKE ?"
+                                               for c in TEXT_COLUMNS) + ")")
+                params.extend([f"%{w}%"] * len(TEXT_COLUMNS))
+            where = " AND ".join(tests)
+            order = "i.updated DESC"
+
+        if project is not None:
+            where += " AND (i.project = ? COLLATE NOCASE OR " \
+                     "i.project_name = ? COLLATE NOCASE)"
+            params.extend([project, project])
+
+        sql = (f"SELECT i.raw FROM issue_text "
+               f"JOIN issues AS i ON i.key = issue_text.key WHERE {where} "
+               f"ORDER BY {order} LIMIT ?")
+        params.append(maxResults or -1)
+        return [json.loads(r[0]) for r in conn.execute(sql, params)]
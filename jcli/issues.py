@@ -1,5 +1,6 @@
 import click
 import csv
+import io
 import json as JSON
 import logging
 import os
@@ -10,7 +11,10 @@ import sys
 import yaml
 
 from click.core import ParameterSource
+from jcli import completion
 from jcli import connector
+from jcli import issuedb
+from jcli import jql
 from jcli.utils import display_via_pager
 from jcli.utils import fitted_blocks
 from jcli.utils import get_text_via_editor
@@ -21,11 +25,15 @@ from jcli.utils import str_containing
 from jcli.utils import str_contained
 from jcli.utils import trim_text
 from jcli.utils import RuntimeEvalChoice
+from jcli.utils import complete_from
 from tabulate import tabulate
 
-reporting_choices = ['table', 'csv', 'simple', 'json',
+reporting_choices = ['table', 'csv', 'simple', 'json', 'ndjson',
                      'report']
 
+# Raised when a search can't be answered from local data.
+OFFLINE_ERRORS = (issuedb.MirrorError, jql.JQLError)
+
 try:
     import jinja2
 
@@ -54,6 +62,54 @@ ISSUE_DETAILS_MAP = {
     "assignee": "raw['fields']['assignee']['displayName']",
 }
 
+# Templates may declare the fields they use with a comment such as:
+#   {# jcli-fields: summary, status, Story Points #}
+TEMPLATE_FIELDS_RE = re.compile(r"\{#\s*jcli-fields:(.*?)#\}", re.DOTALL)
+
+
+def details_map_fields(details_map) -> list:
+    """Returns the issue fields read by the paths in a details map."""
+    fields = []
+    for path in details_map.values():
+        fields.extend(re.findall(r"raw\['fields'\]\['([^']+)'\]", path))
+    return list(dict.fromkeys(fields))
+
+
+def template_fields(template_file):
+    """Returns the fields declared by a template, or None if it doesn't."""
+    try:
+        with open(template_file, "r") as f:
+            declared = TEMPLATE_FIELDS_RE.findall(f.read())
+    except OSError:
+        return None
+
+    if not declared:
+        return None
+    return [name.strip() for decl in declared for name in decl.split(",")
+            if name.strip()]
+
+
+def issue_output_fields(jobj, output, template_file=None, extra_fields=()):
+    """Works out the fields a search needs to fetch for an output format.
+
+    Returns None when every field is needed, which is the case for the
+    json output and for templates that don't declare their fields.
+    """
+    if output in ('json', 'ndjson'):
+        return None
+
+    if output == 'template':
+        names = template_fields(template_file)
+        if names is None:
+            return None
+    elif output == 'report':
+        names = ['summary'] + jobj.report_fields()
+    else:
+        names = details_map_fields(ISSUE_DETAILS_MAP)
+
+    names = names + list(extra_fields) + (jobj.requested_fields() or [])
+    return jobj.search_field_ids(names)
+
 
 @click.command(
     name='list'
@@ -61,6 +117,7 @@ ISSUE_DETAILS_MAP = {
 @click.option('--assignee', type=str, default="",
               help="The name of the assignee (defaults to current user)")
 @click.option('--project', type=str, default=None,
+              shell_complete=complete_from(completion.projects),
               help="The name of the project (defaults to '')")
 @click.option('--jql', type=str, default=None,
               help="A raw JQL string to execute against the issues search")
@@ -88,6 +145,8 @@ ISSUE_DETAILS_MAP = {
               help="Sets the offset for pulling issues")
 @click.option('--max-issues', type=int, default=100,
               help="Sets the max number of issues to pull")
+@click.option('--all', 'all_', is_flag=True, default=False,
+              help="Pull every matching issue, ignoring --max-issues")
 @click.option('--sort',
               type=click.Choice(["prio-asc", "prio-desc",
                                  "type-asc", "type-desc",
@@ -102,11 +161,17 @@ ISSUE_DETAILS_MAP = {
               type=click.Path(),
               default=os.path.join(os.path.expanduser("~"), "template.jcli"),
               help="Use the jinja2 engine to write out the list of issues.")
+@click.option('--fields', 'extra_fields', type=str, default=None,
+              help="Comma separated list of extra fields to show as columns")
+@click.option('--offline', is_flag=True, default=False,
+              help="Search the local mirror (see 'jcli mirror sync') "
+                   "instead of the server.")
 def list_cmd(assignee, project, jql, closed, len_, output, matching_eq,
              matching_neq, matching_contains, matching_not,
              matching_in, matching_gt, matching_lt, matching_ge, matching_le,
              mentions, updated_since,
-             issue_offset, max_issues, sort, template_file) -> None:
+             issue_offset, max_issues, all_, sort, template_file,
+             extra_fields, offline) -> None:
     """Runs a query against the JIRA server, and displays a list of issues.
     """
     jobj = connector.JiraConnector()
@@ -114,7 +179,7 @@ def list_cmd(assignee, project, jql, closed, len_, output, matching_eq,
     if output == 'template' and not os.path.isfile(template_file):
         raise click.UsageError(f"Invalid template file {template_file}.")
 
-    jobj.login()
+    login(jobj, offline)
 
     if jql is not None:
         issues_query = jql
@@ -145,33 +210,112 @@ def list_cmd(assignee, project, jql, closed, len_, output, matching_eq,
         issues_query = jobj.build_issues_query(assignee, project, closed,
                                                fields_dict=qd)
 
-    issues = jobj._query_issues(issues_query, issue_offset, max_issues)
-    final = format_issue_output(jobj, issues, output, len_, sort, template_file)
-    click.echo(final)
+    if all_:
+        max_issues = None
+
+    extra_fields = [f.strip() for f in (extra_fields or "").split(",")
+                    if f.strip()]
+    fields = issue_output_fields(jobj, output, template_file, extra_fields)
+    issues = jobj._query_issues_iter(issues_query, issue_offset, max_issues,
+                                     fields)
+    echo_issue_output(jobj, issues, output, len_, sort, template_file,
+                      extra_fields)
+
+
+@click.command(
+    name='search'
+)
+@click.argument('text')
+@click.option('--project', type=str, default=None,
+              shell_complete=complete_from(completion.projects),
+              help="Only search issues in this project")
+@click.option('--sync', is_flag=True, default=False,
+              help="Bring the mirror up to date before searching")
+@click.option("--summary-len", 'len_', type=int, default=45,
+              help="Trim the summary length to certain number of chars "
+                   "(45 default, 0 for no trim)")
+@click.option('--output', type=click.Choice(reporting_choices),
+              default='table',
+              help="Output format (default is 'table')")
+@click.option('--max-issues', type=int, default=100,
+              help="Sets the max number of issues to show")
+@click.option('--all', 'all_', is_flag=True, default=False,
+              help="Show every matching issue, ignoring --max-issues")
+@click.option('--template-file',
+              type=click.Path(),
+              default=os.path.join(os.path.expanduser("~"), "template.jcli"),
+              help="Use the jinja2 engine to write out the list of issues.")
+def search_cmd(text, project, sync, len_, output, max_issues, all_,
+               template_file):
+    """Searches the summary, description and comments of mirrored issues.
+
+    Issues are searched in the local mirror (see 'jcli mirror sync'), so
+    only synced projects are covered.  Every word of TEXT must appear, and
+    issues matching in their summary are listed first.
+    """
+    jobj = connector.JiraConnector()
+
+    if output == 'template' and not os.path.isfile(template_file):
+        raise click.UsageError(f"Invalid template file {template_file}.")
+
+    if sync:
+        jobj.login()
+        scopes = [f'project = "{project}"'] if project else \
+            jobj._mirror().scopes()
+        for scope in scopes:
+            jobj.sync_mirror(scope)
+    else:
+        login(jobj, offline=True)
+
+    if all_:
+        max_issues = None
 
+    issues = jobj.search_text(text, project, max_issues)
+    echo_issue_output(jobj, issues, output, len_,
+                      template_file=template_file)
 
-def format_issue_output(jobj, issues, output, len_, sort=None, template_file=None):
+
+def format_issue_output(jobj, issues, output, len_, sort=None,
+                        template_file=None, extra_fields=()):
     """Format a list of issues for display.
 
     Args:
         jobj: JiraConnector instance (logged in)
-        issues: list of JIRA issue objects
-        output: output format string (table, simple, csv, json, report, template)
+        issues: iterable of JIRA issue objects
+        output: output format string (table, simple, csv, json, ndjson,
+            report, template)
         len_: summary trim length (0 for no trim)
         sort: sort string (unused here, kept for interface consistency)
         template_file: path to jinja2 template file
+        extra_fields: additional field names to add as columns
 
     Returns:
         str: formatted output
     """
+    return "".join(format_issue_chunks(jobj, issues, output, len_, sort,
+                                       template_file, extra_fields))
+
+
+def format_issue_chunks(jobj, issues, output, len_, sort=None,
+                        template_file=None, extra_fields=()):
+    """Like format_issue_output, but yields the output in pieces.
+
+    The csv, json and ndjson formats are written as the issues arrive, and
+    don't keep them, so a large search can be printed while later pages
+    are still being fetched, in memory bounded by the page size.  The
+    other formats need every issue (for column widths, sorting, etc.)
+    before anything can be written.
+    """
     ISSUE_HEADER = []
-    final = ""
 
-    if len(issues) != 0 and output in ("table", "simple", "csv"):
+    if output in ("table", "simple", "csv"):
         issue_list = []
         summary_pos = None
+        row = io.StringIO()
+        writer = csv.writer(row, lineterminator="\n")
+        wrote_header = False
 
-        for header in ISSUE_DETAILS_MAP:
+        for header in list(ISSUE_DETAILS_MAP) + list(extra_fields):
             if header not in ISSUE_HEADER:
                 ISSUE_HEADER.append(header)
 
@@ -180,54 +324,109 @@ def format_issue_output(jobj, issues, output, len_, sort=None, template_file=Non
 
         for issue in issues:
             issue_details = issue_eval(issue, ISSUE_DETAILS_MAP)
+            for field in ISSUE_HEADER[len(ISSUE_DETAILS_MAP):]:
+                issue_details.append(jobj.get_field(issue, field))
             if summary_pos is not None:
                 issue_details[summary_pos] = trim_text(
                     issue_details[summary_pos], len_
                 )
-            issue_list.append(issue_details)
+            if output == 'csv':
+                if not wrote_header:
+                    writer.writerow(ISSUE_HEADER)
+                    wrote_header = True
+                writer.writerow(issue_details)
+                yield row.getvalue()
+                row.seek(0)
+                row.truncate()
+            else:
+                issue_list.append(issue_details)
 
-        if output == 'table':
-            final = tabulate(issue_list, ISSUE_HEADER, 'psql')
-        elif output == 'simple':
-            final = tabulate(issue_list, ISSUE_HEADER, 'simple')
-        elif output == 'csv':
-            final = ",".join(ISSUE_HEADER) + "\n"
-            for line in issue_list:
-                final += ",".join(line) + "\n"
+        if output == 'table' and issue_list:
+            yield tabulate(issue_list, ISSUE_HEADER, 'psql')
+        elif output == 'simple' and issue_list:
+            yield tabulate(issue_list, ISSUE_HEADER, 'simple')
 
     elif output == "json":
-        final = f'{{"issues_count":{len(issues)},\n'
-        final += f'"issues":[{",".join([JSON.dumps(issue.raw) for issue in issues])}],\n'
-        final += f'"field_maps":{JSON.dumps(jobj._fetch_custom_fields())}\n'
-        final += "}"
+        count = 0
+        yield '{"issues":['
+        for issue in issues:
+            yield ("," if count else "") + JSON.dumps(issue.raw)
+            count += 1
+        yield f'],\n"issues_count":{count},\n'
+        yield f'"field_maps":{JSON.dumps(jobj._fetch_custom_fields())}\n'
+        yield "}"
+
+    elif output == "ndjson":
+        for issue in issues:
+            yield JSON.dumps(issue.raw) + "\n"
 
     elif output == 'report':
-        report_lists = jobj.report_filters()
+        listed, rest = jobj.report_classify(issues, ['summary'])
 
-        final = ""
+        for li, listed_issues in listed:
+            final = f"{li} issues:\n====================\n"
+            for issue, values in listed_issues:
+                final += f" * {issue.key:<15} " \
+                    f"{trim_text(values['summary'], len_)}\n"
+            yield final + "\n"
 
-        sorted_issues = jobj.report_sort_issue_list(issues)
+        final = "Non-filtered Issues:\n====================\n"
+        for issue, values in rest:
+            final += f" * {issue.key:<15} " \
+                f"{trim_text(values['summary'], len_)}\n"
+        yield final
 
-        for li in report_lists:
-            remove_ids = []
-            listed_issues = jobj.report_filter_issues(li, issues)
-            final += f"{li} issues:\n====================\n"
-            for issue in listed_issues:
-                final += f" * {issue.key:<15} {trim_text(jobj.get_field(issue, 'summary'), len_)}\n"
-                remove_ids.append(issue.key)
+    elif output == 'template':
+        yield template_output(template_file, list(issues), jobj)
 
-            sorted_issues = [filt_issue for filt_issue in sorted_issues
-                             if filt_issue.key not in remove_ids]
-            final += "\n"
 
-        final += "Non-filtered Issues:\n====================\n"
-        for issue in sorted_issues:
-            final += f" * {issue.key:<15} {trim_text(jobj.get_field(issue, 'summary'), len_)}\n"
+def echo_issue_output(jobj, issues, output, len_, sort=None,
+                      template_file=None, extra_fields=()):
+    """Writes formatted issues out as they become available."""
+    try:
+        for chunk in format_issue_chunks(jobj, issues, output, len_, sort,
+                                         template_file, extra_fields):
+            click.echo(chunk, nl=False)
+    except OFFLINE_ERRORS as e:
+        raise click.ClickException(str(e))
+    if output != 'ndjson':
+        click.echo()
 
-    elif output == 'template':
-        final = template_output(template_file, issues, jobj)
 
-    return final
+def login(jobj, offline=False):
+    """Logs in, or sets up to read from the local mirror."""
+    try:
+        jobj.login(offline=offline)
+    except OFFLINE_ERRORS as e:
+        raise click.ClickException(str(e))
+
+
+def linked_issue_details(jobj, issue) -> dict:
+    """Maps the key of each issue linked from *issue* to (status, summary).
+
+    The server usually includes these with the links; any that are missing
+    are fetched together, with a single search.
+    """
+    details = {}
+    missing = []
+    for link in issue.raw['fields'].get('issuelinks') or []:
+        for direction in ('outwardIssue', 'inwardIssue'):
+            other = link.get(direction)
+            if not other:
+                continue
+            fields = other.get('fields') or {}
+            if 'summary' in fields and 'status' in fields:
+                details[other['key']] = (fields['status']['name'],
+                                         fields['summary'])
+            else:
+                missing.append(other['key'])
+
+    if missing:
+        for key, found in jobj.get_issues(missing, "minimal").items():
+            if found is not None:
+                details[key] = (found.raw['fields']['status']['name'],
+                                found.raw['fields']['summary'])
+    return details
 
 
 @click.command(
@@ -265,6 +464,7 @@ def show_cmd(issuekey, raw, width, json):
         return
 
     if raw is True:
+        jobj.load_issue_details(issue)
         if not json:
             click.echo(pprint.pprint(vars(issue)))
             click.echo(jobj._fetch_custom_fields())
@@ -348,15 +548,13 @@ def show_cmd(issuekey, raw, width, json):
 
         if 'votes' in issue.raw['fields']['eausm']:
             total = 0
-            if not len(issue.raw['fields']['eausm']['votes']):
+            votes = issue.raw['fields']['eausm']['votes']
+            if not len(votes):
                 output += f"| No Votes{' ' * (max_width - 12)} |\n"
-            for vote in issue.raw['fields']['eausm']['votes']:
+            voters = jobj.user_display_names([v['userId'] for v in votes])
+            for vote in votes:
                 total += int(vote['vote'])
-                user = jobj.find_users_by_name(vote['userId'])
-                if len(user):
-                    user = user[0].displayName
-                else:
-                    user = f"[{vote['userId']}]?"
+                user = voters.get(vote['userId']) or f"[{vote['userId']}]?"
                 output += f"| Vote: {vote['vote']} by {user} {' ' * (max_width - (15 + len(user) + len(str(vote['vote']))))} |\n"
             output += "|" + '-' * (max_width - 2) + "|\n"
             output += f"| Total: {str(total)} {' ' * (max_width - (len(str(total)) + 12))} |\n"
@@ -369,23 +567,30 @@ def show_cmd(issuekey, raw, width, json):
        len(issue.fields.issuelinks) > 0:
         output += f"| Links: {' ' * (max_width - 11)} |\n"
         output += f"|{'-' * (max_width - 2)}|\n"
+        linked = linked_issue_details(jobj, issue)
         for link in issue.fields.issuelinks:
             link_text = ""
+            other = None
             if hasattr(link, "outwardIssue"):
-                link_text = f"| - Linked To Issue: {link.outwardIssue}"
+                other = link.outwardIssue.key
+                link_text = f"| - Linked To Issue: {other}"
             if hasattr(link, "inwardIssue"):
-                link_text = f"| - Linked From Issue: {link.inwardIssue}"
+                other = link.inwardIssue.key
+                link_text = f"| - Linked From Issue: {other}"
             if hasattr(link, "type") and hasattr(link.type, "name"):
                 link_text += f", Relationship: {link.type.name}"
+            if other in linked:
+                status, summary = linked[other]
+                link_text += f", {status}: "
+                link_text += trim_text(summary, max(max_width -
+                                                    (len(link_text) + 2), 10))
             if len(link_text):
                 output += link_text + ' ' * (max_width - (len(link_text) + 1))
                 output += "|\n"
 
+        # The list already holds each link; no need to fetch them again.
         jobj._ratelimit()
-        remote_links = jobj.jira.remote_links(issue.key)
-        for link_id in remote_links:
-            jobj._ratelimit()
-            link = jobj.jira.remote_link(issuekey, link_id)
+        for link in jobj.jira.remote_links(issue.key):
             if hasattr(link, "object"):
                 url = ""
                 title = ""
@@ -537,7 +742,7 @@ def del_comment_cmd(issuekey, comment_id):
     jobj = connector.JiraConnector()
     jobj.login()
 
-    issue = jobj.get_issue(issuekey)
+    issue = jobj.get_issue(issuekey, "minimal")
     if issue is None:
         click.echo(f"Issue {issuekey} not found.")
         return
@@ -566,7 +771,7 @@ def update_comment_cmd(issuekey, comment_id, body, visibility):
     jobj = connector.JiraConnector()
     jobj.login()
 
-    issue = jobj.get_issue(issuekey)
+    issue = jobj.get_issue(issuekey, "minimal")
     if issue is None:
         click.echo(f"Issue {issuekey} not found.")
         return
@@ -618,7 +823,8 @@ def states_cmd(issuekey):
     name="set-status"
 )
 @click.argument("issuekey")
-@click.argument("status")
+@click.argument("status",
+                shell_complete=complete_from(completion.statuses))
 @click.option("--resolution", type=str, default=None,
               help="Set the resolution when transitioning "
               "(e.g. 'Done', 'Won\\'t Fix').")
@@ -650,7 +856,7 @@ def set_type_cmd(issuekey, new_type):
     jobj = connector.JiraConnector()
     jobj.login()
 
-    issue = jobj.get_issue(issuekey)
+    issue = jobj.get_issue(issuekey, "minimal")
     if issue is None:
         click.echo(f"Error: {issuekey} not found.")
         sys.exit(1)
@@ -674,7 +880,7 @@ def set_parent_cmd(issuekey, parent):
     jobj = connector.JiraConnector()
     jobj.login()
 
-    issue = jobj.get_issue(issuekey)
+    issue = jobj.get_issue(issuekey, fields="parent")
     if issue is None:
         click.echo(f"Error: {issuekey} not found.")
         sys.exit(1)
@@ -791,6 +997,10 @@ def set_field_from_csv_cmd(csvfile):
       issue1,field,value[,field2,value2,...]
       issue2,field,value
 
+    All the fields for an issue are set in one update, even when the issue
+    is on several rows, and fields that already hold the value are skipped.
+    Up to jira.default.workers issues are updated at once.
+
     Currently, there isn't a specifier for 'forcing' a field type.
     """
     jobj = connector.JiraConnector()
@@ -800,30 +1010,50 @@ def set_field_from_csv_cmd(csvfile):
         reader = csv.reader(file)
         # we assume no header is set, if one is set we can ignore it with:
         # next(reader, None)
+        rows = list(reader)
+
+    # Collect every field/value pair for an issue, so that each issue is
+    # updated only once, however many rows name it.
+    pairs = {}
+    for row in rows:
+        if len(row) < 3:
+            click.echo(f"Skipping invalid row: {row}")
+            continue
 
-        for row in reader:
-            if len(row) < 3:
-                click.echo(f"Skipping invalid row: {row}")
-                continue
-
-            issuekey = row[0]
-            fvp = row[1:]
-
-            issue = jobj.get_issue(issuekey)
+        # iterate through fieldname, fieldvalue pairs in the remaining
+        # elements of the row
+        fvp = row[1:]
+        pairs.setdefault(row[0], []).extend(
+            (fvp[i], fvp[i + 1]) for i in range(0, len(fvp) - 1, 2))
 
-            if issue is None:
-                click.echo(f"Error: {issuekey} not found - skipping row.")
-                continue
+    # Fetch every issue up front, in as few requests as possible.
+    issues = jobj.get_issues(list(pairs))
 
-            # iterate through fieldname, fieldvalue pairs in the remaining elements of the row
-            for i in range(0, len(fvp), 2):
-                fieldname = fvp[i]
-                fieldvalue = fvp[i + 1]
+    updates = []
+    for issuekey in pairs:
+        if issues.get(issuekey) is None:
+            click.echo(f"Error: {issuekey} not found - skipping row.")
+            continue
+        updates.append((issuekey, pairs[issuekey]))
+
+    results = jobj.update_issues([(issues[k], p) for k, p in updates]) \
+        if updates else []
+
+    changed = unchanged = failed = 0
+    for (issuekey, _), result in zip(updates, results):
+        if isinstance(result, Exception):
+            failed += 1
+            click.echo(f"Error: updating {issuekey} failed: {result}")
+        elif not result:
+            unchanged += 1
+        else:
+            changed += 1
+            for fieldname, old, new in result:
+                click.echo(f"Updated {issuekey}, set {fieldname}: "
+                           f"{old} -> {new}")
 
-                old = jobj.get_field(issue, fieldname)
-                jobj.set_field(issue, fieldname, fieldvalue)
-                new = jobj.get_field(issue, fieldname)
-                click.echo(f"Updated {issuekey}, set {fieldname}: {old} -> {new}")
+    click.echo(f"{changed} issue(s) updated, {unchanged} unchanged, "
+               f"{failed} failed, {len(pairs) - len(updates)} not found.")
 
 
 def issue_extract_blocks(issue_block):
@@ -919,6 +1149,7 @@ def issue_extract_blocks(issue_block):
 @click.option("--description", type=str, default=None,
               help="Description of the issue.  Default is to use the text editor interpretation.")
 @click.option("--project", type=str, default=None,
+              shell_complete=complete_from(completion.projects),
               help="The project to open.  Default is to use the text editor interpretation.")
 @click.option("--issue-type",
               type=click.Choice(["Epic", "Bug", "Story", "Task", "Subtask"],
@@ -1162,7 +1393,7 @@ def eausm_vote_cmd(issuekey, vote):
     """Set a vote for an issue using the Easy Agile planning poker plugin."""
     jobj = connector.JiraConnector()
     jobj.login()
-    issue = jobj.get_issue(issuekey)
+    issue = jobj.get_issue(issuekey, "minimal")
     if issue is None:
         raise click.UsageError("Issue not found")
 
@@ -1171,17 +1402,6 @@ def eausm_vote_cmd(issuekey, vote):
     click.echo("Voted.")
 
 
-def get_link_type_choices():
-    jobj = connector.JiraConnector()
-    try:
-        jobj.login()
-    except:
-        return []
-
-    jobj._ratelimit()
-    return [x.name for x in jobj.jira.issue_link_types()]
-
-
 @click.command(
     name="add-link"
 )
@@ -1194,7 +1414,7 @@ def get_link_type_choices():
               default='outward',
               help="Add a link to the issue.")
 @click.option("--link-type",
-              type=RuntimeEvalChoice(get_link_type_choices,
+              type=RuntimeEvalChoice(completion.link_types,
                                      case_sensitive=False),
               help="Set a relationship.")
 def add_link_cmd(issuekey, url, title, relationship_type, link_type):
@@ -1298,6 +1518,41 @@ def _bulk_topo_sort(issues, issue_ref_fields=None):
     return result
 
 
+def _bulk_topo_levels(issues, issue_ref_fields=None):
+    """Group issues into dependency levels.
+
+    Every issue's local-alias dependencies are in an earlier level, so the
+    issues within one level can all be created at the same time.  Levels
+    keep the order of *issues*.  Raises click.UsageError on cycles.
+    """
+    issue_ref_fields = issue_ref_fields or set()
+    local_ids = {issue['id'] for issue in issues if 'id' in issue}
+
+    deps = []
+    for issue in issues:
+        d_set = {link.get('target', '') for link in issue.get('links', [])}
+        d_set.update(str(fval)
+                     for fname, fval in issue.get('fields', {}).items()
+                     if fname in issue_ref_fields)
+        deps.append(d_set & local_ids)
+
+    level_of = {}
+    levels = []
+    remaining = list(range(len(issues)))
+    while remaining:
+        ready = [i for i in remaining if all(d in level_of for d in deps[i])]
+        if not ready:
+            raise click.UsageError(
+                "Cycle detected in bulk-import issue dependencies.")
+        levels.append([issues[i] for i in ready])
+        for i in ready:
+            if 'id' in issues[i]:
+                level_of[issues[i]['id']] = len(levels) - 1
+        remaining = [i for i in remaining if i not in set(ready)]
+
+    return levels
+
+
 def _bulk_validate(issues, jobj, default_project, default_issue_type,
                    ref_fields=None):
     """Query the Jira server to validate an import plan without creating anything.
@@ -1311,8 +1566,7 @@ def _bulk_validate(issues, jobj, default_project, default_issue_type,
 
     # Cache link types from the server once
     try:
-        jobj._ratelimit()
-        valid_link_types = {lt.name for lt in jobj.jira.issue_link_types()}
+        valid_link_types = {lt.name for lt in jobj._get_link_types()}
     except Exception as exc:
         errors.append(f"Could not fetch link types from server: {exc}")
         valid_link_types = set()
@@ -1320,6 +1574,24 @@ def _bulk_validate(issues, jobj, default_project, default_issue_type,
     # Local aliases defined in this batch — these don't need server validation
     local_ids = {issue['id'] for issue in issues if 'id' in issue}
 
+    # Everything else referenced should already exist; look it all up at once
+    server_keys = set()
+    for entry in issues:
+        for link in entry.get('links', []):
+            if link.get('target') and link['target'] not in local_ids:
+                server_keys.add(link['target'])
+        for fname, fval in entry.get('fields', {}).items():
+            if fname in ref_fields and str(fval) not in local_ids:
+                server_keys.add(str(fval))
+
+    fetch_error = None
+    found = {}
+    if server_keys:
+        try:
+            found = jobj.get_issues(sorted(server_keys), "minimal")
+        except Exception as exc:
+            fetch_error = exc
+
     for i, entry in enumerate(issues):
         label = entry.get('id') or f"issue[{i}]"
         project = entry.get('project', default_project)
@@ -1341,13 +1613,14 @@ def _bulk_validate(issues, jobj, default_project, default_issue_type,
                     f"Valid types: {', '.join(sorted(valid_link_types))}")
             if target and target not in local_ids:
                 # Looks like a real Jira key — confirm it exists
-                try:
-                    if jobj.get_issue(target) is None:
-                        errors.append(
-                            f"{label}: link target '{target}' not found on server.")
-                except Exception as exc:
+                if fetch_error is not None:
+                    errors.append(
+                        f"{label}: link target '{target}' could not be "
+                        f"fetched — {fetch_error}")
+                elif found.get(target) is None:
                     errors.append(
-                        f"{label}: link target '{target}' could not be fetched — {exc}")
+                        f"{label}: link target '{target}' not found on "
+                        f"server.")
 
         # Validate existing-key values in issue_ref_fields
         for fname, fval in entry.get('fields', {}).items():
@@ -1357,15 +1630,14 @@ def _bulk_validate(issues, jobj, default_project, default_issue_type,
             if fval in local_ids:
                 continue  # will be created as part of this batch
             # Otherwise it should already exist on the server
-            try:
-                if jobj.get_issue(fval) is None:
-                    errors.append(
-                        f"{label}: field '{fname}' references '{fval}' "
-                        f"which was not found on server.")
-            except Exception as exc:
+            if fetch_error is not None:
+                errors.append(
+                    f"{label}: field '{fname}' references '{fval}' "
+                    f"which could not be fetched — {fetch_error}")
+            elif found.get(fval) is None:
                 errors.append(
                     f"{label}: field '{fname}' references '{fval}' "
-                    f"which could not be fetched — {exc}")
+                    f"which was not found on server.")
 
     return errors
 
@@ -1404,6 +1676,7 @@ def _bulk_build_issue_dict(entry, jobj, default_project, default_issue_type,
 @click.pass_context
 @click.argument('importfile', type=click.Path(exists=True))
 @click.option('--project', type=str, default=None,
+              shell_complete=complete_from(completion.projects),
               help="Default project for issues that don't specify one.")
 @click.option('--issue-type',
               type=click.Choice(["Epic", "Bug", "Story", "Task", "Subtask"],
@@ -1520,6 +1793,11 @@ def bulk_import_cmd(ctx, importfile, project, issue_type, issue_ref_fields,
     fields are resolved after the target issue has been created.  The
     importer performs a topological sort so that dependencies are created
     first.  A cycle in local-alias dependencies is an error.
+
+    \b
+    Issues that don't depend on each other are created together, up to 50
+    per request.  If any issue can't be created, the import stops before
+    creating anything that could depend on it.
     """
     if 'jobj' not in ctx.obj:
         jobj = connector.JiraConnector()
@@ -1571,36 +1849,58 @@ def bulk_import_cmd(ctx, importfile, project, issue_type, issue_ref_fields,
 
     pending_links = []  # (real_key, link_entry) to process after all creates
 
-    for entry in ordered:
-        alias = entry.get('id')
-        dry_ct += 1
-        issue_dict = _bulk_build_issue_dict(entry, jobj, default_project,
-                                            default_issue_type,
-                                            alias_map=alias_map,
-                                            issue_ref_fields=ref_fields)
-
-        if dry_run or verbose:
-            click.echo(f"Issue{' [DRY-RUN]' if dry_run else ''}: {pprint.pformat(issue_dict)}")
-            if entry.get('links'):
-                click.echo(f"  Links: {entry['links']}")
+    # Each level only depends on earlier ones, so its issues are created
+    # together, and aliases are resolved once the level is done.
+    for level in _bulk_topo_levels(ordered, issue_ref_fields=ref_fields):
+        issue_dicts = []
+        for entry in level:
+            issue_dict = _bulk_build_issue_dict(entry, jobj, default_project,
+                                                default_issue_type,
+                                                alias_map=alias_map,
+                                                issue_ref_fields=ref_fields)
+            issue_dicts.append(issue_dict)
+
+            if dry_run or verbose:
+                click.echo(f"Issue{' [DRY-RUN]' if dry_run else ''}: "
+                           f"{pprint.pformat(issue_dict)}")
+                if entry.get('links'):
+                    click.echo(f"  Links: {entry['links']}")
 
         if dry_run:
-            real_key = f"DRY-{dry_ct}"
+            results = []
+            for _ in level:
+                dry_ct += 1
+                results.append(f"DRY-{dry_ct}")
         else:
-            result = jobj.create_issue(issue_dict)
+            results = jobj.create_issues(issue_dicts)
+
+        failed = 0
+        for entry, result in zip(level, results):
+            alias = entry.get('id')
+            if isinstance(result, Exception):
+                failed += 1
+                click.echo(f"  ERROR creating "
+                           f"{alias or entry.get('summary', '')}: {result}")
+                continue
+
             real_key = str(result)
+            click.echo(f"  Created: {real_key}" +
+                       (f" (alias: {alias})" if alias else ""))
 
-        click.echo(f"  Created: {real_key}" + (f" (alias: {alias})" if alias
-                                               else ""))
+            if alias:
+                alias_map[alias] = real_key
 
-        if alias:
-            alias_map[alias] = real_key
+            for link_entry in entry.get('links', []):
+                pending_links.append((real_key, link_entry))
 
-        for link_entry in entry.get('links', []):
-            pending_links.append((real_key, link_entry))
+        if failed:
+            # Later levels may depend on the failed issues.
+            click.echo(f"Stopping: {failed} issue(s) could not be created.")
+            sys.exit(1)
 
     # Now resolve and create all links
     click.echo(f"\nProcessing {len(pending_links)} link(s)...")
+    links = []
     for src_key, link_entry in pending_links:
         raw_target = link_entry.get('target', '')
         resolved_target = alias_map.get(raw_target, raw_target)
@@ -1617,10 +1917,18 @@ def bulk_import_cmd(ctx, importfile, project, issue_type, issue_ref_fields,
             click.echo(f"  [DRY-RUN] link {src_key} --[{ltype}/{direction}]--> {resolved_target}")
             continue
 
-        try:
-            jobj.add_issue_link(src_key, resolved_target, None, ltype, isinward)
-            click.echo(f"  Linked {src_key} --[{ltype}/{direction}]--> {resolved_target}")
-        except Exception as exc:
-            click.echo(f"  ERROR linking {src_key} -> {resolved_target}: {exc}")
+        links.append((src_key, resolved_target, ltype, isinward))
+
+    # Issues created in this run are known to exist, so the links don't
+    # need to look them up again.
+    results = jobj.add_issue_links(links, known=alias_map.values()) \
+        if links else []
+    for (src_key, target, ltype, isinward), result in zip(links, results):
+        direction = 'inward' if isinward else 'outward'
+        if isinstance(result, Exception):
+            click.echo(f"  ERROR linking {src_key} -> {target}: {result}")
+        else:
+            click.echo(f"  Linked {src_key} --[{ltype}/{direction}]--> "
+                       f"{target}")
 
     click.echo("Bulk import complete.")
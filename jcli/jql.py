@@ -0,0 +1,583 @@
+"""
+A JQL parser and evaluator, for running queries against stored issue json.
+
+Only the parts of JQL that jcli itself builds (and that make sense without
+the server's history) are supported: the =, !=, ~, !~, <, >, <=, >=, in,
+not in, is and is not operators, AND / OR / NOT with parentheses, ORDER BY,
+currentUser(), now(), the startOf / endOf date functions, and relative
+dates like -1d.  Anything else raises a JQLError rather than guessing.
+"""
+import collections
+import datetime
+import re
+
+Query = collections.namedtuple("Query", ["where", "order"])
+Clause = collections.namedtuple("Clause", ["field", "op", "value"])
+And = collections.namedtuple("And", ["items"])
+Or = collections.namedtuple("Or", ["items"])
+Not = collections.namedtuple("Not", ["item"])
+Function = collections.namedtuple("Function", ["name", "args"])
+
+
+class _Empty(object):
+    def __repr__(self):
+        return "EMPTY"
+
+
+EMPTY = _Empty()
+
+# JQL names for the system fields, and the key they have in the raw issue.
+SYSTEM_FIELDS = {
+    "project": "project",
+    "type": "issuetype",
+    "issuetype": "issuetype",
+    "status": "status",
+    "priority": "priority",
+    "assignee": "assignee",
+    "reporter": "reporter",
+    "creator": "creator",
+    "resolution": "resolution",
+    "summary": "summary",
+    "description": "description",
+    "environment": "environment",
+    "labels": "labels",
+    "component": "components",
+    "fixversion": "fixVersions",
+    "affectedversion": "versions",
+    "created": "created",
+    "createddate": "created",
+    "updated": "updated",
+    "updateddate": "updated",
+    "resolved": "resolutiondate",
+    "resolutiondate": "resolutiondate",
+    "due": "duedate",
+    "duedate": "duedate",
+    "parent": "parent",
+    "comment": "comment",
+}
+
+DATE_FIELDS = {"created", "updated", "resolutiondate", "duedate",
+               "lastViewed"}
+
+TEXT_FIELDS = {"summary", "description", "environment", "comment"}
+
+# Values are compared through these keys of a field's json, in order.
+VALUE_KEYS = ("name", "key", "value", "displayName", "accountId",
+              "emailAddress", "id")
+
+_TOKEN_RE = re.compile(r'''\s*(?:"((?:[^"\\]|\\.)*)"|'((?:[^'\\]|\\.)*)'|'''
+                       r'''(!=|!~|<=|>=|=|~|<|>|\(|\)|,)|'''
+                       r'''([^\s=!<>~(),"']+))''')
+
+_RELATIVE_RE = re.compile(r'^([-+]?)\s*((?:\d+\s*[wdhm]\s*)+)$')
+_SPRINT_NAME_RE = re.compile(r'name=([^,\]]*)')
+
+_UNITS = {"w": "weeks", "d": "days", "h": "hours", "m": "minutes"}
+
+
+class JQLError(Exception):
+    """The query can't be parsed, or can't be answered locally."""
+
+
+def _tokenize(jql) -> list:
+    tokens = []
+    pos = 0
+    jql = jql.strip()
+    while pos < len(jql):
+        m = _TOKEN_RE.match(jql, pos)
+        if not m or m.end() == pos:
+            raise JQLError(f"Can't parse JQL near: {jql[pos:]}")
+        pos = m.end()
+        dq, sq, punct, word = m.groups()
+        if dq is not None or sq is not None:
+            tokens.append(("str", re.sub(r'\\(.)', r'\1',
+                                         dq if dq is not None else sq)))
+        elif punct is not None:
+            tokens.append(("op", punct))
+        else:
+            tokens.append(("word", word))
+    return tokens
+
+
+class _Parser(object):
+    def __init__(self, jql):
+        self.jql = jql
+        self.tokens = _tokenize(jql)
+        self.pos = 0
+
+    def peek(self, n=0):
+        if self.pos + n < len(self.tokens):
+            return self.tokens[self.pos + n]
+        return None
+
+    def next(self):
+        tok = self.peek()
+        if tok is None:
+            raise JQLError(f"Unexpected end of query: {self.jql}")
+        self.pos += 1
+        return tok
+
+    def is_word(self, *words, n=0):
+        tok = self.peek(n)
+        return tok is not None and tok[0] == "word" and \
+            tok[1].lower() in words
+
+    def expect(self, tok):
+        if self.next() != tok:
+            raise JQLError(f"Expected '{tok[1]}' in: {self.jql}")
+
+    def query(self):
+        where = None
+        if self.peek() is not None and not self.is_word("order"):
+            where = self.expr()
+
+        order = []
+        if self.is_word("order"):
+            self.next()
+            if not self.is_word("by"):
+                raise JQLError(f"Expected ORDER BY in: {self.jql}")
+            self.next()
+            while True:
+                field = self.next()
+                if field[0] == "op":
+                    raise JQLError(f"Bad ORDER BY in: {self.jql}")
+                desc = False
+                if self.is_word("asc", "desc"):
+                    desc = self.next()[1].lower() == "desc"
+                order.append((field[1], desc))
+                if self.peek() != ("op", ","):
+                    break
+                self.next()
+
+        if self.peek() is not None:
+            raise JQLError(f"Unexpected '{self.peek()[1]}' in: {self.jql}")
+        return Query(where, order)
+
+    def expr(self):
+        items = [self.term()]
+        while self.is_word("or") or self.peek() == ("word", "||"):
+            self.next()
+            items.append(self.term())
+        return items[0] if len(items) == 1 else Or(items)
+
+    def term(self):
+        items = [self.factor()]
+        while self.is_word("and") or self.peek() == ("word", "&&"):
+            self.next()
+            items.append(self.factor())
+        return items[0] if len(items) == 1 else And(items)
+
+    def factor(self):
+        if self.is_word("not"):
+            self.next()
+            return Not(self.factor())
+        if self.peek() == ("op", "("):
+            self.next()
+            item = self.expr()
+            self.expect(("op", ")"))
+            return item
+        return self.clause()
+
+    def clause(self):
+        field = self.next()
+        if field[0] == "op":
+            raise JQLError(f"Expected a field name in: {self.jql}")
+
+        tok = self.peek()
+        if tok is not None and tok[0] == "op" and \
+           tok[1] in ("=", "!=", "~", "!~", "<", ">", "<=", ">="):
+            self.next()
+            return Clause(field[1], tok[1], self.value())
+        if self.is_word("is"):
+            self.next()
+            op = "is"
+            if self.is_word("not"):
+                self.next()
+                op = "is not"
+            if not self.is_word("empty", "null"):
+                raise JQLError(f"Only EMPTY can follow '{op}' in: {self.jql}")
+            self.next()
+            return Clause(field[1], op, EMPTY)
+        if self.is_word("in") or \
+           (self.is_word("not") and self.is_word("in", n=1)):
+            op = "in"
+            if self.is_word("not"):
+                self.next()
+                op = "not in"
+            self.next()
+            self.expect(("op", "("))
+            values = []
+            while self.peek() != ("op", ")"):
+                values.append(self.value())
+                if self.peek() == ("op", ","):
+                    self.next()
+                elif self.peek() != ("op", ")"):
+                    raise JQLError(f"Unterminated list in: {self.jql}")
+            self.next()
+            return Clause(field[1], op, values)
+        if self.is_word("was", "changed"):
+            raise JQLError(f"'{tok[1]}' needs the issue history, which "
+                           "isn't available offline.")
+        raise JQLError(f"Unsupported operator after '{field[1]}' in: "
+                       f"{self.jql}")
+
+    def value(self):
+        tok = self.next()
+        if tok[0] == "op":
+            raise JQLError(f"Expected a value in: {self.jql}")
+        if tok[0] == "word" and self.peek() == ("op", "("):
+            self.next()
+            args = []
+            while self.peek() != ("op", ")"):
+                arg = self.next()
+                if arg[0] == "op" and arg[1] != ",":
+                    raise JQLError(f"Bad arguments to {tok[1]}()")
+                if arg[1] != ",":
+                    args.append(arg[1])
+            self.next()
+            return Function(tok[1].lower(), args)
+        if tok[0] == "word" and tok[1].lower() in ("empty", "null"):
+            return EMPTY
+        return tok[1]
+
+
+def parse(jql) -> Query:
+    """Parses *jql* into a Query, raising JQLError if it can't."""
+    return _Parser(jql or "").query()
+
+
+def search_fields(query) -> list:
+    """Returns the issue fields a search must return to evaluate *query*.
+
+    System fields are given by their id; others by name, as written.
+    """
+    names = []
+    for name in referenced_fields(query):
+        lower = name.lower()
+        m = re.match(r'^cf\[(\d+)\]$', lower)
+        if lower in ("key", "issuekey", "id"):
+            continue
+        elif lower == "statuscategory":
+            names.append("status")
+        elif m:
+            names.append(f"customfield_{m.group(1)}")
+        else:
+            names.append(SYSTEM_FIELDS.get(lower, name))
+    return list(dict.fromkeys(names))
+
+
+def referenced_fields(query) -> list:
+    """Returns the field names a Query needs, in the order first used."""
+    names = []
+
+    def walk(node):
+        if isinstance(node, Clause):
+            names.append(node.field)
+        elif isinstance(node, (And, Or)):
+            for item in node.items:
+                walk(item)
+        elif isinstance(node, Not):
+            walk(node.item)
+
+    walk(query.where)
+    names.extend(field for field, _ in query.order)
+    return list(dict.fromkeys(names))
+
+
+class Context(object):
+    """What a query may refer to besides the issues themselves.
+
+    *user* is the json of the current user (as from /myself), *fields* the
+    server's field list, and *priority_ranks* maps priority names to a rank
+    (higher is more important).
+    """
+
+    def __init__(self, user=None, fields=(), tz=None, now=None,
+                 priority_ranks=None):
+        self.user = user or {}
+        self.tz = tz or datetime.datetime.now().astimezone().tzinfo
+        self.now = now or datetime.datetime.now(self.tz)
+        self.priority_ranks = priority_ranks or {}
+        self._field_ids = {}
+        self._field_types = {}
+        for f in fields:
+            self._field_ids.setdefault(f['id'].lower(), f['id'])
+            self._field_ids.setdefault(f.get('name', '').lower(), f['id'])
+            schema = f.get('schema') or {}
+            self._field_types[f['id']] = schema.get('type')
+
+    def field_id(self, name) -> str:
+        lower = name.lower()
+        if lower in ("key", "issuekey", "id", "statuscategory"):
+            return lower
+        if lower in SYSTEM_FIELDS:
+            return SYSTEM_FIELDS[lower]
+        m = re.match(r'^cf\[(\d+)\]$', lower)
+        if m:
+            return f"customfield_{m.group(1)}"
+        if lower in self._field_ids:
+            return self._field_ids[lower]
+        raise JQLError(f"Unknown field '{name}'.")
+
+    def field_type(self, fid):
+        if fid in DATE_FIELDS:
+            return "date"
+        return self._field_types.get(fid)
+
+    def user_values(self) -> set:
+        if not self.user:
+            raise JQLError("The current user isn't known here.")
+        return {str(self.user[k]).lower() for k in
+                ("name", "key", "accountId", "emailAddress")
+                if self.user.get(k)}
+
+
+def _candidates(value) -> list:
+    """The strings a field value may be matched by."""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [c for v in value for c in _candidates(v)]
+    if isinstance(value, dict):
+        return [str(value[k]) for k in VALUE_KEYS if value.get(k) is not None]
+    if isinstance(value, str) and \
+       value.startswith("com.atlassian.greenhopper"):
+        m = _SPRINT_NAME_RE.search(value)
+        if m:
+            return [m.group(1)]
+    return [str(value)]
+
+
+def _text(value) -> str:
+    """All the text in a field, for ~."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return "\n".join(_text(v) for v in value)
+    if isinstance(value, dict):
+        if 'comments' in value:
+            return _text([c.get('body') for c in value['comments']])
+        return "\n".join(filter(None, [_text(value.get('text')),
+                                       _text(value.get('content'))]))
+    return str(value)
+
+
+def _field_value(raw, fid, name):
+    if fid == "key":
+        return raw.get('key')
+    if fid == "id":
+        return raw.get('id')
+
+    fields = raw.get('fields') or {}
+    if fid == "statuscategory":
+        return ((fields.get('status') or {}).get('statusCategory') or {})
+
+    if fid not in fields:
+        raise JQLError(f"'{name}' wasn't stored with these issues.")
+    return fields[fid]
+
+
+def _parse_field_date(value, ctx):
+    if not value:
+        return None
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z"):
+        try:
+            return datetime.datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    try:
+        return datetime.datetime.strptime(value[:10], "%Y-%m-%d").replace(
+            tzinfo=ctx.tz)
+    except ValueError:
+        return None
+
+
+def _offset(text):
+    """Returns the timedelta for a relative date like '-1w 2d'."""
+    m = _RELATIVE_RE.match(text.strip())
+    if not m:
+        return None
+    delta = datetime.timedelta()
+    for count, unit in re.findall(r'(\d+)\s*([wdhm])', m.group(2)):
+        delta += datetime.timedelta(**{_UNITS[unit]: int(count)})
+    return -delta if m.group(1) == "-" else delta
+
+
+def _date_function(func, ctx):
+    now = ctx.now
+    if func.name == "now":
+        return now
+
+    m = re.match(r'^(start|end)of(day|week|month|year)$', func.name)
+    if not m:
+        raise JQLError(f"{func.name}() isn't supported offline.")
+    start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if m.group(2) == "week":
+        # Jira weeks start on Sunday.
+        start -= datetime.timedelta(days=(start.weekday() + 1) % 7)
+        end = start + datetime.timedelta(weeks=1)
+    elif m.group(2) == "month":
+        start = start.replace(day=1)
+        end = (start + datetime.timedelta(days=32)).replace(day=1)
+    elif m.group(2) == "year":
+        start = start.replace(month=1, day=1)
+        end = start.replace(year=start.year + 1)
+    else:
+        end = start + datetime.timedelta(days=1)
+    when = start if m.group(1) == "start" else \
+        end - datetime.timedelta(microseconds=1)
+
+    if func.args:
+        offset = _offset(func.args[0])
+        if offset is None:
+            raise JQLError(f"Bad offset '{func.args[0]}' for {func.name}().")
+        when += offset
+    return when
+
+
+def _query_date(value, ctx):
+    if isinstance(value, Function):
+        return _date_function(value, ctx)
+
+    offset = _offset(value)
+    if offset is not None:
+        return ctx.now + offset
+
+    for fmt in ("%Y-%m-%d %H:%M", "%Y/%m/%d %H:%M", "%Y-%m-%d", "%Y/%m/%d"):
+        try:
+            return datetime.datetime.strptime(value, fmt).replace(
+                tzinfo=ctx.tz)
+        except ValueError:
+            pass
+    raise JQLError(f"'{value}' isn't a date.")
+
+
+def _compare(op, left, right) -> bool:
+    if op == "<":
+        return left < right
+    if op == ">":
+        return left > right
+    if op == "<=":
+        return left <= right
+    if op == ">=":
+        return left >= right
+    return left == right
+
+
+def _values(value, ctx) -> set:
+    """The lower-cased strings a query value stands for."""
+    values = value if isinstance(value, list) else [value]
+    result = set()
+    for v in values:
+        if isinstance(v, Function):
+            if v.name != "currentuser":
+                raise JQLError(f"{v.name}() isn't supported offline.")
+            result |= ctx.user_values()
+        elif v != EMPTY:
+            result.add(v.lower())
+    return result
+
+
+def _match_clause(clause, raw, ctx) -> bool:
+    fid = ctx.field_id(clause.field)
+    value = _field_value(raw, fid, clause.field)
+    ftype = ctx.field_type(fid)
+    op = clause.op
+    if clause.value == EMPTY and op in ("=", "!="):
+        op = "is" if op == "=" else "is not"
+
+    if op in ("is", "is not"):
+        empty = value is None or value == "" or value == [] or value == {}
+        return empty if op == "is" else not empty
+
+    if op in ("~", "!~"):
+        if fid not in TEXT_FIELDS and ftype != "string":
+            raise JQLError(f"'{clause.field}' can't be searched with {op}.")
+        text = _text(value).lower()
+        if isinstance(clause.value, Function):
+            found = any(u in text for u in _values(clause.value, ctx))
+        else:
+            words = re.findall(r"\w+", clause.value.lower())
+            found = all(re.search(r'\b' + re.escape(w), text) for w in words)
+        return found if op == "~" else (bool(text) and not found)
+
+    if ftype in ("date", "datetime"):
+        left = _parse_field_date(value, ctx)
+        if op in ("in", "not in"):
+            raise JQLError(f"'{clause.field}' can't be used with {op}.")
+        if left is None:
+            return False
+        right = _query_date(clause.value, ctx)
+        if op == "!=":
+            return left != right
+        return _compare(op, left, right)
+
+    candidates = [c.lower() for c in _candidates(value)]
+    if op in ("<", ">", "<=", ">="):
+        try:
+            right = float(clause.value)
+            lefts = [float(c) for c in candidates]
+        except (TypeError, ValueError):
+            raise JQLError(f"'{clause.field}' can't be compared with {op}.")
+        return any(_compare(op, left, right) for left in lefts)
+
+    wanted = _values(clause.value, ctx)
+    found = any(c in wanted for c in candidates)
+    if op in ("=", "in"):
+        return found
+    # JQL's negative operators never match an empty field.
+    return bool(candidates) and not found
+
+
+def matches(node, raw, ctx) -> bool:
+    """Whether the raw issue satisfies a parsed query (or part of one)."""
+    if node is None:
+        return True
+    if isinstance(node, Query):
+        return matches(node.where, raw, ctx)
+    if isinstance(node, And):
+        return all(matches(item, raw, ctx) for item in node.items)
+    if isinstance(node, Or):
+        return any(matches(item, raw, ctx) for item in node.items)
+    if isinstance(node, Not):
+        return not matches(node.item, raw, ctx)
+    return _match_clause(node, raw, ctx)
+
+
+def _sort_value(raw, field, ctx):
+    fid = ctx.field_id(field)
+    value = _field_value(raw, fid, field)
+    if fid == "key" and value:
+        project, _, number = value.rpartition("-")
+        return (project, int(number) if number.isdigit() else 0)
+    if ctx.field_type(fid) in ("date", "datetime"):
+        when = _parse_field_date(value, ctx)
+        return when.timestamp() if when else None
+    if fid == "priority" and ctx.priority_ranks:
+        return ctx.priority_ranks.get((value or {}).get('name'))
+    if isinstance(value, (int, float)):
+        return value
+    candidates = _candidates(value)
+    return candidates[0].lower() if candidates else None
+
+
+def run(query, raws, ctx, startAt=0, maxResults=None) -> list:
+    """Returns the raw issues matching *query*, ordered and windowed.
+
+    Issues with an empty ORDER BY field always sort last.
+    """
+    if isinstance(query, str):
+        query = parse(query)
+
+    found = [raw for raw in raws if matches(query, raw, ctx)]
+    for field, desc in reversed(query.order):
+        keyed = [(_sort_value(raw, field, ctx), raw) for raw in found]
+        present = [k for k in keyed if k[0] is not None]
+        present.sort(key=lambda k: k[0], reverse=desc)
+        found = [raw for _, raw in present] + \
+            [raw for value, raw in keyed if value is None]
+
+    end = None if not maxResults else startAt + maxResults
+    return found[startAt:end]
@@ -0,0 +1,69 @@
+import click
+import datetime
+
+from jcli import completion
+from jcli import connector
+from jcli.utils import complete_from
+from tabulate import tabulate
+
+
+@click.command(
+    name='sync'
+)
+@click.option('--project', 'projects', multiple=True,
+              shell_complete=complete_from(completion.projects),
+              help="Mirror every issue in a project (may be repeated).")
+@click.option('--jql', 'queries', multiple=True,
+              help="Mirror the issues matching a query (may be repeated).")
+@click.option('--board', 'boards', multiple=True,
+              shell_complete=complete_from(completion.boards),
+              help="Mirror a board's configuration and open issues, for "
+                   "'boards show --offline' (may be repeated).")
+@click.option('--full', is_flag=True, default=False,
+              help="Fetch every matching issue, not just the updated ones.")
+def sync_cmd(projects, queries, boards, full):
+    """Copy issues into the local mirror, for use with --offline.
+
+    The first sync of a project or query fetches all of its issues; later
+    ones only fetch the issues updated since.  With no options, everything
+    synced before is brought up to date.
+
+    Issues that are deleted, or that stop matching a query, are only
+    removed from the mirror by a --full sync.
+    """
+    jobj = connector.JiraConnector()
+    jobj.login()
+
+    scopes = [f'project = "{p}"' for p in projects] + list(queries)
+    for board in boards:
+        scopes.append(jobj.mirror_board(board))
+
+    if not scopes:
+        scopes = jobj._mirror().scopes()
+        if not scopes:
+            raise click.UsageError(
+                "Nothing mirrored yet; give a --project, --jql or --board.")
+
+    for scope in scopes:
+        count = jobj.sync_mirror(scope, full)
+        click.echo(f"{scope}: {count} issue(s) updated.")
+
+
+@click.command(
+    name='status'
+)
+def status_cmd():
+    """Show what is in the local mirror."""
+    jobj = connector.JiraConnector()
+    mirror = jobj._mirror()
+    if not mirror.exists():
+        click.echo("No local mirror yet.")
+        return
+
+    rows = []
+    for scope in mirror.scopes():
+        last = datetime.datetime.fromtimestamp(mirror.last_sync(scope))
+        rows.append((scope, last.strftime("%Y-%m-%d %H:%M")))
+
+    click.echo(tabulate(rows, ("Query", "Last sync"), "psql"))
+    click.echo(f"{mirror.issue_count()} issue(s) in {mirror.path}")
@@ -11,11 +11,13 @@ LOG = logging.getLogger(__name__)
 )
 def login_cmd() -> None:
     """Tests that the login routine is working.
+
+    Always performs a full login, replacing any saved session.
     """
     jobj = connector.JiraConnector()
 
     try:
-        jobj.login()
+        jobj.login(refresh=True)
     except Exception as e:
         click.echo(f"Error: {e} when logging in")
 
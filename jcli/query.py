@@ -1,8 +1,14 @@
 import click
 import os
 
+from jcli import completion
 from jcli import connector
-from jcli.issues import format_issue_output, reporting_choices
+from jcli import jql as jqlparse
+from jcli.issues import echo_issue_output, issue_output_fields
+from jcli.issues import login
+from jcli.issues import OFFLINE_ERRORS
+from jcli.issues import reporting_choices
+from jcli.utils import complete_from
 from tabulate import tabulate
 
 
@@ -30,7 +36,8 @@ def list_all_cmd():
 @click.command(
     name='run'
 )
-@click.argument('name')
+@click.argument('name',
+                shell_complete=complete_from(completion.saved_queries))
 @click.option('--output', type=click.Choice(reporting_choices),
               default='table',
               help="Output format (default is 'table')")
@@ -48,15 +55,25 @@ def list_all_cmd():
               help="Sets the max number of issues to pull")
 @click.option('--issue-offset', type=int, default=0,
               help="Sets the offset for pulling issues")
+@click.option('--all', 'all_', is_flag=True, default=False,
+              help="Pull every matching issue, ignoring --max-issues")
 @click.option("--summary-len", 'len_', type=int, default=45,
               help="Trim the summary length to certain number of chars")
 @click.option('--template-file',
               type=click.Path(),
               default=os.path.join(os.path.expanduser("~"), "template.jcli"),
               help="Use the jinja2 engine to write out the list of issues.")
-def run_cmd(name, output, sort, max_issues, issue_offset, len_,
-            template_file):
-    """Execute a saved query by name."""
+@click.option('--offline', is_flag=True, default=False,
+              help="Run the query against the results stored by its last "
+                   "online run, or else the local mirror (see 'jcli mirror "
+                   "sync'), instead of the server.")
+def run_cmd(name, output, sort, max_issues, issue_offset, all_, len_,
+            template_file, offline):
+    """Execute a saved query by name.
+
+    The results of each online run are stored, so that the query can be
+    run again with --offline.
+    """
     jobj = connector.JiraConnector()
 
     saved = jobj._config_get_nested("jira.saved_queries")
@@ -70,12 +87,48 @@ def run_cmd(name, output, sort, max_issues, issue_offset, len_,
     if output == 'template' and not os.path.isfile(template_file):
         raise click.UsageError(f"Invalid template file {template_file}.")
 
-    jobj.login()
+    login(jobj, offline)
+
+    if all_:
+        max_issues = None
+
+    fields = issue_output_fields(jobj, output, template_file)
+
+    if offline:
+        try:
+            issues = jobj.query_snapshot_iter(name, jql, issue_offset,
+                                              max_issues)
+        except OFFLINE_ERRORS as e:
+            raise click.ClickException(str(e))
+        if issues is None:
+            issues = jobj._query_issues_iter(jql, issue_offset, max_issues,
+                                             fields)
+        echo_issue_output(jobj, issues, output, len_, sort, template_file)
+        return
+
+    # Make sure the snapshot holds what's needed to evaluate the query.
+    try:
+        parsed = jqlparse.parse(jql)
+    except jqlparse.JQLError:
+        parsed = None
+    if parsed is not None and fields is not None:
+        fields = jobj.search_field_ids(fields +
+                                       jqlparse.search_fields(parsed))
+
+    issues = jobj._query_issues_iter(jql, issue_offset, max_issues, fields)
+    if parsed is None:
+        echo_issue_output(jobj, issues, output, len_, sort, template_file)
+        return
+
+    def stored(issues, store):
+        for issue in issues:
+            store(issue.raw)
+            yield issue
 
-    issues = jobj._query_issues(jql, issue_offset, max_issues)
-    final = format_issue_output(jobj, issues, output, len_, sort,
-                                template_file)
-    click.echo(final)
+    with jobj.query_snapshot_writer(name, jql, issue_offset,
+                                    max_issues) as store:
+        echo_issue_output(jobj, stored(issues, store), output, len_, sort,
+                          template_file)
 
 
 @click.command(
@@ -87,6 +140,7 @@ def run_cmd(name, output, sort, max_issues, issue_offset, len_,
 @click.option('--assignee', type=str, default=None,
               help="The name of the assignee (use '' for current user)")
 @click.option('--project', type=str, default=None,
+              shell_complete=complete_from(completion.projects),
               help="The name of the project")
 @click.option("--closed", type=bool, default=False,
               help="Whether to include closed issues")
@@ -169,7 +223,8 @@ def build_cmd(name, desc, assignee, project, closed, jql, matching_eq,
 @click.command(
     name='remove'
 )
-@click.argument('name')
+@click.argument('name',
+                shell_complete=complete_from(completion.saved_queries))
 def remove_cmd(name):
     """Remove a saved query from the configuration."""
     jobj = connector.JiraConnector(load_safe=True)
@@ -0,0 +1,148 @@
+"""
+Client side rate limiting for calls to the JIRA server.
+"""
+import datetime
+import email.utils
+import threading
+import time
+
+MAX_BACKOFF = 60.0
+
+
+def _parse_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_when(value, now):
+    """Returns seconds until *value*, which is a delay or a timestamp."""
+    if value is None:
+        return None
+
+    delay = _parse_float(value)
+    if delay is not None:
+        return max(delay, 0.0)
+
+    try:
+        when = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=datetime.timezone.utc)
+    return max(when.timestamp() - now, 0.0)
+
+
+class TokenBucket(object):
+    """A thread safe token bucket.
+
+    Tokens refill at *rate* per second, up to *burst*.  A *rate* of 0 (or
+    None) disables limiting entirely.  The server may lower the effective
+    rate by advertising its own limits, and may pause all callers by
+    asking them to retry later.
+    """
+
+    def __init__(self, rate, burst=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.server_rate = None
+        self.server_burst = None
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._last = clock()
+        self._paused_until = 0.0
+        self._failures = 0
+
+    def _effective(self):
+        rates = [r for r in (self.rate, self.server_rate) if r]
+        bursts = [b for b in (self.burst, self.server_burst) if b]
+        return (min(rates) if rates else None), max(min(bursts), 1)
+
+    def _refill(self, now):
+        rate, burst = self._effective()
+        if rate:
+            self._tokens = min(burst,
+                               self._tokens + (now - self._last) * rate)
+        self._last = now
+
+    def acquire(self):
+        """Blocks until a call may be made."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                wait = self._paused_until - now
+                if wait <= 0:
+                    rate, _ = self._effective()
+                    if not rate or self._tokens >= 1:
+                        if rate:
+                            self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / rate
+            self._sleep(wait)
+
+    def pause(self, seconds):
+        """Hold all callers for at least *seconds*."""
+        with self._lock:
+            self._paused_until = max(self._paused_until,
+                                     self._clock() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+
+    def observe(self, status_code, headers):
+        """Adjust to the rate limit details sent back by the server."""
+        now = time.time()
+        limit = _parse_float(headers.get("X-RateLimit-Limit"))
+        remaining = _parse_float(headers.get("X-RateLimit-Remaining"))
+        fill_rate = _parse_float(headers.get("X-RateLimit-FillRate"))
+        interval = _parse_float(headers.get("X-RateLimit-Interval-Seconds"))
+        retry_after = _parse_when(headers.get("Retry-After"), now)
+        reset = _parse_when(headers.get("X-RateLimit-Reset"), now)
+
+        with self._lock:
+            if limit:
+                self.server_burst = limit
+            if fill_rate and interval:
+                self.server_rate = fill_rate / interval
+            if remaining is not None:
+                self._tokens = min(self._tokens, remaining)
+
+            if status_code not in (429, 503):
+                self._failures = 0
+                if remaining == 0 and reset:
+                    self._paused_until = max(self._paused_until,
+                                             self._clock() + reset)
+                return
+
+            self._failures += 1
+            delay = retry_after if retry_after is not None else reset
+            if delay is None:
+                delay = min(2 ** (self._failures - 1), MAX_BACKOFF)
+            self._paused_until = max(self._paused_until,
+                                     self._clock() + delay)
+            self._tokens = min(self._tokens, 0.0)
+
+    def response_hook(self, response, *args, **kwargs):
+        """A requests response hook feeding server limits to the bucket."""
+        self.observe(response.status_code, response.headers)
+        return response
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def bucket_for(server, rate, burst):
+    """Returns the bucket shared by all connections to *server*."""
+    with _buckets_lock:
+        bucket = _buckets.get(server)
+        if bucket is None:
+            bucket = TokenBucket(rate, burst)
+            _buckets[server] = bucket
+        return bucket
@@ -3,31 +3,57 @@ TODO.
 """
 
 import click
+import importlib
 import logging
+import os
 
-from jcli import boards as boards_cmds
-from jcli import config as config_cmds
-from jcli import details as details_cmds
-from jcli import issues as issues_cmds
-from jcli import myself as my_cmds
-from jcli import query as query_cmds
-from jcli import users as users_cmds
-from jcli import utils as utils_cmds
 
+class LazyGroup(click.Group):
+    """A group whose subcommands are only imported when they are used.
 
-@click.group()
+    *lazy_subcommands* maps each command name to the "module:attribute"
+    implementing it, so that running (or asking for help on) one command
+    doesn't import every other command, and the libraries they need.
+    """
+
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) |
+                      set(self.lazy_subcommands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and \
+           cmd_name in self.lazy_subcommands:
+            module, attr = self.lazy_subcommands[cmd_name].split(":")
+            command = getattr(importlib.import_module(module), attr)
+            self.add_command(command, cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group(cls=LazyGroup, lazy_subcommands={
+    "login": "jcli.myself:login_cmd",
+    "myself": "jcli.myself:myself_cmd",
+})
 @click.option('--debug', default=False, is_flag=True,
               help="Output more information about what's going on.")
 @click.option('--config', metavar="CONFIG", envvar="JCLI_YAML",
               help="Location of jira yaml configuration.  Defaults to "
               "'~/.jira.yml'")
+@click.option('--no-cache', default=False, is_flag=True,
+              help="Don't use the on-disk metadata cache.")
 @click.pass_context
 @click.version_option()
-def cli(ctx, debug, config):
+def cli(ctx, debug, config, no_cache):
     """Tools for interacting / authenticating with jira
     """
     ctx.ensure_object(dict)
 
+    if no_cache:
+        os.environ["JCLI_NO_CACHE"] = "1"
+
     if debug:
         logging.basicConfig(
             level=logging.DEBUG,
@@ -36,14 +62,40 @@ def cli(ctx, debug, config):
         logging.basicConfig(level=logging.INFO, format='%(message)s')
 
 
-@cli.group()
+@cli.group(cls=LazyGroup, lazy_subcommands={
+    "clear": "jcli.config:clear_config_cmd",
+    "get": "jcli.config:get_config_cmd",
+    "set": "jcli.config:set_config_cmd",
+    "append": "jcli.config:append_config_cmd",
+})
 def config():
     """Commands for interacting with the configuration.
     """
     pass
 
 
-@cli.group()
+@cli.group(cls=LazyGroup, lazy_subcommands={
+    "list": "jcli.issues:list_cmd",
+    "search": "jcli.issues:search_cmd",
+    "show": "jcli.issues:show_cmd",
+    "add-comment": "jcli.issues:add_comment_cmd",
+    "states": "jcli.issues:states_cmd",
+    "set-status": "jcli.issues:set_state_cmd",
+    "set-field": "jcli.issues:set_field_cmd",
+    "set-type": "jcli.issues:set_type_cmd",
+    "set-parent": "jcli.issues:set_parent_cmd",
+    "set-field-from-csv": "jcli.issues:set_field_from_csv_cmd",
+    "create": "jcli.issues:create_issue_cmd",
+    "add-watcher": "jcli.issues:add_watcher_cmd",
+    "del-watcher": "jcli.issues:del_watcher_cmd",
+    "attachments": "jcli.issues:attachments_cmd",
+    "get-field": "jcli.issues:get_field_cmd",
+    "del-comment": "jcli.issues:del_comment_cmd",
+    "update-comment": "jcli.issues:update_comment_cmd",
+    "eausm-vote": "jcli.issues:eausm_vote_cmd",
+    "add-link": "jcli.issues:add_link_cmd",
+    "bulk-import": "jcli.issues:bulk_import_cmd",
+})
 def issues():
     """Lists the user currently logged in.
 
@@ -51,14 +103,32 @@ def issues():
     pass
 
 
-@cli.group()
+@cli.group(cls=LazyGroup, lazy_subcommands={
+    "last-states": "jcli.details:last_states_cmd",
+    "server-info": "jcli.details:server_info_cmd",
+    "statuses": "jcli.details:statuses_cmd",
+    "groups": "jcli.details:groups_info_cmd",
+    "components": "jcli.details:components_info_cmd",
+    "link-types": "jcli.details:link_types_cmd",
+    "project-versions": "jcli.details:dump_project_versions_cmd",
+    "field-types": "jcli.details:dump_field_types_cmd",
+    "resolutions": "jcli.details:resolutions_cmd",
+    "refresh-cache": "jcli.details:refresh_cache_cmd",
+})
 def details():
     """Lists details about the JIRA instance"
     """
     pass
 
 
-@cli.group()
+@cli.group(cls=LazyGroup, lazy_subcommands={
+    "list": "jcli.boards:list_cmd",
+    "show": "jcli.boards:show_cmd",
+    "get-config": "jcli.boards:get_config_cmd",
+    "sprints": "jcli.boards:sprints_cmd",
+    "create-sprint": "jcli.boards:create_sprint_cmd",
+    "autoexec": "jcli.boards:autoexec_cmd",
+})
 def boards():
     """
     Boards / Sprint related commands.
@@ -66,7 +136,9 @@ def boards():
     pass
 
 
-@cli.group()
+@cli.group(cls=LazyGroup, lazy_subcommands={
+    "find": "jcli.users:users_find_cmd",
+})
 def users():
     """
     User related commands.
@@ -74,7 +146,12 @@ def users():
     pass
 
 
-@cli.group()
+@cli.group(cls=LazyGroup, lazy_subcommands={
+    "list-all": "jcli.query:list_all_cmd",
+    "run": "jcli.query:run_cmd",
+    "build": "jcli.query:build_cmd",
+    "remove": "jcli.query:remove_cmd",
+})
 def query():
     """
     Saved query commands.
@@ -82,67 +159,38 @@ def query():
     pass
 
 
-@cli.group()
+@cli.group(cls=LazyGroup, lazy_subcommands={
+    "sync": "jcli.mirror:sync_cmd",
+    "status": "jcli.mirror:status_cmd",
+})
+def mirror():
+    """
+    Local issue mirror commands.
+    """
+    pass
+
+
+@cli.group(cls=LazyGroup, lazy_subcommands={
+    "start": "jcli.daemon:start_cmd",
+    "stop": "jcli.daemon:stop_cmd",
+    "status": "jcli.daemon:status_cmd",
+})
+def daemon():
+    """
+    Background process commands.
+    """
+    pass
+
+
+@cli.group(cls=LazyGroup, lazy_subcommands={
+    "convert": "jcli.utils:convert_cmd",
+})
 def utils():
     """
     Generic related utilities.
     """
 
 
-cli.add_command(my_cmds.login_cmd)
-cli.add_command(my_cmds.myself_cmd)
-
-config.add_command(config_cmds.clear_config_cmd)
-config.add_command(config_cmds.get_config_cmd)
-config.add_command(config_cmds.set_config_cmd)
-config.add_command(config_cmds.append_config_cmd)
-
-issues.add_command(issues_cmds.list_cmd)
-issues.add_command(issues_cmds.show_cmd)
-issues.add_command(issues_cmds.add_comment_cmd)
-issues.add_command(issues_cmds.states_cmd)
-issues.add_command(issues_cmds.set_state_cmd)
-issues.add_command(issues_cmds.set_field_cmd)
-issues.add_command(issues_cmds.set_type_cmd)
-issues.add_command(issues_cmds.set_parent_cmd)
-issues.add_command(issues_cmds.set_field_from_csv_cmd)
-issues.add_command(issues_cmds.create_issue_cmd)
-issues.add_command(issues_cmds.add_watcher_cmd)
-issues.add_command(issues_cmds.del_watcher_cmd)
-issues.add_command(issues_cmds.attachments_cmd)
-issues.add_command(issues_cmds.get_field_cmd)
-issues.add_command(issues_cmds.del_comment_cmd)
-issues.add_command(issues_cmds.update_comment_cmd)
-issues.add_command(issues_cmds.eausm_vote_cmd)
-issues.add_command(issues_cmds.add_link_cmd)
-issues.add_command(issues_cmds.bulk_import_cmd)
-
-details.add_command(details_cmds.last_states_cmd)
-details.add_command(details_cmds.server_info_cmd)
-details.add_command(details_cmds.statuses_cmd)
-details.add_command(details_cmds.groups_info_cmd)
-details.add_command(details_cmds.components_info_cmd)
-details.add_command(details_cmds.link_types_cmd)
-details.add_command(details_cmds.dump_project_versions_cmd)
-details.add_command(details_cmds.dump_field_types_cmd)
-details.add_command(details_cmds.resolutions_cmd)
-
-boards.add_command(boards_cmds.list_cmd)
-boards.add_command(boards_cmds.show_cmd)
-boards.add_command(boards_cmds.get_config_cmd)
-boards.add_command(boards_cmds.sprints_cmd)
-boards.add_command(boards_cmds.create_sprint_cmd)
-boards.add_command(boards_cmds.autoexec_cmd)
-
-users.add_command(users_cmds.users_find_cmd)
-
-query.add_command(query_cmds.list_all_cmd)
-query.add_command(query_cmds.run_cmd)
-query.add_command(query_cmds.build_cmd)
-query.add_command(query_cmds.remove_cmd)
-
-utils.add_command(utils_cmds.convert_cmd)
-
 # Add a shell-cmd option when click-shell is installed
 try:
     from click_shell import shell
@@ -151,13 +199,14 @@ try:
     def shell_cmd():
         pass
 
-    shell_cmd.add_command(my_cmds.login_cmd)
-    shell_cmd.add_command(my_cmds.myself_cmd)
+    shell_cmd.add_command(cli.get_command(None, "login"))
+    shell_cmd.add_command(cli.get_command(None, "myself"))
     shell_cmd.add_command(issues)
     shell_cmd.add_command(details)
     shell_cmd.add_command(boards)
     shell_cmd.add_command(users)
     shell_cmd.add_command(query)
+    shell_cmd.add_command(mirror)
     cli.add_command(shell_cmd)
 except:
     pass
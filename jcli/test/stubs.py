@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
+from jcli import jql
 from jcli.connector import JiraConnector
+import contextlib
 import random
 
 
@@ -117,8 +119,12 @@ class JiraConnectorStub(JiraConnector):
     _issues_list = []
     _created_issues = []
     _issue_links = []
+    _field_updates = []
+    _snapshots = {}
     _last_jql = ""
+    _last_fields = None
     last_issue = None
+    report_weights = None
     config = {}
     _field_type_mapping = {}
 
@@ -137,6 +143,8 @@ class JiraConnectorStub(JiraConnector):
         self.config_file = config_file or '/dev/null'
         self._last_comment_reply = None
         self._fields = []
+        self.use_cache = False
+        self.offline = False
 
     def _save_cfg(self):
         pass
@@ -200,6 +208,7 @@ class JiraConnectorStub(JiraConnector):
         f['issuetype'] = {"name": "Bug"}
         f['parent'] = {"key": "PARENT-1"}
         issue.raw['fields'] = f
+        issue.raw['key'] = issue_tag
         issue["key"] = issue_tag
         issue["summary"] = random_summary
         issue["statusId"] = random.randint(0, 3)
@@ -211,24 +220,29 @@ class JiraConnectorStub(JiraConnector):
         JiraConnectorStub._issues_list = []
         JiraConnectorStub._created_issues = []
         JiraConnectorStub._issue_links = []
+        JiraConnectorStub._field_updates = []
         JiraConnectorStub._field_type_mapping = {}
+        JiraConnectorStub._snapshots = {}
 
     def _ratelimit(self):
         pass
 
-    def login(self):
+    def login(self, refresh=False, offline=False):
         pass
 
     def myself(self):
         pass
 
-    def get_issue(self, issue_identifier):
+    def get_issue(self, issue_identifier, profile="full", fields=None):
         for i in JiraConnectorStub._issues_list:
             if i['key'] == issue_identifier:
                 return i
 
         return None
 
+    def get_issues(self, keys, profile="full", fields=None):
+        return {key: self.get_issue(key) for key in keys}
+
     def get_states_for_issue(self, issue_identifier):
         pass
 
@@ -263,12 +277,54 @@ class JiraConnectorStub(JiraConnector):
         JiraConnectorStub._last_jql = jql
         return JiraConnectorStub._issues_list
 
+    def _query_issues_iter(self, jql, offset=0, maxIssues=None, fields=None):
+        JiraConnectorStub._last_fields = fields
+        return iter(self._query_issues(jql, offset, maxIssues))
+
+    def save_query_snapshot(self, name, query, raws, startAt=0,
+                            maxResults=None):
+        JiraConnectorStub._snapshots[name] = (query, raws, startAt,
+                                              maxResults)
+
+    @contextlib.contextmanager
+    def query_snapshot_writer(self, name, query, startAt=0, maxResults=None):
+        raws = []
+        yield raws.append
+        self.save_query_snapshot(name, query, raws, startAt, maxResults)
+
+    def query_snapshot_iter(self, name, query, startAt=0, maxResults=None):
+        if JiraConnectorStub._snapshots.get(name, (None,))[0] != query:
+            return None
+        _, stored, stored_at, stored_max = JiraConnectorStub._snapshots[name]
+        skip = self._snapshot_skip(stored_at, stored_max, len(stored),
+                                   startAt, maxResults)
+        if skip is None:
+            return None
+        raws = jql.run(query, stored, jql.Context(), skip, maxResults)
+        issues = []
+        for raw in raws:
+            issue = JiraIssueStub()
+            issue.raw = raw
+            issue["key"] = raw['key']
+            issue["summary"] = raw['fields']['summary']
+            issues.append(issue)
+        return iter(issues)
+
     def requested_fields(self):
         pass
 
     def set_field(self, issue, fieldname, val):
         pass
 
+    def set_fields(self, issue, pairs, forced=False):
+        JiraConnectorStub._field_updates.append((issue['key'], pairs))
+        fields = issue.raw['fields']
+        changed = [(f, fields.get(f), v) for f, v in dict(pairs).items()
+                   if fields.get(f) != v]
+        for f, _, v in changed:
+            fields[f] = v
+        return changed
+
     def convert_to_field_type(self, field_id, field_value):
         if field_id in JiraConnectorStub._field_type_mapping:
             return JiraConnector.convert_to_field_type(self, field_id, field_value)
@@ -301,15 +357,34 @@ class JiraConnectorStub(JiraConnector):
         JiraConnectorStub._issues_list.append(stub)
         return stub
 
-    def add_issue_link(self, issue, target, title=None, link_type=None, isinward=False):
+    def create_issues(self, issue_dicts):
+        results = []
+        for issue_dict in issue_dicts:
+            try:
+                results.append(self.create_issue(issue_dict))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def add_issue_link(self, issue, target, title=None, link_type=None,
+                       isinward=False, verify_target=True, link_types=None):
         JiraConnectorStub._issue_links.append({
             'source': issue,
             'target': target,
             'title': title,
             'link_type': link_type,
             'isinward': isinward,
+            'verify_target': verify_target,
         })
 
+    def add_issue_links(self, links, known=()):
+        results = []
+        for issue, target, link_type, isinward in links:
+            self.add_issue_link(issue, target, None, link_type, isinward,
+                                verify_target=target not in known)
+            results.append(None)
+        return results
+
     def add_comment(self, issue_identifier, comment_body, visibility):
         for issue in JiraConnectorStub._issues_list:
             if issue['key'] == issue_identifier:
@@ -372,9 +447,10 @@ class JiraConnectorStub(JiraConnector):
         }
         return columns
 
-    def fetch_issues_by_board(self, board_name, offset=0, max_issues=100):
+    def fetch_issues_by_board(self, board_name, offset=0, max_issues=100,
+                              fields=None):
         """Return stub issues for a board"""
-        return self._query_issues("", offset, max_issues)
+        return self._query_issues_iter("", offset, max_issues)
 
     def fetch_issues_by_board_qf(self, board_name, offset=0, max_issues=100, quick_filter=None):
         """Return stub issues for a board with quick filter"""
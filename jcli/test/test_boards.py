@@ -4,10 +4,14 @@ from jcli.boards import show_cmd
 from jcli.boards import get_config_cmd
 from jcli.boards import sprints_cmd
 from jcli.boards import create_sprint_cmd
+from jcli.connector import AsyncJiraConnector
 from jcli.test.stubs import JiraConnectorStub
+import asyncio
 import json
 import pytest
 import random
+import threading
+import time
 from unittest.mock import patch
 
 
@@ -382,3 +386,31 @@ def test_show_board_combined_filters(cli_runner):
                                 '--summary-len', '40',
                                 '--max-issues', '20'])
     assert result.exit_code == 0
+
+
+def test_async_connector_caps_concurrency():
+    """Fanned out calls keep their order and respect the worker count."""
+    JiraConnectorStub.setup_clear_issues()
+    jobj = JiraConnectorStub()
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def slow_query(query, startAt=0, maxResults=100):
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        return [query]
+
+    jobj._query_issues = slow_query
+
+    async def fan_out():
+        async with AsyncJiraConnector(jobj, workers=3) as ajobj:
+            return await ajobj.gather(
+                [ajobj.query_issues(f"sprint = {n}") for n in range(12)])
+
+    results = asyncio.run(fan_out())
+    assert results == [[f"sprint = {n}"] for n in range(12)]
+    assert 1 < running[1] <= 3
@@ -0,0 +1,246 @@
+from jcli.cache import CompletionCache
+from jcli.cache import IssueCache
+from jcli.cache import JSONListWriter
+from jcli.cache import MetadataCache
+from jcli.connector import JiraConnector
+from jcli.test.stubs import JiraConnectorStub
+from jcli.utils import RuntimeEvalChoice
+import click
+import json
+import os
+import pytest
+import stat
+import time
+import types
+
+
+def test_metadata_cache_round_trip(tmp_path):
+    """Entries written by one cache object are visible to the next."""
+    mcache = MetadataCache("https://issue.test.com/", "user",
+                           directory=str(tmp_path))
+    assert mcache.get("fields") is None
+
+    mcache.put("fields", [{"id": "summary", "name": "Summary"}])
+
+    reread = MetadataCache("https://issue.test.com/", "user",
+                           directory=str(tmp_path))
+    assert reread.get("fields") == [{"id": "summary", "name": "Summary"}]
+    assert stat.S_IMODE(os.stat(reread.path).st_mode) == 0o600
+
+
+def test_metadata_cache_expired(tmp_path):
+    """Entries older than the ttl are ignored."""
+    mcache = MetadataCache("https://issue.test.com/", "user", ttl=10,
+                           directory=str(tmp_path))
+    mcache.put("statuses", ["Open"])
+    mcache._entries["statuses"]["stored"] = time.time() - 60
+
+    assert mcache.get("statuses") is None
+
+
+def test_metadata_cache_per_server(tmp_path):
+    """A different server or user never sees another's entries."""
+    MetadataCache("https://a.test.com/", "user",
+                  directory=str(tmp_path)).put("projects", ["A"])
+
+    assert MetadataCache("https://b.test.com/", "user",
+                         directory=str(tmp_path)).get("projects") is None
+    assert MetadataCache("https://a.test.com/", "other",
+                         directory=str(tmp_path)).get("projects") is None
+
+
+def test_metadata_cache_clear(tmp_path):
+    """Clearing removes the file on disk."""
+    mcache = MetadataCache("https://issue.test.com/", "user",
+                           directory=str(tmp_path))
+    mcache.put("resolutions", ["Done"])
+    mcache.clear()
+
+    assert not os.path.exists(mcache.path)
+    assert mcache.get("resolutions") is None
+
+
+def test_issue_cache_round_trip(tmp_path):
+    """Issues are stored per key and set of fields."""
+    icache = IssueCache("https://issue.test.com/", "user",
+                        directory=str(tmp_path))
+    raw = {"key": "PROJ-1", "fields": {"updated": "2024-01-01"}}
+    icache.put("proj-1", "*all", raw)
+
+    assert icache.get("PROJ-1", "*all") == raw
+    assert icache.get("PROJ-1", "*navigable") is None
+    assert IssueCache("https://other.test.com/", "user",
+                      directory=str(tmp_path)).get("PROJ-1", "*all") is None
+
+    icache.clear()
+    assert icache.get("PROJ-1", "*all") is None
+
+
+class FakeJira(object):
+    """Counts issue downloads and revalidation searches.
+
+    Like the real client, searching translates field names through a
+    cache that is filled by downloading every field, unless it is primed.
+    """
+
+    def __init__(self, updated):
+        self._options = {"server": "https://issue.test.com/"}
+        self._session = None
+        self._fields_cache_value = {}
+        self.updated = updated
+        self.downloads = 0
+        self.searches = 0
+        self.calls = []
+
+    def fields(self):
+        self.calls.append("fields")
+        return [{"id": "updated", "name": "Updated",
+                 "clauseNames": ["updated"]}]
+
+    @property
+    def _fields_cache(self):
+        if not self._fields_cache_value:
+            self._fields_cache_value = {
+                name: f["id"] for f in self.fields()
+                for name in f["clauseNames"]}
+        return self._fields_cache_value
+
+    def raw(self):
+        return {"key": "PROJ-1", "id": "1",
+                "fields": {"summary": "Big issue", "updated": self.updated}}
+
+    def issue(self, key, fields=None):
+        self.downloads += 1
+        return types.SimpleNamespace(raw=self.raw())
+
+    def search_issues(self, jql, startAt, maxResults, fields=None, **kwargs):
+        self.searches += 1
+        self.calls.append("search")
+        assert [self._fields_cache[f] for f in fields] == ["updated"]
+        raw = self.raw()
+        return {"issues": [{"key": raw["key"],
+                            "fields": {"updated": raw["fields"]["updated"]}}]}
+
+
+def test_get_issue_revalidates(tmp_path, monkeypatch):
+    """get_issue only downloads an issue again once it has changed."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    JiraConnectorStub.reset_config()
+    JiraConnectorStub.config['jira']['server'] = 'https://issue.test.com/'
+    jobj = JiraConnectorStub()
+    jobj.use_cache = True
+    jobj.jira = FakeJira("2024-01-01T10:00:00.000+0000")
+
+    first = JiraConnector.get_issue(jobj, "PROJ-1")
+    again = JiraConnector.get_issue(jobj, "PROJ-1")
+    assert jobj.jira.downloads == 1
+    assert jobj.jira.searches == 1
+    assert again.raw == first.raw
+
+    jobj.jira.updated = "2024-01-02T10:00:00.000+0000"
+    changed = JiraConnector.get_issue(jobj, "PROJ-1")
+    assert jobj.jira.downloads == 2
+    assert changed.raw['fields']['updated'] == jobj.jira.updated
+
+    # A fresh run with warm caches revalidates with a single search.
+    jobj = JiraConnectorStub()
+    jobj.use_cache = True
+    del jobj._fields
+    jobj.jira = FakeJira(changed.raw['fields']['updated'])
+    jobj._metadata_cache().put("fields", jobj.jira.fields())
+    jobj.jira.calls = []
+    JiraConnector.get_issue(jobj, "PROJ-1")
+    assert jobj.jira.calls == ["search"]
+    assert jobj.jira.downloads == 0
+
+    # Without the cache, every call downloads the issue.
+    JiraConnectorStub.config['jira']['default']['issue_cache'] = False
+    JiraConnector.get_issue(jobj, "PROJ-1")
+    assert jobj.jira.downloads == 1
+
+
+def test_completion_cache_stale(tmp_path):
+    """Expired choices are still returned, and only one refresh claimed."""
+    ccache = CompletionCache("https://issue.test.com/", "user", ttl=10,
+                             directory=str(tmp_path))
+    assert ccache.lookup("boards") == (None, False)
+
+    ccache.put("boards", ["Team"])
+    assert ccache.lookup("boards") == (["Team"], True)
+
+    ccache._entries["boards"]["stored"] = time.time() - 60
+    assert ccache.lookup("boards") == (["Team"], False)
+    assert ccache.claim_refresh("boards")
+    assert not ccache.claim_refresh("boards")
+    ccache.release_refresh("boards")
+    assert ccache.claim_refresh("boards")
+
+
+def test_completion_choices_skip_login(tmp_path, monkeypatch):
+    """Stored choices are handed out without logging in."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    JiraConnectorStub.reset_config()
+    JiraConnectorStub.config['jira']['server'] = 'https://issue.test.com/'
+    jobj = JiraConnectorStub()
+    jobj.use_cache = True
+    calls = []
+    refreshed = []
+    jobj.login = lambda: calls.append("login")
+    jobj._refresh_choices_in_background = \
+        lambda name, fetch: refreshed.append(name)
+
+    def fetch(conn):
+        calls.append("fetch")
+        return ["Blocks", "Relates"]
+
+    assert jobj.completion_choices("link_types", fetch) == \
+        ["Blocks", "Relates"]
+    assert calls == ["login", "fetch"]
+
+    again = JiraConnectorStub()
+    again.use_cache = True
+    again._refresh_choices_in_background = jobj._refresh_choices_in_background
+    assert again.completion_choices("link_types", fetch) == \
+        ["Blocks", "Relates"]
+    assert calls == ["login", "fetch"]
+    assert refreshed == []
+
+    # Once expired, the old list is used while a new one is fetched.
+    again._completion_cache()._entries["link_types"]["stored"] = 0
+    assert again.completion_choices("link_types", fetch) == \
+        ["Blocks", "Relates"]
+    assert calls == ["login", "fetch"]
+    assert refreshed == ["link_types"]
+
+
+def test_choice_refreshes_unknown_value():
+    """A value missing from cached choices is checked against fresh ones."""
+    lists = {False: ["Blocks"], True: ["Blocks", "Clones"]}
+    choice = RuntimeEvalChoice(lambda refresh=False: lists[refresh],
+                               case_sensitive=False)
+
+    assert choice.convert("clones", None, None) == "Clones"
+    with pytest.raises(click.BadParameter):
+        choice.convert("Duplicates", None, None)
+
+
+def test_json_list_writer(tmp_path):
+    """Items are streamed out; the file only appears once committed."""
+    path = str(tmp_path / "snap.json")
+    out = JSONListWriter(path, {"jql": "project = A"}, "issues")
+    out.append({"key": "A-1"})
+    out.append({"key": "A-2"})
+    assert not os.path.exists(path)
+    out.commit()
+
+    with open(path) as f:
+        assert json.load(f) == {"jql": "project = A",
+                                "issues": [{"key": "A-1"}, {"key": "A-2"}]}
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    dropped = JSONListWriter(path, {}, "issues")
+    dropped.append({"key": "A-3"})
+    dropped.discard()
+    with open(path) as f:
+        assert len(json.load(f)["issues"]) == 2
+    assert os.listdir(str(tmp_path)) == ["snap.json"]
@@ -0,0 +1,101 @@
+from jcli import client
+from jcli import connector
+from jcli import daemon
+from jcli import shell
+from jcli import utils
+from jcli.test.stubs import JiraConnectorStub
+import os
+import pytest
+import subprocess
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+
+@pytest.fixture
+def running(tmp_path):
+    """A daemon serving the real command tree, with the stub connector."""
+    path = str(tmp_path / "d" / "daemon.sock")
+    JiraConnectorStub.setup_clear_issues()
+    with patch('jcli.connector.JiraConnector', JiraConnectorStub):
+        thread = threading.Thread(target=daemon.serve,
+                                  args=(path, shell.cli))
+        thread.start()
+        while not os.path.exists(path):
+            time.sleep(0.01)
+        yield path
+        daemon._send({"stop": True}, path)
+        thread.join()
+
+
+def test_daemon_runs_commands(running, capfd):
+    JiraConnectorStub.config['jira']['saved_queries'] = {
+        'mine': {'jql': 'assignee = currentUser()'}}
+
+    assert client.forward(['query', 'list-all'], running) == 0
+    assert 'mine' in capfd.readouterr().out
+    # The socket is only reachable by the user.
+    assert oct(os.stat(running).st_mode & 0o777) == oct(0o600)
+
+    assert client.forward(['query', 'run', 'nosuch'], running) != 0
+    assert 'nosuch' in capfd.readouterr().err
+
+
+def test_daemon_keeps_connector(running):
+    """Commands share one connector until the config changes."""
+    assert isinstance(connector.JiraConnector, daemon._WarmConnectors)
+    first = connector.JiraConnector()
+    assert connector.JiraConnector() is first
+    assert connector.JiraConnector(load_safe=True) is not first
+
+
+def test_daemon_hands_back_editor_commands(running):
+    """Commands that need an editor are run by the client instead."""
+    with patch('jcli.issues.get_text_via_editor', utils.get_text_via_editor):
+        assert client.forward(['issues', 'add-comment', 'PROJ-1'],
+                              running) is None
+    assert utils.HAS_TERMINAL is False
+
+
+def test_daemon_hands_back_stdin_commands(running):
+    """Commands reading stdin are run by the client instead."""
+    assert client.forward(['utils', 'convert', '-'], running) is None
+
+
+def test_client_without_daemon(tmp_path):
+    assert client.forward(['myself'], str(tmp_path / "none.sock")) is None
+    assert client._command(['--config', 'x.yml', 'daemon', 'start']) == \
+        'daemon'
+    assert client._command(['--no-cache', 'issues', 'list']) == 'issues'
+
+
+def test_client_without_unix_sockets(tmp_path, monkeypatch):
+    monkeypatch.delattr(client.socket, "AF_UNIX")
+    assert client.forward(['myself'], str(tmp_path / "none.sock")) is None
+
+
+def test_daemon_completes(tmp_path, capfd, monkeypatch):
+    """Shell completion is answered by a daemon started without it."""
+    path = str(tmp_path / "d" / "daemon.sock")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(client.__file__)))
+    env = dict(os.environ, HOME=str(tmp_path), PYTHONPATH=root,
+               XDG_CACHE_HOME=str(tmp_path / "cache"))
+    env.pop("XDG_RUNTIME_DIR", None)
+    proc = subprocess.Popen(
+        [sys.executable, "-c", "import sys; from jcli import daemon, shell; "
+         "daemon.serve(sys.argv[1], shell.cli)", path],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while not os.path.exists(path):
+            assert proc.poll() is None
+            time.sleep(0.01)
+
+        monkeypatch.setenv("_JCLI_COMPLETE", "bash_complete")
+        monkeypatch.setenv("COMP_WORDS", "jcli iss")
+        monkeypatch.setenv("COMP_CWORD", "1")
+        assert client.forward([], path) == 0
+        assert capfd.readouterr().out == "plain,issues\n"
+    finally:
+        daemon._send({"stop": True}, path)
+        proc.wait(10)
@@ -0,0 +1,175 @@
+from jcli.issuedb import IssueMirror
+from jcli.issuedb import MirrorError
+from jcli.connector import JiraConnector
+from jcli.jql import JQLError
+from jcli.test.stubs import JiraConnectorStub
+import os
+import pytest
+import stat
+import types
+
+
+def make_issue(key, status="New", priority="Normal", assignee="a@a.com",
+               updated="2024-01-01T10:00:00.000+0000"):
+    return {"id": key.split("-")[1], "key": key,
+            "fields": {"summary": f"Summary of {key}",
+                       "project": {"key": key.split("-")[0],
+                                   "name": "Project"},
+                       "status": {"name": status,
+                                  "statusCategory": {"key": "new"}},
+                       "priority": {"name": priority},
+                       "assignee": {"name": assignee,
+                                    "displayName": assignee.upper()},
+                       "updated": updated}}
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    m = IssueMirror("https://issue.test.com/", "user",
+                    directory=str(tmp_path))
+    m.put_meta("myself", {"name": "a@a.com"})
+    m.put_meta("priority_ranks", {"High": 3, "Normal": 2, "Low": 1})
+    m.put_issues([
+        make_issue("PROJ-1", priority="Low",
+                   updated="2024-01-03T10:00:00.000+0000"),
+        make_issue("PROJ-2", status="Done", priority="High"),
+        make_issue("PROJ-3", assignee="b@a.com",
+                   updated="2024-01-02T10:00:00.000+0000"),
+        make_issue("OTHER-4", priority="High"),
+    ])
+    yield m
+    m.close()
+
+
+def keys(raws):
+    return [r['key'] for r in raws]
+
+
+def test_mirror_private_file(mirror):
+    assert stat.S_IMODE(os.stat(mirror.path).st_mode) == 0o600
+    assert mirror.issue_count() == 4
+
+
+def test_mirror_search_build_issues_query(mirror):
+    """The queries build_issues_query makes are answered locally."""
+    jql = 'assignee = "a@a.com" AND project = "PROJ" AND ' \
+          'status not in ("Closed","Done")'
+    assert keys(mirror.search(jql)) == ["PROJ-1"]
+    assert keys(mirror.search('assignee = currentUser() AND '
+                              'project = proj')) == ["PROJ-1", "PROJ-2"]
+
+
+def test_mirror_search_order_and_window(mirror):
+    jql = 'project in (PROJ, OTHER) ORDER BY priority DESC'
+    assert keys(mirror.search(jql)) == ["PROJ-2", "OTHER-4", "PROJ-3",
+                                        "PROJ-1"]
+    assert keys(mirror.search(jql, 1, 2)) == ["OTHER-4", "PROJ-3"]
+    # Fields without a column are sorted by their raw value.
+    mirror.put_fields([{"id": "customfield_1", "name": "Rank",
+                        "custom": True}])
+    ranked = [make_issue("PROJ-5"), make_issue("PROJ-6")]
+    ranked[0]['fields']['customfield_1'] = "0|i0002:"
+    ranked[1]['fields']['customfield_1'] = "0|i0001:"
+    mirror.put_issues(ranked)
+    assert keys(mirror.search('key in (PROJ-5, PROJ-6) ORDER BY Rank')) == \
+        ["PROJ-6", "PROJ-5"]
+    # Without an ORDER BY, the most recently updated come first.
+    assert keys(mirror.search('project = PROJ'))[0] == "PROJ-1"
+
+
+def test_mirror_search_replaces_issues(mirror):
+    mirror.put_issues([make_issue("PROJ-1", status="Done")])
+    assert mirror.issue_count() == 4
+    assert keys(mirror.search('status = done')) == ["PROJ-1", "PROJ-2"]
+
+
+def test_mirror_search_evaluated(mirror):
+    """Queries that can't be translated to SQL are evaluated in python."""
+    assert keys(mirror.search('summary ~ "PROJ-3"')) == ["PROJ-3"]
+    assert keys(mirror.search('project = OTHER OR status = Done '
+                              'ORDER BY key')) == ["OTHER-4", "PROJ-2"]
+    assert keys(mirror.search('NOT project = PROJ')) == ["OTHER-4"]
+    with pytest.raises(JQLError):
+        mirror.search('status was Open')
+    with pytest.raises(JQLError):
+        mirror.search('nosuchfield = 3 OR project = PROJ')
+
+
+def test_mirror_sync_scopes(mirror):
+    assert mirror.last_sync('project = "PROJ"') is None
+    mirror.set_last_sync('project = "PROJ"', 1000.0)
+    assert mirror.last_sync('project = "PROJ"') == 1000.0
+    assert mirror.scopes() == ['project = "PROJ"']
+
+
+def test_mirror_drop_missing(mirror):
+    """Issues are only removed once no scope finds them."""
+    mirror.put_issues([make_issue("PROJ-1"), make_issue("PROJ-2")], "a")
+    mirror.put_issues([make_issue("PROJ-2")], "b")
+
+    assert mirror.drop_missing("a", ["PROJ-1"]) == 0
+    assert mirror.drop_missing("b", []) == 1
+    assert keys(mirror.search('key in (PROJ-1, PROJ-2)')) == ["PROJ-1"]
+    assert mirror.text_search("PROJ-2") == []
+    # Issues stored outside any scope are left alone.
+    assert mirror.drop_missing("a", []) == 1
+    assert mirror.issue_count() == 2
+
+
+def test_sync_mirror_full_removes(mirror):
+    """A full sync removes issues the query stopped finding."""
+    JiraConnectorStub.reset_config()
+    jobj = JiraConnectorStub()
+    jobj._issue_mirror = mirror
+    jobj._mirror_metadata = lambda: None
+    found = [make_issue("NEW-1"), make_issue("NEW-2")]
+    jobj._query_issues_iter = lambda *args: (
+        types.SimpleNamespace(raw=raw) for raw in list(found))
+
+    assert JiraConnector.sync_mirror(jobj, "project = NEW") == 2
+    found.pop()
+    JiraConnector.sync_mirror(jobj, "project = NEW")
+    assert keys(mirror.search("project = NEW ORDER BY key")) == \
+        ["NEW-1", "NEW-2"]
+    JiraConnector.sync_mirror(jobj, "project = NEW", full=True)
+    assert keys(mirror.search("project = NEW")) == ["NEW-1"]
+
+
+def test_mirror_board_keeps_closed_issues(mirror):
+    """Boards sync without the status clause, which is applied offline."""
+    JiraConnectorStub.reset_config()
+    jobj = JiraConnectorStub()
+    jobj._issue_mirror = mirror
+    jobj._fetch_board_config_object = \
+        lambda board: types.SimpleNamespace(filter=1, raw={})
+    jobj.jira.filter = \
+        lambda id: types.SimpleNamespace(jql="project = PROJ ORDER BY key")
+
+    assert JiraConnector.mirror_board(jobj, "Team") == \
+        "project = PROJ ORDER BY key"
+    jobj.offline = True
+    query = JiraConnector.board_issues_query(jobj, "Team")
+    assert keys(mirror.search(query)) == ["PROJ-1", "PROJ-3"]
+
+
+def test_mirror_text_search(mirror):
+    crashes = make_issue("PROJ-7")
+    crashes['fields']['description'] = "The widget crashes on start"
+    summary = make_issue("PROJ-8")
+    summary['fields']['summary'] = "Widget crash"
+    comment = make_issue("OTHER-9")
+    comment['fields']['comment'] = {"comments": [{"body": "crash in widget"}]}
+    mirror.put_issues([crashes, summary, comment])
+    # Re-syncing an issue replaces its text rather than adding to it.
+    mirror.put_issues([crashes])
+
+    found = keys(mirror.text_search("widget crash"))
+    assert sorted(found) == ["OTHER-9", "PROJ-7", "PROJ-8"]
+    if mirror._fts:
+        # Summary matches rank above the rest.
+        assert found[0] == "PROJ-8"
+    assert keys(mirror.text_search("widget", project="other")) == \
+        ["OTHER-9"]
+    assert keys(mirror.text_search("widget", maxResults=1)) == found[:1]
+    with pytest.raises(MirrorError):
+        mirror.text_search("  ")
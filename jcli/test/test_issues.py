@@ -5,15 +5,27 @@ from jcli.issues import create_issue_cmd
 from jcli.issues import get_field_cmd
 from jcli.issues import set_type_cmd
 from jcli.issues import set_parent_cmd
+from jcli.issues import set_field_from_csv_cmd
 from jcli.issues import bulk_import_cmd
 from jcli.issues import _bulk_parse_file
 from jcli.issues import _bulk_topo_sort
+from jcli.issues import _bulk_topo_levels
+from jcli.issues import linked_issue_details
+from jcli.connector import FieldIndex
+from jcli.connector import JiraConnector
+from jcli.connector import LazyIssueFields
 from jcli.test.stubs import JiraConnectorStub
+from jcli.test.stubs import JiraIssueStub
+from jcli.utils import compile_accessor
+from jcli.utils import issue_eval
+import csv
+import io
 import json
 import pprint
 import pytest
 import random
 import re
+import types
 import yaml
 from unittest.mock import patch
 
@@ -42,6 +54,42 @@ def test_list_cmd_no_args(cli_runner):
     assert lines[2] == "|----------------+-----------+------------+-------------------------------------------------+-------------+------------|"
 
 
+@patch('jcli.connector.JiraConnector', JiraConnectorStub)
+def test_list_cmd_report(cli_runner):
+    JiraConnectorStub.setup_clear_issues()
+    for _ in range(50):
+        JiraConnectorStub.setup_add_random_issue()
+    JiraConnectorStub.config['jira']['reporting'] = {
+        'filters': {
+            'URGENT': {'match': {'priority': ['High', 'Critical']}},
+            'CRITICAL': {'or': [{'match': {'priority': 'Critical'}}]},
+        },
+        'ordering': {
+            'priority': {'weight': 10, 'values': {'Minor': 0, 'Normal': 5}},
+        },
+    }
+
+    result = cli_runner.invoke(list_cmd, ['--output', 'report'])
+    assert result.exit_code == 0
+
+    sections = {}
+    for block in result.output.split("\n\n"):
+        lines = block.strip().split("\n")
+        sections[lines[0]] = [line.split()[1] for line in lines[2:]]
+
+    prio = {i['key']: i.raw['fields']['priority']['name']
+            for i in JiraConnectorStub._issues_list}
+    in_order = [i['key'] for i in JiraConnectorStub._issues_list]
+    assert sections["URGENT issues:"] == \
+        [k for k in in_order if prio[k] in ('High', 'Critical')]
+    assert sections["CRITICAL issues:"] == \
+        [k for k in in_order if prio[k] == 'Critical']
+    # The rest are ordered by score, keeping their order for ties.
+    assert sections["Non-filtered Issues:"] == \
+        [k for k in in_order if prio[k] == 'Normal'] + \
+        [k for k in in_order if prio[k] == 'Minor']
+
+
 @patch('jcli.connector.JiraConnector', JiraConnectorStub)
 def test_list_cmd_with_assignee(cli_runner):
     JiraConnectorStub.setup_clear_issues()
@@ -65,6 +113,64 @@ def test_list_cmd_json(cli_runner):
     assert "field_maps" in json_obj
     assert "issues" in json_obj
     assert "issues_count" in json_obj
+    assert JiraConnectorStub._last_fields is None
+
+
+@patch('jcli.connector.JiraConnector', JiraConnectorStub)
+def test_list_cmd_ndjson(cli_runner):
+    JiraConnectorStub.setup_clear_issues()
+    for _ in range(5):
+        JiraConnectorStub.setup_add_random_issue()
+    result = cli_runner.invoke(list_cmd, ['--output', 'ndjson'])
+    assert result.exit_code == 0
+
+    lines = result.output.splitlines()
+    assert [json.loads(line)['key'] for line in lines] == \
+        [i['key'] for i in JiraConnectorStub._issues_list]
+    assert JiraConnectorStub._last_fields is None
+
+
+@patch('jcli.connector.JiraConnector', JiraConnectorStub)
+def test_list_cmd_csv_quoting(cli_runner):
+    JiraConnectorStub.setup_clear_issues()
+    JiraConnectorStub.setup_add_random_issue()
+    issue = JiraConnectorStub._issues_list[0]
+    issue.raw['fields']['summary'] = 'Commas, and "quotes"'
+    result = cli_runner.invoke(list_cmd, ['--output', 'csv',
+                                          '--summary-len', '0'])
+    assert result.exit_code == 0
+
+    rows = list(csv.reader(io.StringIO(result.output.strip())))
+    assert rows[0] == ['key', 'project', 'priority', 'summary', 'status',
+                       'assignee']
+    assert rows[1][0] == issue['key']
+    assert rows[1][3] == 'Commas, and "quotes"'
+
+
+@patch('jcli.connector.JiraConnector', JiraConnectorStub)
+def test_list_cmd_projects_fields(cli_runner):
+    JiraConnectorStub.setup_clear_issues()
+    JiraConnectorStub.setup_add_random_issue()
+    result = cli_runner.invoke(list_cmd, ['--output', 'csv'])
+    assert result.exit_code == 0
+
+    assert JiraConnectorStub._last_fields == ['project', 'priority', 'summary',
+                                              'status', 'assignee']
+
+
+@patch('jcli.connector.JiraConnector', JiraConnectorStub)
+def test_list_cmd_extra_fields(cli_runner):
+    JiraConnectorStub.setup_clear_issues()
+    JiraConnectorStub.setup_add_random_issue()
+    result = cli_runner.invoke(list_cmd, ['--output', 'csv',
+                                          '--fields', 'Component, issuetype'])
+    assert result.exit_code == 0
+
+    assert 'Component' in JiraConnectorStub._last_fields
+    assert 'issuetype' in JiraConnectorStub._last_fields
+    header, row = result.output.splitlines()[:2]
+    assert header.endswith(",Component,issuetype")
+    assert row.endswith(",component,Bug")
 
 
 @patch('jcli.connector.JiraConnector', JiraConnectorStub)
@@ -303,6 +409,37 @@ def test_issue_case_cmp(cli_runner):
     assert "component: component\n" in result.output
 
 
+@patch('jcli.connector.JiraConnector', JiraConnectorStub)
+def test_set_field_from_csv_coalesces_rows(cli_runner, tmp_path):
+    JiraConnectorStub.setup_clear_issues()
+    JiraConnectorStub.setup_add_random_issue()
+    JiraConnectorStub.setup_add_random_issue()
+    first, second = [i['key'] for i in JiraConnectorStub._issues_list]
+
+    csvfile = tmp_path / "fields.csv"
+    csvfile.write_text(f"{first},Component,widgets\n"
+                       f"{second},Component,component\n"
+                       f"{first},summary,New summary,Component,gears\n"
+                       "MISSING-1,Component,x\n"
+                       "short\n")
+    result = cli_runner.invoke(set_field_from_csv_cmd, [str(csvfile)])
+    assert result.exit_code == 0
+
+    # One update per issue, with the pairs from every row in order.
+    assert len(JiraConnectorStub._field_updates) == 2
+    updates = dict(JiraConnectorStub._field_updates)
+    assert updates[first] == [('Component', 'widgets'),
+                              ('summary', 'New summary'),
+                              ('Component', 'gears')]
+    assert f"Updated {first}, set Component: component -> gears" in \
+        result.output
+    assert f"Updated {second}" not in result.output
+    assert "MISSING-1 not found" in result.output
+    assert "Skipping invalid row: ['short']" in result.output
+    assert "1 issue(s) updated, 1 unchanged, 0 failed, 1 not found." in \
+        result.output
+
+
 # ---------------------------------------------------------------------------
 # _bulk_parse_file tests
 # ---------------------------------------------------------------------------
@@ -389,6 +526,111 @@ def test_topo_sort_no_id_issues():
     assert len(result) == 2
 
 
+def test_topo_levels_groups_independent_issues():
+    # a and d have no deps; b needs a; c needs a and b (via parent)
+    issues = [
+        {'id': 'c', 'summary': 'C', 'links': [{'target': 'b'}],
+         'fields': {'parent': 'a'}},
+        {'id': 'b', 'summary': 'B', 'links': [{'target': 'a'}]},
+        {'id': 'a', 'summary': 'A', 'links': [{'target': 'PROJ-99'}]},
+        {'id': 'd', 'summary': 'D'},
+    ]
+    levels = _bulk_topo_levels(issues, issue_ref_fields={'parent'})
+    assert [[i['id'] for i in level] for level in levels] == \
+        [['a', 'd'], ['b'], ['c']]
+
+
+def test_topo_levels_cycle_raises():
+    issues = [
+        {'id': 'a', 'summary': 'A', 'fields': {'parent': 'b'}},
+        {'id': 'b', 'summary': 'B', 'fields': {'parent': 'a'}},
+    ]
+    import click
+    with pytest.raises(click.UsageError, match="Cycle"):
+        _bulk_topo_levels(issues, issue_ref_fields={'parent'})
+
+
+class _BulkResponse(object):
+    status_code = 201
+    ok = True
+
+    def __init__(self, data):
+        self.text = json.dumps(data)
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class _BulkSessionStub(object):
+    def __init__(self, reply):
+        self.reply = reply
+        self.bodies = []
+
+    def post(self, url, data=None):
+        body = json.loads(data)
+        self.bodies.append(body)
+        return _BulkResponse(self.reply(len(body["issueUpdates"])))
+
+
+class _BulkJiraStub(object):
+    _options = {}
+
+    def __init__(self, reply):
+        self._session = _BulkSessionStub(reply)
+
+    def _get_url(self, path):
+        return path
+
+
+def _bulk_connector(reply, fallbacks):
+    JiraConnectorStub.reset_config()
+    jobj = JiraConnectorStub()
+    jobj.jira = _BulkJiraStub(reply)
+    jobj.create_issue = lambda d: fallbacks.append(d) or "RETRIED-1"
+    return jobj
+
+
+def test_create_issues_bulk_with_fallback():
+    def reply(count):
+        # The second issue of each chunk is rejected
+        return {
+            "issues": [{"id": str(i), "key": f"NEW-{i}"}
+                       for i in range(count) if i != 1],
+            "errors": [{"failedElementNumber": 1, "status": 400}]
+            if count > 1 else []}
+
+    fallbacks = []
+    jobj = _bulk_connector(reply, fallbacks)
+
+    dicts = [{'summary': f"S{i}", 'project': 'PROJ', 'issuetype': 'Bug'}
+             for i in range(3)]
+    results = JiraConnector.create_issues(jobj, dicts)
+
+    assert [str(r) for r in results] == ["NEW-0", "RETRIED-1", "NEW-2"]
+    assert fallbacks == [dicts[1]]
+    fields = jobj.jira._session.bodies[0]["issueUpdates"][0]["fields"]
+    assert fields["project"] == {"key": "PROJ"}
+    assert fields["issuetype"] == {"name": "Bug"}
+
+
+def test_create_issues_bulk_mismatch_not_retried():
+    """Entries that may have been created are never created again."""
+    def reply(count):
+        # One issue comes back, with no word on the others.
+        return {"issues": [{"id": "0", "key": "NEW-0"}], "errors": []}
+
+    fallbacks = []
+    jobj = _bulk_connector(reply, fallbacks)
+
+    dicts = [{'summary': f"S{i}", 'project': 'PROJ', 'issuetype': 'Bug'}
+             for i in range(3)]
+    results = JiraConnector.create_issues(jobj, dicts)
+
+    assert str(results[0]) == "NEW-0"
+    assert all(isinstance(r, RuntimeError) for r in results[1:])
+    assert fallbacks == []
+
+
 # ---------------------------------------------------------------------------
 # bulk_import_cmd integration tests (via CliRunner + JiraConnectorStub)
 # ---------------------------------------------------------------------------
@@ -964,3 +1206,217 @@ def test_set_parent_cmd_issue_not_found(cli_runner):
                                ['NONEXISTENT-1', 'PROJ-100'], obj={})
     assert result.exit_code == 1
     assert 'not found' in result.output
+
+
+def test_lazy_issue_fields_loads_on_eausm():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {"votes": []}
+
+    fields = LazyIssueFields({"summary": "A summary"}, loader)
+    assert fields["summary"] == "A summary"
+    assert list(fields) == ["summary"]
+    assert calls == []
+
+    assert "eausm" in fields
+    assert fields["eausm"] == {"votes": []}
+    assert calls == [1]
+
+
+def test_lazy_issue_fields_missing_eausm():
+    fields = LazyIssueFields({"summary": "A summary"}, lambda: None)
+    assert "eausm" not in fields
+    assert fields.get("eausm") is None
+
+
+def test_get_issue_minimal_profile():
+    class IssueFetchStub(object):
+        def issue(self, key, fields=None):
+            self.fields = fields
+            issue = JiraIssueStub()
+            issue.raw['fields'] = {}
+            return issue
+
+    JiraConnectorStub.reset_config()
+    jobj = JiraConnectorStub()
+    jobj.jira = IssueFetchStub()
+
+    issue = JiraConnector.get_issue(jobj, "TEST-1", "minimal")
+    assert jobj.jira.fields == "summary,issuetype,status"
+    assert isinstance(issue.raw['fields'], LazyIssueFields)
+
+
+def test_get_issues_batches_keys():
+    class SearchStub(object):
+        _options = {}
+        _session = None
+
+        def __init__(self):
+            self.searches = []
+
+        def search_issues(self, jql, startAt, maxResults, fields=None,
+                          validate_query=True, json_result=False,
+                          use_post=False):
+            self.searches.append(jql)
+            keys = re.findall(r'"([^"]+)"', jql)
+            return {"issues": [{"key": k.upper(), "fields": {}}
+                               for k in keys if k != "GONE-1"]}
+
+    JiraConnectorStub.reset_config()
+    JiraConnectorStub.config['jira']['default']['page_size'] = 2
+    jobj = JiraConnectorStub()
+    jobj.jira = SearchStub()
+
+    found = JiraConnector.get_issues(jobj, ["A-1", "a-2", "GONE-1", "A-1"])
+
+    assert list(found) == ["A-1", "a-2", "GONE-1"]
+    assert found["A-1"].key == "A-1"
+    assert found["a-2"].key == "A-2"
+    assert found["GONE-1"] is None
+    assert len(jobj.jira.searches) == 2
+    JiraConnectorStub.reset_config()
+
+
+def test_issue_eval_accessors():
+    issue = JiraIssueStub()
+    issue.raw['key'] = 'TEST-1'
+    issue.raw['fields'] = {"summary": "A summary", "assignee": None,
+                           "labels": ["a", "b"]}
+    header_map = {"summary": "raw['fields']['summary']",
+                  "assignee": "raw['fields']['assignee']['displayName']",
+                  "missing": "raw['fields']['nosuch']",
+                  "label": 'raw["fields"]["labels"][-1]',
+                  "labels": "raw['fields']['labels'][0].upper()"}
+
+    assert issue_eval(issue, header_map) == ["A summary", "--", "--", "b",
+                                             "A"]
+    # The same path is only ever compiled once.
+    assert compile_accessor("raw['fields']['summary']") is \
+        compile_accessor("raw['fields']['summary']")
+
+
+FIELD_LIST = [
+    {"id": "summary", "name": "Summary", "custom": False},
+    {"id": "customfield_10", "name": "Story Points", "custom": True,
+     "schema": {"type": "number"}},
+    {"id": "customfield_11", "name": "Story Points", "custom": True,
+     "schema": {"type": "string"}},
+]
+
+
+def test_field_index_resolve():
+    index = FieldIndex(FIELD_LIST)
+    raw = {"summary": "A summary", "customfield_10": 3, "Odd": 1}
+
+    assert index.resolve(raw, "summary") == ("summary", True)
+    assert index.resolve(raw, "SUMMARY") == (None, False)
+    assert index.resolve(raw, "SUMMARY", False) == ("summary", True)
+    # Repeated display names resolve to the first field.
+    assert index.resolve(raw, "Story Points") == ("customfield_10", False)
+    assert index.resolve(raw, "story points") == (None, False)
+    assert index.resolve(raw, "story points", False) == \
+        ("customfield_10", False)
+    assert index.resolve(raw, "odd", False) == ("Odd", True)
+    assert index.types == {"customfield_10": "number",
+                           "customfield_11": "string"}
+
+
+def test_get_field_uses_index():
+    JiraConnectorStub.reset_config()
+    JiraConnectorStub.config['jira']['default']['case_sensitive'] = False
+    jobj = JiraConnectorStub()
+    jobj._fields = FIELD_LIST
+    issue = types.SimpleNamespace(
+        raw={"fields": {"summary": "A summary", "customfield_10": 3}},
+        fields=types.SimpleNamespace(summary="A summary", customfield_10=3))
+
+    assert JiraConnector._try_fieldname(jobj, "Story Points") == \
+        "customfield_10"
+    assert JiraConnector.get_field(jobj, issue, "Summary") == "A summary"
+    assert JiraConnector.get_field(jobj, issue, "story points") == "3"
+    assert JiraConnector.get_field(jobj, issue, "nosuch") == ""
+    assert list(JiraConnector._field_update(jobj, issue, "STORY POINTS",
+                                            "5")) == ["customfield_10"]
+    JiraConnectorStub.reset_config()
+
+
+@patch('jcli.connector.JiraConnector', JiraConnectorStub)
+def test_bulk_import_links_skip_created_target_check(cli_runner, bulk_yaml):
+    JiraConnectorStub.setup_clear_issues()
+    JiraConnectorStub.setup_add_random_issue()
+    existing_key = JiraConnectorStub._issues_list[0]['key']
+
+    path = bulk_yaml([
+        {'id': 'alpha', 'summary': 'Alpha', 'description': 'Alpha desc',
+         'project': 'PROJ', 'issue_type': 'Bug'},
+        {'id': 'beta', 'summary': 'Beta', 'description': 'Beta desc',
+         'project': 'PROJ', 'issue_type': 'Bug',
+         'links': [{'link_type': 'Depends', 'target': 'alpha'},
+                   {'link_type': 'Relates', 'target': existing_key}]},
+    ])
+    result = cli_runner.invoke(bulk_import_cmd, [path], obj={})
+    assert result.exit_code == 0
+    links = {link['target']: link for link in JiraConnectorStub._issue_links}
+    assert links[existing_key]['verify_target'] is True
+    created = [k for k in links if k != existing_key]
+    assert len(created) == 1
+    assert links[created[0]]['verify_target'] is False
+
+
+def test_linked_issue_details():
+    """Details come with the links; only the rest are searched for."""
+    JiraConnectorStub.setup_clear_issues()
+    JiraConnectorStub.setup_add_random_issue()
+    bare = JiraConnectorStub._issues_list[0]
+    issue = JiraIssueStub()
+    issue.raw['fields'] = {'issuelinks': [
+        {'type': {'name': 'Blocks'},
+         'outwardIssue': {'key': 'A-1',
+                          'fields': {'summary': 'First',
+                                     'status': {'name': 'Open'}}}},
+        {'type': {'name': 'Relates'}, 'inwardIssue': {'key': bare['key']}},
+        {'type': {'name': 'Relates'}, 'inwardIssue': {'key': 'GONE-1'}},
+    ]}
+    searched = []
+    jobj = JiraConnectorStub()
+    jobj.get_issues = lambda keys, profile: searched.append(keys) or \
+        JiraConnectorStub.get_issues(jobj, keys, profile)
+
+    details = linked_issue_details(jobj, issue)
+
+    assert searched == [[bare['key'], 'GONE-1']]
+    assert details == {
+        'A-1': ('Open', 'First'),
+        bare['key']: (bare.raw['fields']['status']['name'],
+                      bare.raw['fields']['summary'])}
+
+
+def test_user_display_names_bulk():
+    """Cloud account ids are looked up together, and only once."""
+    class UserLookupStub(object):
+        _is_cloud = True
+
+        def __init__(self):
+            self.requests = []
+
+        def _get_json(self, path, params=None):
+            self.requests.append((path, params))
+            return {"values": [{"accountId": a, "displayName": a.upper()}
+                               for a in params["accountId"] if a != "gone"]}
+
+    JiraConnectorStub.reset_config()
+    jobj = JiraConnectorStub()
+    jobj.jira = UserLookupStub()
+    jobj.find_users_by_name = lambda name: []
+
+    names = JiraConnector.user_display_names(jobj, ["a:1", "b:2", "a:1",
+                                                    "gone"])
+    assert names == {"a:1": "A:1", "b:2": "B:2", "gone": None}
+    assert jobj.jira.requests == [("user/bulk",
+                                   {"accountId": ["a:1", "b:2", "gone"],
+                                    "maxResults": 3})]
+
+    JiraConnector.user_display_names(jobj, ["b:2", "gone"])
+    assert len(jobj.jira.requests) == 1
@@ -0,0 +1,132 @@
+from jcli import jql
+from jcli.jql import And, Clause, Function, Not, Or
+import datetime
+import pytest
+
+
+NOW = datetime.datetime(2024, 1, 10, 12, 0, tzinfo=datetime.timezone.utc)
+
+FIELDS = [{"id": "customfield_100", "name": "Story Points",
+           "schema": {"type": "number"}},
+          {"id": "customfield_101", "name": "Sprint",
+           "schema": {"type": "array"}}]
+
+
+def make_issue(key, **fields):
+    raw = {"key": key, "id": key.split("-")[1],
+           "fields": {"summary": f"Summary of {key}",
+                      "project": {"key": key.split("-")[0]},
+                      "status": {"name": "New"},
+                      "priority": {"name": "Normal"},
+                      "assignee": None,
+                      "labels": [],
+                      "description": None,
+                      "customfield_100": None,
+                      "updated": "2024-01-01T10:00:00.000+0000"}}
+    raw['fields'].update(fields)
+    return raw
+
+
+@pytest.fixture
+def ctx():
+    return jql.Context({"name": "me@a.com"}, FIELDS,
+                       datetime.timezone.utc, NOW,
+                       {"High": 3, "Normal": 2, "Low": 1})
+
+
+def keys(raws):
+    return [r['key'] for r in raws]
+
+
+def test_parse():
+    q = jql.parse('assignee = currentUser() AND status not in '
+                  '("Closed", Done) ORDER BY priority DESC, updated')
+    assert q.where == And([Clause("assignee", "=", Function("currentuser",
+                                                            [])),
+                           Clause("status", "not in", ["Closed", "Done"])])
+    assert q.order == [("priority", True), ("updated", False)]
+
+    q = jql.parse('NOT (project = A OR project = B) and labels is EMPTY')
+    assert q.where == And([Not(Or([Clause("project", "=", "A"),
+                                   Clause("project", "=", "B")])),
+                           Clause("labels", "is", jql.EMPTY)])
+    # A quoted "EMPTY" is just a string.
+    assert jql.parse('labels = "EMPTY"').where.value == "EMPTY"
+    assert jql.parse('ORDER BY key').where is None
+
+
+@pytest.mark.parametrize("query", [
+    'status was Open',
+    'status changed',
+    'project = ',
+    'project = A AND',
+    '(project = A',
+    'project in (A, B',
+    'labels is foo',
+    'project = A ORDER priority',
+])
+def test_parse_errors(query):
+    with pytest.raises(jql.JQLError):
+        jql.parse(query)
+
+
+def test_search_fields():
+    q = jql.parse('key = A-1 AND "Story Points" > 3 AND cf[101] is EMPTY '
+                  'ORDER BY Rank')
+    assert jql.search_fields(q) == ["Story Points", "customfield_101",
+                                    "Rank"]
+
+
+def test_run_logic(ctx):
+    raws = [make_issue("A-1", labels=["x"]),
+            make_issue("A-2", status={"name": "Done"}),
+            make_issue("B-3", assignee={"name": "me@a.com"},
+                       customfield_100=5)]
+    assert keys(jql.run('project = a AND status != Done', raws, ctx)) == \
+        ["A-1"]
+    assert keys(jql.run('status = done OR labels = x', raws, ctx)) == \
+        ["A-1", "A-2"]
+    assert keys(jql.run('NOT project = A', raws, ctx)) == ["B-3"]
+    assert keys(jql.run('assignee = currentUser()', raws, ctx)) == ["B-3"]
+    # Negative operators never match an empty field.
+    assert keys(jql.run('assignee != "other@a.com"', raws, ctx)) == ["B-3"]
+    assert keys(jql.run('assignee is EMPTY', raws, ctx)) == ["A-1", "A-2"]
+    assert keys(jql.run('"Story Points" >= 5', raws, ctx)) == ["B-3"]
+    assert keys(jql.run('key in (A-2, B-3)', raws, ctx)) == ["A-2", "B-3"]
+    with pytest.raises(jql.JQLError):
+        jql.run('nosuchfield = 1', raws, ctx)
+
+
+def test_run_text(ctx):
+    raws = [make_issue("A-1", summary="Widget crashes on start"),
+            make_issue("A-2", description="the widget is fine"),
+            make_issue("A-3")]
+    assert keys(jql.run('summary ~ widget', raws, ctx)) == ["A-1"]
+    assert keys(jql.run('description ~ "WIDGET"', raws, ctx)) == ["A-2"]
+    assert keys(jql.run('summary !~ crashes', raws, ctx)) == ["A-2", "A-3"]
+
+
+def test_run_dates(ctx):
+    raws = [make_issue("A-1", updated="2024-01-10T08:00:00.000+0000"),
+            make_issue("A-2", updated="2024-01-08T08:00:00.000+0000"),
+            make_issue("A-3", updated="2023-12-01T08:00:00.000+0000")]
+    assert keys(jql.run('updated >= -1d', raws, ctx)) == ["A-1"]
+    assert keys(jql.run('updated >= -1w', raws, ctx)) == ["A-1", "A-2"]
+    assert keys(jql.run('updated >= startOfDay()', raws, ctx)) == ["A-1"]
+    assert keys(jql.run('updated < startOfMonth()', raws, ctx)) == ["A-3"]
+    assert keys(jql.run('updated >= "2024/01/08"', raws, ctx)) == \
+        ["A-1", "A-2"]
+    with pytest.raises(jql.JQLError):
+        jql.run('updated >= membersOf(x)', raws, ctx)
+
+
+def test_run_order_and_window(ctx):
+    raws = [make_issue("A-1", priority={"name": "Low"}),
+            make_issue("A-2", priority={"name": "High"}),
+            make_issue("A-3", priority=None),
+            make_issue("A-4")]
+    found = jql.run('ORDER BY priority DESC, key DESC', raws, ctx)
+    # Priorities sort by rank, and empty values always come last.
+    assert keys(found) == ["A-2", "A-4", "A-1", "A-3"]
+    assert keys(jql.run('ORDER BY priority DESC', raws, ctx, 1, 2)) == \
+        ["A-4", "A-1"]
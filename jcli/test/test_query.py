@@ -3,9 +3,11 @@ from jcli.query import list_all_cmd
 from jcli.query import run_cmd
 from jcli.query import build_cmd
 from jcli.query import remove_cmd
+from jcli.connector import JiraConnector
 from jcli.test.stubs import JiraConnectorStub
 import pytest
 import random
+import time
 from unittest.mock import patch
 
 
@@ -83,6 +85,74 @@ def test_run_query(cli_runner):
     assert 'summary' in result.output
 
 
+@patch('jcli.connector.JiraConnector', JiraConnectorStub)
+def test_run_query_offline_snapshot(cli_runner):
+    """An online run stores its results for a later --offline run."""
+    JiraConnectorStub.setup_clear_issues()
+    JiraConnectorStub.reset_config()
+    for _ in range(5):
+        JiraConnectorStub.setup_add_random_issue()
+    JiraConnectorStub._issues_list[0].raw['fields']['priority'] = \
+        {"name": "Blocker"}
+
+    JiraConnectorStub.config['jira']['saved_queries'] = {
+        'blockers': {'jql': 'priority = Blocker'}
+    }
+
+    result = cli_runner.invoke(run_cmd, ['blockers'])
+    assert result.exit_code == 0
+    assert len(JiraConnectorStub._snapshots['blockers'][1]) == 5
+
+    # Offline, the query itself is evaluated against the stored issues.
+    JiraConnectorStub._last_jql = ""
+    result = cli_runner.invoke(run_cmd, ['blockers', '--offline',
+                                         '--output', 'simple'])
+    assert result.exit_code == 0
+    assert JiraConnectorStub._last_jql == ""
+    assert JiraConnectorStub._issues_list[0]['key'] in result.output
+    for issue in JiraConnectorStub._issues_list[1:]:
+        if issue.raw['fields']['priority']['name'] != "Blocker":
+            assert issue['key'] not in result.output
+
+
+@patch('jcli.connector.JiraConnector', JiraConnectorStub)
+def test_run_query_offline_snapshot_window(cli_runner):
+    """An offline run only uses a snapshot holding the issues it asks for."""
+    JiraConnectorStub.setup_clear_issues()
+    JiraConnectorStub.reset_config()
+    for _ in range(5):
+        JiraConnectorStub.setup_add_random_issue()
+    JiraConnectorStub.config['jira']['saved_queries'] = {
+        'all': {'jql': 'issuetype = Bug'}
+    }
+    raws = [issue.raw for issue in JiraConnectorStub._issues_list]
+
+    # Only the first two issues were stored.
+    JiraConnectorStub().save_query_snapshot('all', 'issuetype = Bug',
+                                            raws[:2], 0, 2)
+    JiraConnectorStub._last_jql = ""
+    result = cli_runner.invoke(run_cmd, ['all', '--offline', '--max-issues',
+                                         '2', '--output', 'simple'])
+    assert result.exit_code == 0
+    assert JiraConnectorStub._last_jql == ""
+    result = cli_runner.invoke(run_cmd, ['all', '--offline', '--all'])
+    assert result.exit_code == 0
+    assert JiraConnectorStub._last_jql == 'issuetype = Bug'
+
+    # Issues 2 onwards, which were all there were.
+    JiraConnectorStub().save_query_snapshot('all', 'issuetype = Bug',
+                                            raws[2:], 2, 100)
+    JiraConnectorStub._last_jql = ""
+    result = cli_runner.invoke(run_cmd, ['all', '--offline', '--all',
+                                         '--issue-offset', '3',
+                                         '--output', 'simple'])
+    assert result.exit_code == 0
+    assert JiraConnectorStub._last_jql == ""
+    assert raws[2]['key'] not in result.output
+    assert raws[3]['key'] in result.output
+    assert raws[4]['key'] in result.output
+
+
 @patch('jcli.connector.JiraConnector', JiraConnectorStub)
 def test_run_query_json_output(cli_runner):
     """Test run with JSON output format."""
@@ -244,3 +314,63 @@ def test_build_then_list_then_run_then_remove(cli_runner):
     result = cli_runner.invoke(list_all_cmd)
     assert result.exit_code == 0
     assert 'lifecycle-test' not in result.output
+
+
+class PagedSearchStub(object):
+    """Serves 'total' issues in server sized pages of at most 'cap'."""
+    _is_cloud = False
+    _options = {}
+    _session = None
+
+    def __init__(self, total, cap):
+        self.total = total
+        self.cap = cap
+        self.calls = []
+
+    def search_issues(self, jql, startAt, maxResults, fields=None,
+                      json_result=False):
+        self.calls.append((startAt, maxResults))
+        # Finish out of order when fetched concurrently.
+        time.sleep(random.random() / 100)
+        end = min(startAt + min(maxResults, self.cap), self.total)
+        return {"total": self.total,
+                "issues": [{"key": f"TEST-{i}", "fields": {}}
+                           for i in range(startAt, end)]}
+
+
+def test_query_issues_iter_follows_pages():
+    """Every page is fetched until 'total' is reached."""
+    jobj = JiraConnectorStub()
+    jobj.jira = PagedSearchStub(250, 40)
+
+    keys = [i.key for i in
+            JiraConnector._query_issues_iter(jobj, "x", 0, None)]
+
+    assert keys == [f"TEST-{i}" for i in range(250)]
+    assert len(jobj.jira.calls) == 7
+
+
+def test_query_issues_iter_serial():
+    """With a single worker the pages are fetched one after another."""
+    JiraConnectorStub.reset_config()
+    JiraConnectorStub.config['jira']['default']['workers'] = 1
+    jobj = JiraConnectorStub()
+    jobj.jira = PagedSearchStub(100, 40)
+
+    keys = [i.key for i in
+            JiraConnector._query_issues_iter(jobj, "x", 0, None)]
+
+    assert keys == [f"TEST-{i}" for i in range(100)]
+    assert jobj.jira.calls == [(0, 100), (40, 40), (80, 20)]
+    JiraConnectorStub.reset_config()
+
+
+def test_query_issues_iter_max_results():
+    """maxResults caps the issues returned, even across pages."""
+    jobj = JiraConnectorStub()
+    jobj.jira = PagedSearchStub(250, 40)
+
+    keys = [i.key for i in JiraConnector._query_issues_iter(jobj, "x", 10, 50)]
+
+    assert keys == [f"TEST-{i}" for i in range(10, 60)]
+    assert jobj.jira.calls == [(10, 50), (50, 10)]
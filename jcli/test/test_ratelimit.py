@@ -0,0 +1,75 @@
+from jcli.ratelimit import TokenBucket
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_bucket_allows_burst_then_rate():
+    """The first calls are free, later ones are spaced by the rate."""
+    clock = FakeClock()
+    bucket = TokenBucket(2, 3, clock=clock, sleep=clock.sleep)
+
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.slept == []
+
+    bucket.acquire()
+    assert clock.slept == [0.5]
+
+
+def test_bucket_disabled():
+    """A rate of 0 never waits."""
+    clock = FakeClock()
+    bucket = TokenBucket(0, 1, clock=clock, sleep=clock.sleep)
+
+    for _ in range(100):
+        bucket.acquire()
+    assert clock.slept == []
+
+
+def test_bucket_retry_after():
+    """A 429 with Retry-After holds the next call for that long."""
+    clock = FakeClock()
+    bucket = TokenBucket(10, 5, clock=clock, sleep=clock.sleep)
+
+    bucket.observe(429, {"Retry-After": "7"})
+    bucket.acquire()
+    assert sum(clock.slept) >= 7
+
+
+def test_bucket_backoff_grows():
+    """Repeated 503s without a Retry-After back off exponentially."""
+    clock = FakeClock()
+    bucket = TokenBucket(10, 5, clock=clock, sleep=clock.sleep)
+
+    bucket.observe(503, {})
+    bucket.acquire()
+    first = sum(clock.slept)
+
+    clock.slept = []
+    bucket.observe(503, {})
+    bucket.acquire()
+    assert sum(clock.slept) > first
+
+
+def test_bucket_server_rate():
+    """A lower rate advertised by the server wins over the configured one."""
+    clock = FakeClock()
+    bucket = TokenBucket(10, 1, clock=clock, sleep=clock.sleep)
+
+    bucket.observe(200, {"X-RateLimit-Limit": "1",
+                         "X-RateLimit-Remaining": "0",
+                         "X-RateLimit-FillRate": "1",
+                         "X-RateLimit-Interval-Seconds": "4"})
+    bucket.acquire()
+    assert clock.slept == [4.0]
@@ -0,0 +1,104 @@
+from jcli.test.stubs import JiraConnectorStub
+from jira.client import TokenAuth
+import os
+import requests
+import types
+
+
+def make_connector(tmp_path):
+    JiraConnectorStub.reset_config()
+    JiraConnectorStub.config['jira']['server'] = 'https://issue.test.com/'
+    JiraConnectorStub.config['auth'] = {'type': 'api', 'pat': True}
+
+    jobj = JiraConnectorStub()
+    session = requests.Session()
+    session.auth = TokenAuth("sekrit")
+    session.cookies.set("JSESSIONID", "abc", domain="issue.test.com")
+    jobj.jira = types.SimpleNamespace(_session=session,
+                                      deploymentType="Server",
+                                      _version=(9, 12, 0))
+    jobj._session_file = lambda: tmp_path / "jirasess"
+    return jobj
+
+
+def test_session_round_trip(tmp_path):
+    """A saved session is private and loads back its token and cookies."""
+    jobj = make_connector(tmp_path)
+    jobj._save_session()
+
+    assert oct(os.stat(tmp_path / "jirasess").st_mode & 0o777) == oct(0o600)
+
+    data = jobj._load_session()
+    assert data['headers'] == {'Authorization': 'Bearer sekrit'}
+    assert data['cookies'][0]['name'] == 'JSESSIONID'
+    assert data['deploymentType'] == 'Server'
+
+
+def test_session_rejects_unsafe_file(tmp_path):
+    """A session file readable by others is never used."""
+    jobj = make_connector(tmp_path)
+    jobj._save_session()
+    os.chmod(tmp_path / "jirasess", 0o644)
+
+    assert jobj._load_session() is None
+
+
+def test_session_rejects_other_identity(tmp_path):
+    """A session saved for another server is not reused."""
+    jobj = make_connector(tmp_path)
+    jobj._save_session()
+    JiraConnectorStub.config['jira']['server'] = 'https://other.test.com/'
+
+    assert jobj._load_session() is None
+
+
+def test_session_expired(tmp_path):
+    """Expired sessions are ignored and removed."""
+    jobj = make_connector(tmp_path)
+    JiraConnectorStub.config['jira']['default']['session_ttl'] = -1
+    jobj._save_session()
+
+    assert jobj._load_session() is None
+    assert not os.path.exists(tmp_path / "jirasess")
+
+
+def test_session_without_uids(tmp_path, monkeypatch):
+    """Platforms without uids (Windows) still load and clear sessions."""
+    jobj = make_connector(tmp_path)
+    jobj._save_session()
+    monkeypatch.delattr(os, "getuid")
+
+    assert jobj._load_session() is not None
+    jobj.clear_session()
+    assert not os.path.exists(tmp_path / "jirasess")
+
+
+def test_session_anonymous_relogin(tmp_path):
+    """A request answered anonymously is replayed after logging in again."""
+    jobj = make_connector(tmp_path)
+    jobj._save_session()
+    replayed = []
+
+    class NewSession(requests.Session):
+        def request(self, method, url, data=None, headers=None):
+            replayed.append((method, url))
+            return "replayed"
+
+    def login():
+        jobj.jira = types.SimpleNamespace(_session=NewSession(),
+                                          deploymentType="Server",
+                                          _version=(9, 12, 0))
+    jobj._login = login
+
+    request = requests.Request("GET", "https://issue.test.com/rest/x",
+                               headers={"Cookie": "JSESSIONID=old"})
+    response = requests.Response()
+    response.status_code = 200
+    response.request = request.prepare()
+
+    response.headers["X-AUSERNAME"] = "a@a.com"
+    assert jobj._session_expired_hook(response) is response
+
+    response.headers["X-AUSERNAME"] = "anonymous"
+    assert jobj._session_expired_hook(response) == "replayed"
+    assert replayed == [("GET", "https://issue.test.com/rest/x")]
@@ -0,0 +1,30 @@
+from jcli import shell
+import subprocess
+import sys
+
+
+def test_lazy_commands_listed():
+    """Commands are listed, and found, without importing them up front."""
+    ctx = shell.cli.make_context("jcli", ["issues"])
+    issues = shell.cli.get_command(ctx, "issues")
+
+    assert "set-field" in issues.list_commands(ctx)
+    assert "login" in shell.cli.list_commands(ctx)
+    assert issues.get_command(ctx, "set-field").name == "set-field"
+    assert issues.get_command(ctx, "nosuch") is None
+
+
+def test_help_skips_heavy_imports():
+    """Asking for help doesn't pull in the jira library."""
+    code = ("import sys\n"
+            "from jcli import shell\n"
+            "try:\n"
+            "    shell.cli(['--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "loaded = {'jira.client', 'requests', 'jcli.issues',\n"
+            "          'jcli.boards'}\n"
+            "print(sorted(loaded & set(sys.modules)))\n")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                         text=True, check=True).stdout
+    assert out.splitlines()[-1] == "[]"
@@ -0,0 +1,53 @@
+from jcli import transport
+from jcli.connector import JiraConnector
+from jcli.test.stubs import JiraConnectorStub
+from requests.adapters import HTTPAdapter
+import requests
+import types
+
+
+def test_adapter_retries_only_idempotent():
+    """GETs are retried on failure, POSTs never are."""
+    adapter = transport.make_adapter(8, retries=2)
+    retry = adapter.max_retries
+
+    assert retry.total == 2
+    assert retry.is_retry("GET", 502)
+    assert retry.is_retry("PUT", 504)
+    assert not retry.is_retry("POST", 502)
+    assert not retry.is_retry("GET", 404)
+    assert retry._is_method_retryable("GET")
+    assert not retry._is_method_retryable("POST")
+    assert adapter._pool_maxsize == 8
+
+
+def test_adapter_default_timeout(monkeypatch):
+    """Requests without a timeout get the adapter's, others keep theirs."""
+    sent = []
+
+    def fake_send(self, request, **kwargs):
+        sent.append(kwargs["timeout"])
+
+    monkeypatch.setattr(HTTPAdapter, "send", fake_send)
+    adapter = transport.make_adapter(1, connect_timeout=3, read_timeout=7)
+
+    adapter.send(None, timeout=None)
+    adapter.send(None, timeout=1)
+    assert sent == [(3, 7), 1]
+
+
+def test_connector_configures_session():
+    """The pool is sized from the config, for every scheme."""
+    JiraConnectorStub.reset_config()
+    JiraConnectorStub.config['jira']['default']['workers'] = 6
+    JiraConnectorStub.config['jira']['default']['timeout'] = 30
+    jobj = JiraConnectorStub()
+    jobj.jira = types.SimpleNamespace(_session=requests.Session())
+
+    JiraConnector._configure_transport(jobj)
+
+    for url in ("https://issue.test.com/", "http://issue.test.com/"):
+        adapter = jobj.jira._session.get_adapter(url)
+        assert isinstance(adapter, transport.TimeoutHTTPAdapter)
+        assert adapter._pool_maxsize == 6
+        assert adapter.timeout == (transport.DEFAULT_CONNECT_TIMEOUT, 30.0)
@@ -0,0 +1,57 @@
+"""
+HTTP transport settings for the sessions talking to the JIRA server.
+"""
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 120.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+
+# Only requests that are safe to send twice are retried.
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+# 429 and 503 are already retried by the jira library's session (honoring
+# Retry-After), so retrying them here as well would multiply the attempts.
+RETRY_STATUSES = (502, 504)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """An HTTPAdapter that applies a timeout to requests which lack one."""
+
+    def __init__(self, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def make_adapter(pool_size, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=DEFAULT_READ_TIMEOUT) -> TimeoutHTTPAdapter:
+    """Returns an adapter for *pool_size* concurrent, kept-alive connections.
+
+    Idempotent requests are retried, with exponential backoff, when the
+    connection fails or is reset, or the server answers with a 502 or 504.
+    """
+    retry = Retry(total=retries, connect=retries, read=retries,
+                  status=retries, other=0, backoff_factor=backoff,
+                  allowed_methods=IDEMPOTENT_METHODS,
+                  status_forcelist=RETRY_STATUSES,
+                  raise_on_status=False,
+                  respect_retry_after_header=True)
+    return TimeoutHTTPAdapter(timeout=(connect_timeout, read_timeout),
+                              pool_connections=pool_size,
+                              pool_maxsize=pool_size,
+                              max_retries=retry)
+
+
+def configure(session, adapter):
+    """Mounts *adapter* on *session* for both http and https urls."""
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
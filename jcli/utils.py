@@ -3,12 +3,42 @@ Utility stuff...
 """
 import click
 import codecs
+import functools
+import importlib.util
+import operator
 import os
 import re
 import subprocess
 import sys
 import tempfile
 
+# Cleared by 'jcli daemon', which has no terminal to run an editor or
+# prompt in.
+HAS_TERMINAL = True
+
+
+class NeedsTerminal(Exception):
+    """The command needs the user's terminal, which isn't available."""
+
+
+def lazy_import(name):
+    """Returns module *name*, which is only really imported once used.
+
+    Keeps heavy libraries (jira, requests, asyncio) out of the start up of
+    commands that never reach them.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
 
 def get_gpg_authinfo(authinfo_file):
     try:
@@ -90,12 +120,51 @@ def fitted_blocks(data, length=75, fence=None) -> str:
     return output
 
 
+# One step of an accessor path: .attr, ['key'], ["key"] or [index].
+ACCESSOR_STEP_RE = re.compile(
+    r"""\.([A-Za-z_]\w*)|\[(?:'([^'\\]*)'|"([^"\\]*)"|(-?\d+))\]""")
+
+
+@functools.lru_cache(maxsize=None)
+def compile_accessor(path):
+    """Returns a function reading *path* (as in "raw['fields']['summary']")
+    from the object passed to it.
+
+    Paths made only of attribute and item lookups become a chain of
+    getters; anything else is compiled once and evaluated.  Either way, a
+    missing attribute or key raises, as the expression would.
+    """
+    getters = []
+    pos = 0
+    dotted = "." + path
+    while pos < len(dotted):
+        m = ACCESSOR_STEP_RE.match(dotted, pos)
+        if m is None:
+            code = compile(f"obj.{path}", "<accessor>", "eval")
+            return lambda obj: eval(code, {}, {"obj": obj})
+
+        attr, key, dkey, index = m.groups()
+        if attr is not None:
+            getters.append(operator.attrgetter(attr))
+        elif index is not None:
+            getters.append(operator.itemgetter(int(index)))
+        else:
+            getters.append(operator.itemgetter(dkey if key is None else key))
+        pos = m.end()
+
+    def access(obj):
+        for get in getters:
+            obj = get(obj)
+        return obj
+    return access
+
+
 def issue_eval(issue_obj, header_map) -> list:
     issue_details = []
     for header in header_map:
         attr = header_map[header]
         try:
-            val = eval(f"issue_obj.{attr}")
+            val = compile_accessor(attr)(issue_obj)
             issue_details.append(val)
         except:
             issue_details.append("--")
@@ -150,6 +219,9 @@ def display_via_pager(output, title=None):
 
 
 def get_text_via_editor(starting_text=None) -> str:
+    if not HAS_TERMINAL:
+        raise NeedsTerminal()
+
     text = ""
 
     with tempfile.NamedTemporaryFile(suffix=".tmp", delete=False) as temp_file:
@@ -354,18 +426,33 @@ def convert_cmd(input, to):
 
 
 class RuntimeEvalChoice(click.Choice):
+    """A Choice whose choices are only looked up when first needed.
+
+    *choices_getter* may hand back a cached list; a value missing from it
+    gets one more look, with refresh=True, before it is rejected.
+    """
     def __init__(self, choices_getter, **kwargs):
         self._choice_get = choices_getter
         self._requested = False
+        self._refreshed = False
         super().__init__([], **kwargs)
 
-    def ensure_requested(self):
-        if not self._requested:
+    def ensure_requested(self, refresh=False):
+        if refresh:
+            self.choices = self._choice_get(refresh=True)
+            self._requested = self._refreshed = True
+        elif not self._requested:
             self.choices = self._choice_get()
             self._requested = True
 
     def convert(self, value, param, ctx):
         self.ensure_requested()
+        try:
+            return super().convert(value, param, ctx)
+        except click.BadParameter:
+            if self._refreshed:
+                raise
+        self.ensure_requested(refresh=True)
         return super().convert(value, param, ctx)
 
     def shell_complete(self, ctx, param, incomplete):
@@ -383,3 +470,14 @@ class RuntimeEvalChoice(click.Choice):
         )
 
         return f"[{choices_str}]"
+
+
+def complete_from(choices_getter):
+    """A shell_complete callback suggesting *choices_getter*'s choices.
+
+    For values that are only suggested, not checked, against the list.
+    """
+    def complete(ctx, param, incomplete):
+        return [c for c in choices_getter()
+                if str(c).lower().startswith(incomplete.lower())]
+    return complete